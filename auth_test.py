@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Tests for signed admin bearer tokens
+Run with: python -m pytest auth_test.py
+"""
+
+from backend.utils.auth import issue_token, verify_token
+
+
+def test_token_round_trip():
+    token = issue_token("secret", "admin@delhiair.gov.in", ttl_seconds=60)
+    assert verify_token("secret", token) == "admin@delhiair.gov.in"
+
+
+def test_wrong_secret_or_tampering_is_rejected():
+    token = issue_token("secret", "admin@delhiair.gov.in", ttl_seconds=60)
+    subject, expires, signature = token.split(".")
+    assert verify_token("other-secret", token) is None
+    assert verify_token("secret", f"{subject}.{int(expires) + 3600}.{signature}") is None
+    assert verify_token("secret", "not-a-token") is None
+    assert verify_token("secret", "") is None
+
+
+def test_expired_token_is_rejected():
+    assert verify_token("secret", issue_token("secret", "admin", ttl_seconds=-1)) is None
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, Boolean
+from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, Boolean, Index, MetaData, Table
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -49,6 +49,13 @@ class PollutionReportDB(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # Keyset pagination for the admin list: newest first, report_id breaks ties
+        Index("ix_pollution_reports_created_at_report_id", "created_at", "report_id"),
+        Index("ix_pollution_reports_status_created_at", "status", "created_at", "report_id"),
+        Index("ix_pollution_reports_severity_created_at", "severity", "created_at", "report_id"),
+    )
+
 class AQIPredictionLog(Base):
     """Log of AQI predictions - for analytics"""
     __tablename__ = "aqi_prediction_logs"
@@ -80,10 +87,90 @@ class SourceAttributionLog(Base):
     prediction_type = Column(String(50))
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class EmailOutbox(Base):
+    """Queued notification emails, delivered by background workers with retries"""
+    __tablename__ = "email_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)
+    to_email = Column(String(255), nullable=False)
+    context = Column(Text, nullable=False)  # JSON keyword arguments for the renderer of `kind`
+    status = Column(String(20), default="pending", index=True)  # pending, sending, sent, failed
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, index=True)
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+# SQLite R*Tree over report coordinates, kept in sync by triggers. Declared on its own
+# metadata because create_all can't create virtual tables; see init_spatial_index.
+spatial_metadata = MetaData()
+report_rtree = Table(
+    "pollution_reports_rtree",
+    spatial_metadata,
+    Column("id", Integer, primary_key=True),  # pollution_reports.id
+    Column("min_lon", Float),
+    Column("max_lon", Float),
+    Column("min_lat", Float),
+    Column("max_lat", Float),
+)
+
+RTREE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS pollution_reports_rtree USING rtree(id, min_lon, max_lon, min_lat, max_lat)",
+    """CREATE TRIGGER IF NOT EXISTS pollution_reports_rtree_insert AFTER INSERT ON pollution_reports
+       WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL
+       BEGIN
+           INSERT INTO pollution_reports_rtree VALUES (NEW.id, NEW.longitude, NEW.longitude, NEW.latitude, NEW.latitude);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS pollution_reports_rtree_update AFTER UPDATE OF latitude, longitude ON pollution_reports
+       BEGIN
+           DELETE FROM pollution_reports_rtree WHERE id = OLD.id;
+           INSERT INTO pollution_reports_rtree SELECT NEW.id, NEW.longitude, NEW.longitude, NEW.latitude, NEW.latitude
+           WHERE NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS pollution_reports_rtree_delete AFTER DELETE ON pollution_reports
+       BEGIN
+           DELETE FROM pollution_reports_rtree WHERE id = OLD.id;
+       END""",
+    # Backfill reports stored before the index existed
+    """INSERT INTO pollution_reports_rtree
+       SELECT id, longitude, longitude, latitude, latitude FROM pollution_reports
+       WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+         AND id NOT IN (SELECT id FROM pollution_reports_rtree)""",
+]
+
+# Set by init_spatial_index; callers fall back to plain latitude/longitude ranges without it
+spatial_index_available = False
+
+def init_spatial_index(bind=None) -> bool:
+    """Create the report R*Tree and its triggers (SQLite only); returns False when unavailable"""
+    global spatial_index_available
+    bind = bind or engine
+    if bind.dialect.name != "sqlite":
+        return False
+    try:
+        with bind.begin() as conn:
+            for statement in RTREE_DDL:
+                conn.exec_driver_sql(statement)
+    except Exception as e:
+        print(f"⚠️ Spatial index unavailable, bounding-box queries will scan: {e}")
+        return False
+    spatial_index_available = True
+    return True
+
+def has_spatial_index() -> bool:
+    return spatial_index_available
+
 # Create all tables
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so indexes added since are created here
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    init_spatial_index()
     print("✅ Database tables created successfully")
 
 # Dependency for FastAPI
@@ -1,54 +1,183 @@
 import sys
 import os
+import time
 
+# Reference point for the import-to-ready startup metric
+_IMPORT_STARTED_AT = time.perf_counter()
 
 
 # Add project root to Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Request, Query, Header
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import StreamingResponse, JSONResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure
+from sqlalchemy import Integer, and_, cast, func, insert, or_, select, update
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, ValidationError
+from typing import Dict, List, Literal, Optional, Tuple, get_args
 import uuid
+import base64
+import csv
+import json
+import asyncio
+from functools import partial
+from urllib.parse import urlsplit
 from datetime import datetime, timezone
-import aiohttp
 import bcrypt
-from backend.utils.email_service import send_report_confirmation, send_status_update
+import hashlib
+import re
+from backend.utils.email_service import deliver_email, RENDERERS, close_smtp_pool, smtp_pool_stats, email_templates
+from backend.utils.smtp_pool import is_permanent_rejection
+from backend.utils.email_outbox import EmailOutboxWorker
+from backend.utils.http_client import start_http_session, get_http_session, close_http_session
+from backend.utils.cache import SingleFlightCache, LRUCache
+from backend.utils.waqi_poller import WAQIPoller
+from backend.utils.waqi_stations import WAQIStationFetcher, aqi_categories
+from backend.utils.inference import BatchingPredictor
+from backend.utils.auth import issue_token, verify_token
+from backend.utils.model_loader import ModelLoader
+from backend.utils.model_registry import ModelRegistry, ModelVersion
+from backend.utils.artifacts import fetch_artifact
+from backend.utils.model_sharing import load_shared_model, process_memory
+from backend.utils.ensemble import EnsembleForecaster, ensemble_confidence
+from backend.utils.features import build_feature_row
+from backend.utils.feature_store import FeatureStore
+from backend.utils.source_attribution import SOURCES, SourceAttributor, attribution_features
+from backend.utils.log_sink import LogSink
+from backend.utils.mongo_indexes import IndexManager, REPORT_BACKFILLS, REPORT_INDEXES, REPORT_HOT_QUERIES
+from backend.utils.geo import bbox_polygon, covers_hemisphere, geojson_point, viewport_cell_degrees
+from backend.utils.waqi_stations import POLLUTANTS
+from backend.utils.forecasting import (
+    HORIZONS, multi_horizon_predict, forecast_trends, rollout_confidence, forecast_cache_key
+)
+from backend.utils.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, deadline, breaker_stats
 
 
-import requests
 import joblib
+import numpy as np
 
 # ---------------------------
 # DOWNLOAD MODEL FROM HUGGINGFACE
 # ---------------------------
 
-MODEL_URL = "https://huggingface.co/mani1715/aqi-prediction-model/resolve/main/artifact_wrapper.pkl"
-MODEL_PATH = "artifact_wrapper.pkl"
+MODEL_URL = os.environ.get(
+    'MODEL_URL', "https://huggingface.co/mani1715/aqi-prediction-model/resolve/main/artifact_wrapper.pkl"
+)
+# Shared by all workers on the box; downloads are locked, resumable and renamed into place atomically
+MODEL_CACHE_DIR = Path(os.environ.get('MODEL_CACHE_DIR', Path(__file__).parent / 'model_cache'))
+# Optional SHA-256 of the artifact; a mismatch discards the download instead of loading it
+MODEL_SHA256 = os.environ.get('MODEL_SHA256')
+# Memory-map the model's NumPy arrays so all uvicorn workers share one copy in the page cache
+MODEL_MMAP = os.environ.get('MODEL_MMAP', 'false').lower() in ('1', 'true', 'yes')
+# Version label of the artifact at MODEL_URL, reported in responses and prediction logs
+MODEL_VERSION = os.environ.get('MODEL_VERSION', 'v1.0')
+# Comma-separated URL prefixes candidate models may be fetched from; unpickling runs code, so only trusted origins
+MODEL_CANDIDATE_URL_PREFIXES = [
+    prefix.strip() for prefix in
+    os.environ.get('MODEL_CANDIDATE_URL_PREFIXES', MODEL_URL.rsplit('/', 1)[0] + '/').split(',')
+    if prefix.strip()
+]
+# XGBoost seed ensemble (booster_seed*.json + ensemble_metadata.json); served for /aqi/forecast when present
+ML_MODEL1_DIR = Path(os.environ.get('ML_MODEL1_DIR', Path(__file__).parent / 'ml_models' / 'model1'))
+# Threads per booster; boosters predict concurrently, so by default the cores are split between them
+ENSEMBLE_NTHREAD = int(os.environ['ENSEMBLE_NTHREAD']) if os.environ.get('ENSEMBLE_NTHREAD') else None
+# Optional Random-Forest source attribution artifact; the indicator-ratio heuristic is used without it
+ML_MODEL2_DIR = Path(os.environ.get('ML_MODEL2_DIR', Path(__file__).parent / 'ml_models' / 'model2'))
+SOURCE_MODEL_PATH = ML_MODEL2_DIR / 'pollution_source_regression_model.pkl'
+
+
+def load_forecast_model(url: str = MODEL_URL, sha256: Optional[str] = MODEL_SHA256, filename: Optional[str] = None):
+    """Download (if needed) and unpickle a forecasting model; runs in a loader thread"""
+    model_path = fetch_artifact(url, MODEL_CACHE_DIR, filename=filename, sha256=sha256)
+    if MODEL_MMAP:
+        return load_shared_model(model_path)
+    return joblib.load(model_path)
+
+
+def warmup_forecast_model(loaded_model):
+    """Run a throwaway prediction so the first real request doesn't pay first-call costs"""
+    loaded_model.predict(np.array([[150.0]]))
+
+
+def predict_horizons(loaded_model, X):
+    """24h/48h/72h for every row: batched recursive rollout of the single-step model"""
+    return multi_horizon_predict(loaded_model.predict, X, HORIZONS)
+
+
+# Serves the active forecaster; new versions are loaded, shadowed and swapped in at runtime
+model_registry = ModelRegistry(warmup_fn=warmup_forecast_model, predict_fn=predict_horizons)
+
+# Initial model, loaded in a background thread from the startup hook; see /api/ready
+model_loader = ModelLoader(
+    load_forecast_model,
+    warmup_fn=warmup_forecast_model,
+    name="forecast_model",
+    started_at=_IMPORT_STARTED_AT,
+    on_ready=lambda loaded: model_registry.activate(ModelVersion(MODEL_VERSION, loaded, source=MODEL_URL)),
+)
+
+
+def predict_with_active_model(X):
+    """Predict all horizons for a batch with the model active when it starts; returns (predictions, model version)"""
+    active = model_registry.active
+    started = time.perf_counter()
+    preds = predict_horizons(active.model, X)
+    model_registry.maybe_shadow(X, preds, (time.perf_counter() - started) * 1000)
+    return preds, active.version
+
+
+def warmup_ensemble(ensemble):
+    """Predict one real feature row: checks the metadata feature names and horizon count up front"""
+    # Every prediction log row needs a value for each horizon; refuse the model rather than lose log batches
+    missing = [h for h in HORIZONS if h not in ensemble.horizons]
+    if missing:
+        raise ValueError(f"Ensemble metadata lacks horizons {missing} (has {list(ensemble.horizons)})")
+    row = build_feature_row({}, 150.0, datetime.now(timezone.utc), feature_names=ensemble.feature_names)
+    ensemble.predict(row[np.newaxis, :])
 
-if not os.path.exists(MODEL_PATH):
-    print("Downloading model from HuggingFace...")
-    r = requests.get(MODEL_URL)
-    r.raise_for_status()
-    with open(MODEL_PATH, "wb") as f:
-        f.write(r.content)
-    print("Model downloaded successfully.")
+
+ensemble_loader = ModelLoader(
+    partial(EnsembleForecaster.from_directory, ML_MODEL1_DIR, nthread=ENSEMBLE_NTHREAD),
+    warmup_fn=warmup_ensemble,
+    name="aqi_ensemble",
+    started_at=_IMPORT_STARTED_AT,
+)
+
+
+def predict_with_ensemble(X):
+    """Predict all horizons for a batch; returns (rows of [means..., spreads...], ensemble version)"""
+    ensemble = ensemble_loader.model
+    mean, spread = ensemble.predict(X)
+    return np.hstack([mean, spread]), ensemble.version
 
 
-# Load the model
-model = joblib.load(MODEL_PATH)
-print("Model loaded successfully.")
+# Indicator-ratio heuristic until the Random-Forest artifact (if any) has loaded
+source_attributor = SourceAttributor()
 
 
-#from ml_models.source_attribution import attribution_model
+def activate_source_model(loaded_model):
+    global source_attributor
+    source_attributor = SourceAttributor(loaded_model)
+
+
+source_model_loader = ModelLoader(
+    partial(joblib.load, SOURCE_MODEL_PATH),
+    warmup_fn=lambda loaded: SourceAttributor(loaded).attribute(attribution_features([[0.0] * 6], 1, 0)),
+    name="source_attribution_model",
+    started_at=_IMPORT_STARTED_AT,
+    on_ready=activate_source_model,
+)
+
 import google.generativeai as genai
-from backend.database import init_db, get_db, SessionLocal
+from backend.database import init_db, get_db, SessionLocal, PollutionReportDB, AQIPredictionLog, SourceAttributionLog
+from backend.database import has_spatial_index, report_rtree
 
 
 ROOT_DIR = Path(__file__).parent
@@ -73,8 +202,91 @@ logger = logging.getLogger(__name__)
 
 ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL', 'admin@delhiair.gov.in')
 ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'DelhiAir@2026')
+# Signs admin bearer tokens; derived from the admin password when unset, so changing it logs everyone out
+ADMIN_TOKEN_SECRET = os.environ.get('ADMIN_TOKEN_SECRET') or hashlib.sha256(f"admin-token:{ADMIN_PASSWORD}".encode()).hexdigest()
+ADMIN_TOKEN_TTL_SECONDS = float(os.environ.get('ADMIN_TOKEN_TTL_SECONDS', '43200'))
 WAQI_API_TOKEN = os.environ.get('WAQI_API_TOKEN')
+WAQI_BASE_URL = os.environ.get('WAQI_BASE_URL', 'https://api.waqi.info').rstrip('/')
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
+AQI_CACHE_TTL_SECONDS = float(os.environ.get('AQI_CACHE_TTL_SECONDS', '600'))
+WAQI_POLL_INTERVAL_SECONDS = float(os.environ.get('WAQI_POLL_INTERVAL_SECONDS', '300'))
+WAQI_STATION_POLL_INTERVAL_SECONDS = float(os.environ.get('WAQI_STATION_POLL_INTERVAL_SECONDS', '900'))
+# Optional comma-separated WAQI station uids; when unset stations are discovered via map bounds
+WAQI_STATION_IDS = [int(uid) for uid in os.environ.get('WAQI_STATION_IDS', '').split(',') if uid.strip()]
+WAQI_STATION_CONCURRENCY = int(os.environ.get('WAQI_STATION_CONCURRENCY', '8'))
+WAQI_STATION_TIMEOUT = float(os.environ.get('WAQI_STATION_TIMEOUT', '4'))
+# Latency budget per API request; nested upstream calls spend from it
+REQUEST_BUDGET_SECONDS = float(os.environ.get('REQUEST_BUDGET_SECONDS', '8'))
+WAQI_TIMEOUT = float(os.environ.get('WAQI_TIMEOUT', '4'))
+GEMINI_TIMEOUT = float(os.environ.get('GEMINI_TIMEOUT', '6'))
+INFERENCE_BATCH_WINDOW_MS = float(os.environ.get('INFERENCE_BATCH_WINDOW_MS', '5'))
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get('INFERENCE_MAX_BATCH_SIZE', '64'))
+# Rows per vectorized predict when streaming, and the cap for non-streaming JSON batches
+BATCH_FORECAST_CHUNK_ROWS = int(os.environ.get('BATCH_FORECAST_CHUNK_ROWS', '1000'))
+BATCH_FORECAST_MAX_ROWS = int(os.environ.get('BATCH_FORECAST_MAX_ROWS', '10000'))
+FORECAST_CACHE_SIZE = int(os.environ.get('FORECAST_CACHE_SIZE', '256'))
+# Prediction/attribution logs are written behind the request: flushed every N rows or T ms
+LOG_SINK_BATCH_SIZE = int(os.environ.get('LOG_SINK_BATCH_SIZE', '200'))
+LOG_SINK_FLUSH_MS = float(os.environ.get('LOG_SINK_FLUSH_MS', '1000'))
+LOG_SINK_MAX_QUEUE = int(os.environ.get('LOG_SINK_MAX_QUEUE', '10000'))
+EMAIL_OUTBOX_WORKERS = int(os.environ.get('EMAIL_OUTBOX_WORKERS', '2'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', '6'))
+# Reports per insert_many (and per outbox transaction) in bulk uploads
+BULK_REPORTS_CHUNK_ROWS = int(os.environ.get('BULK_REPORTS_CHUNK_ROWS', '500'))
+# Longest NDJSON/CSV line accepted in streamed uploads; longer lines are rejected without being buffered
+MAX_UPLOAD_LINE_BYTES = int(os.environ.get('MAX_UPLOAD_LINE_BYTES', str(64 * 1024)))
+REPORT_PAGE_MAX = int(os.environ.get('REPORT_PAGE_MAX', '200'))
+# Largest cluster grid per viewport edge; coarser cells are used when the zoom would need more
+CLUSTER_MAX_CELLS_PER_SIDE = int(os.environ.get('CLUSTER_MAX_CELLS_PER_SIDE', '64'))
+BULK_STATUS_MAX_IDS = int(os.environ.get('BULK_STATUS_MAX_IDS', '5000'))
+
+# Current AQI only changes every ~30 minutes upstream
+aqi_cache = SingleFlightCache(ttl_seconds=AQI_CACHE_TTL_SECONDS, name="waqi_current")
+
+# Forecasts keyed by input features + model version; inputs only change when WAQI or the model does
+forecast_cache = LRUCache(max_entries=FORECAST_CACHE_SIZE, name="forecast")
+model_registry.subscribe(lambda version: forecast_cache.clear())
+# Source attribution per snapshot (keyed by reading timestamp and attributor version)
+source_cache = LRUCache(max_entries=8, name="source_attribution")
+
+prediction_log = LogSink(
+    SessionLocal,
+    batch_size=LOG_SINK_BATCH_SIZE,
+    flush_interval_ms=LOG_SINK_FLUSH_MS,
+    max_queue=LOG_SINK_MAX_QUEUE,
+    name="prediction_log",
+)
+
+# Notification emails are persisted to the outbox table and sent by background workers
+email_outbox = EmailOutboxWorker(
+    SessionLocal,
+    deliver_email,
+    RENDERERS,
+    workers=EMAIL_OUTBOX_WORKERS,
+    max_attempts=EMAIL_OUTBOX_MAX_ATTEMPTS,
+    is_permanent=is_permanent_rejection,
+)
+
+# Indexes on pollution_reports are declared here and reconciled on startup
+report_indexes = IndexManager(db.pollution_reports, REPORT_INDEXES, REPORT_HOT_QUERIES, backfills=REPORT_BACKFILLS)
+
+# Open circuits fail fast so callers drop straight to cached or fallback values
+waqi_breaker = CircuitBreaker("waqi", failure_threshold=3, reset_timeout=30, call_timeout=WAQI_TIMEOUT)
+gemini_breaker = CircuitBreaker("gemini", failure_threshold=3, reset_timeout=60, call_timeout=GEMINI_TIMEOUT)
+
+# Forecast inference runs in a worker thread; concurrent requests are batched into one predict
+forecast_predictor = BatchingPredictor(
+    predict_with_active_model,
+    max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=INFERENCE_BATCH_WINDOW_MS,
+    name="forecast",
+)
+ensemble_predictor = BatchingPredictor(
+    predict_with_ensemble,
+    max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=INFERENCE_BATCH_WINDOW_MS,
+    name="ensemble",
+)
 
 # Configure Gemini
 if GEMINI_API_KEY:
@@ -97,8 +309,8 @@ class PollutionReport(BaseModel):
     mobile: str
     email: EmailStr
     location: str
-    latitude: Optional[float] = None
-    longitude: Optional[float] = None
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
     severity: int = Field(ge=1, le=5)
     description: Optional[str] = None
     image_url: Optional[str] = None
@@ -110,14 +322,63 @@ class PollutionReportCreate(BaseModel):
     mobile: str
     email: EmailStr
     location: str
-    latitude: Optional[float] = None
-    longitude: Optional[float] = None
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
     severity: int = Field(ge=1, le=5)
     description: Optional[str] = None
     image_url: Optional[str] = None
 
+# Statuses an admin can move a report to; anything else is rejected before it reaches storage
+ReportStatus = Literal["pending", "viewed", "processing", "completed"]
+
 class StatusUpdate(BaseModel):
+    status: ReportStatus
+
+class BulkStatusUpdate(BaseModel):
+    ids: List[str] = Field(min_length=1, max_length=BULK_STATUS_MAX_IDS)
+    status: ReportStatus
+
+class BulkStatusResult(BaseModel):
+    requested: int
+    updated: int
+    unchanged: int
+    not_found: List[str]
+    failed: List[str] = []
+
+class ReportListItem(BaseModel):
+    """A report as shown in the admin list; description and image_url are left out"""
+    id: str
+    name: str
+    mobile: str
+    email: str
+    location: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    severity: int
     status: str
+    created_at: datetime
+
+class ReportPage(BaseModel):
+    reports: List[ReportListItem]
+    count: int
+    next_cursor: Optional[str] = None
+
+class ReportCounts(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+
+class ReportCluster(BaseModel):
+    latitude: float
+    longitude: float
+    count: int
+    max_severity: int
+    report_id: Optional[str] = None
+
+class ReportClusters(BaseModel):
+    zoom: int
+    cell_degrees: float
+    total: int
+    clusters: List[ReportCluster]
 
 class AQIData(BaseModel):
     aqi: float
@@ -125,6 +386,7 @@ class AQIData(BaseModel):
     location: str
     pollutants: dict
     timestamp: datetime
+    data_age_seconds: Optional[float] = None
 
 class ForecastResponse(BaseModel):
     aqi_24h: Optional[float] = None
@@ -142,6 +404,27 @@ class ForecastResponse(BaseModel):
     error: Optional[str] = None
     message: Optional[str] = None
 
+class BatchForecastRequest(BaseModel):
+    rows: List[List[float]] = Field(min_length=1)
+
+class BatchForecastItem(BaseModel):
+    index: int
+    aqi_24h: float
+    aqi_48h: float
+    aqi_72h: float
+
+class BatchForecastResponse(BaseModel):
+    count: int
+    forecasts: List[BatchForecastItem]
+    prediction_type: str
+    model_version: str
+
+class ModelCandidateRequest(BaseModel):
+    version: str = Field(pattern=r"^[A-Za-z0-9._-]+$", max_length=64)
+    url: str
+    sha256: str = Field(pattern=r"^[0-9a-fA-F]{64}$")
+    shadow_sample_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+
 class SourceContribution(BaseModel):
     contributions: dict
     dominant_source: str
@@ -262,7 +545,7 @@ class PolicyImpactResponse(BaseModel):
 @api_router.post("/auth/login", response_model=LoginResponse)
 async def admin_login(credentials: LoginRequest):
     if credentials.email == ADMIN_EMAIL and credentials.password == ADMIN_PASSWORD:
-        token = str(uuid.uuid4())
+        token = issue_token(ADMIN_TOKEN_SECRET, credentials.email, ADMIN_TOKEN_TTL_SECONDS)
         return LoginResponse(
             token=token,
             email=credentials.email,
@@ -270,49 +553,102 @@ async def admin_login(credentials: LoginRequest):
         )
     raise HTTPException(status_code=401, detail="Invalid credentials")
 
+async def require_admin(authorization: Optional[str] = Header(default=None)) -> str:
+    """Dependency for admin-only endpoints: a bearer token from /auth/login; returns the admin's email"""
+    scheme, _, token = (authorization or "").partition(" ")
+    subject = verify_token(ADMIN_TOKEN_SECRET, token) if scheme.lower() == "bearer" else None
+    if subject is None:
+        raise HTTPException(status_code=401, detail="Admin authentication required",
+                            headers={"WWW-Authenticate": "Bearer"})
+    return subject
+
+async def fetch_current_aqi() -> Optional[AQIData]:
+    """Fetch the Delhi city feed from WAQI; returns None when the upstream has no usable data"""
+    session = get_http_session()
+    url = f"{WAQI_BASE_URL}/feed/delhi/?token={WAQI_API_TOKEN}"
+    async with session.get(url) as response:
+        if response.status == 200:
+            data = await response.json()
+            if data.get('status') == 'ok':
+                aqi_val = data['data']['aqi']
+                iaqi = data['data'].get('iaqi', {})
+                
+                category = "Good"
+                if aqi_val > 300:
+                    category = "Hazardous"
+                elif aqi_val > 200:
+                    category = "Very Unhealthy"
+                elif aqi_val > 150:
+                    category = "Unhealthy"
+                elif aqi_val > 100:
+                    category = "Unhealthy for Sensitive Groups"
+                elif aqi_val > 50:
+                    category = "Moderate"
+                
+                pollutants = {
+                    'pm25': iaqi.get('pm25', {}).get('v', 0),
+                    'pm10': iaqi.get('pm10', {}).get('v', 0),
+                    'no2': iaqi.get('no2', {}).get('v', 0),
+                    'so2': iaqi.get('so2', {}).get('v', 0),
+                    'co': iaqi.get('co', {}).get('v', 0),
+                    'o3': iaqi.get('o3', {}).get('v', 0)
+                }
+                
+                return AQIData(
+                    aqi=float(aqi_val),
+                    category=category,
+                    location="Delhi NCR",
+                    pollutants=pollutants,
+                    timestamp=datetime.now(timezone.utc)
+                )
+        logger.warning(f"WAQI returned no usable data (HTTP {response.status})")
+    return None
+
+# Background ingestion: every successful poll publishes a new snapshot and primes the cache
+aqi_poller = WAQIPoller(partial(waqi_breaker.call, fetch_current_aqi), interval_seconds=WAQI_POLL_INTERVAL_SECONDS, name="waqi_current")
+aqi_poller.subscribe(lambda snapshot: aqi_cache.set(snapshot.data))
+
+# Hourly window of recent readings for the forecast's AQI memory features (lags, rolling means)
+feature_store = FeatureStore(capacity=72, step_seconds=3600)
+aqi_poller.subscribe(
+    lambda snapshot: feature_store.push(snapshot.data.aqi, snapshot.data.pollutants, snapshot.data.timestamp)
+)
+# A new reading changes the memory features of every cached forecast
+aqi_poller.subscribe(lambda snapshot: forecast_cache.clear())
+
+station_fetcher = WAQIStationFetcher(
+    get_http_session,
+    WAQI_API_TOKEN,
+    base_url=WAQI_BASE_URL,
+    station_ids=WAQI_STATION_IDS,
+    concurrency=WAQI_STATION_CONCURRENCY,
+    station_timeout=WAQI_STATION_TIMEOUT,
+)
+
+async def fetch_station_table():
+    """Fetch all Delhi NCR stations; an empty table counts as a failed poll"""
+    table = await station_fetcher.fetch()
+    return table if len(table) else None
+
+station_poller = WAQIPoller(fetch_station_table, interval_seconds=WAQI_STATION_POLL_INTERVAL_SECONDS, name="waqi_stations")
+
 @api_router.get("/aqi/current", response_model=AQIData)
 async def get_current_aqi():
     try:
-        async with aiohttp.ClientSession() as session:
-            url = f"https://api.waqi.info/feed/delhi/?token={WAQI_API_TOKEN}"
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get('status') == 'ok':
-                        aqi_val = data['data']['aqi']
-                        iaqi = data['data'].get('iaqi', {})
-                        
-                        category = "Good"
-                        if aqi_val > 300:
-                            category = "Hazardous"
-                        elif aqi_val > 200:
-                            category = "Very Unhealthy"
-                        elif aqi_val > 150:
-                            category = "Unhealthy"
-                        elif aqi_val > 100:
-                            category = "Unhealthy for Sensitive Groups"
-                        elif aqi_val > 50:
-                            category = "Moderate"
-                        
-                        pollutants = {
-                            'pm25': iaqi.get('pm25', {}).get('v', 0),
-                            'pm10': iaqi.get('pm10', {}).get('v', 0),
-                            'no2': iaqi.get('no2', {}).get('v', 0),
-                            'so2': iaqi.get('so2', {}).get('v', 0),
-                            'co': iaqi.get('co', {}).get('v', 0),
-                            'o3': iaqi.get('o3', {}).get('v', 0)
-                        }
-                        
-                        return AQIData(
-                            aqi=float(aqi_val),
-                            category=category,
-                            location="Delhi NCR",
-                            pollutants=pollutants,
-                            timestamp=datetime.now(timezone.utc)
-                        )
+        snapshot = aqi_poller.snapshot
+        if snapshot is not None:
+            # Published by the background poller - a pure memory read
+            data, age = snapshot.data, snapshot.age_seconds
+        else:
+            # Poller disabled or no successful poll yet: fresh -> memory; stale -> served while
+            # one background refresh runs; empty -> concurrent callers share one upstream fetch
+            data = await aqi_cache.get(partial(waqi_breaker.call, fetch_current_aqi))
+            age = aqi_cache.age_seconds
+        return data.model_copy(update={"data_age_seconds": round(age, 1)})
     except Exception as e:
         logger.error(f"Error fetching AQI: {str(e)}")
     
+    # Only reached when no real reading has ever been cached
     return AQIData(
         aqi=156.0,
         category="Unhealthy",
@@ -321,96 +657,390 @@ async def get_current_aqi():
         timestamp=datetime.now(timezone.utc)
     )
 
+def _confidence_level(confidence: float) -> str:
+    if confidence >= 0.75:
+        return "High"
+    if confidence >= 0.5:
+        return "Medium"
+    return "Low"
+
+def _forecast_response(current: float, preds: np.ndarray, horizons, confidence: float, model_version: str,
+                       **details) -> ForecastResponse:
+    """Shape one row of horizon predictions; the trend is fitted across current AQI and all horizons"""
+    by_horizon = dict(zip(horizons, preds.tolist()))
+    return ForecastResponse(
+        aqi_24h=by_horizon.get(24),
+        aqi_48h=by_horizon.get(48),
+        aqi_72h=by_horizon.get(72),
+        trend=str(forecast_trends([current], [preds], horizons)[0]),
+        confidence=round(confidence, 3),
+        confidence_level=_confidence_level(confidence),
+        prediction_type="ml",
+        model_version=model_version,
+        weather_conditions={},
+        **details,
+    )
+
+def _log_forecast(current_aqi: float, forecast: ForecastResponse):
+    """Record a computed (not cached) forecast; only an enqueue on the request path"""
+    prediction_log.enqueue(
+        AQIPredictionLog,
+        current_aqi=current_aqi,
+        aqi_24h=forecast.aqi_24h,
+        aqi_48h=forecast.aqi_48h,
+        aqi_72h=forecast.aqi_72h,
+        trend=forecast.trend,
+        confidence=forecast.confidence,
+        model_version=forecast.model_version,
+        prediction_type=forecast.prediction_type,
+    )
+
+async def _ensemble_forecast(aqi_data: AQIData) -> ForecastResponse:
+    """All horizons from one ensemble pass; confidence comes from how much the boosters disagree"""
+    ensemble = ensemble_loader.model
+    features = build_feature_row(
+        aqi_data.pollutants, aqi_data.aqi, aqi_data.timestamp,
+        memory=feature_store.features(), feature_names=ensemble.feature_names,
+    )
+    cached = forecast_cache.get(forecast_cache_key(features, ensemble.version))
+    if cached is not None:
+        return cached
+
+    row, model_version = await ensemble_predictor.predict(features)
+    mean, spread = np.split(row, 2)
+
+    forecast = _forecast_response(
+        aqi_data.aqi, mean, ensemble.horizons, float(ensemble_confidence(mean, spread).mean()), model_version,
+        confidence_explanation=(
+            f"Agreement across {len(ensemble.boosters)} XGBoost boosters "
+            f"(spread ±{float(spread.mean()):.1f} AQI)"
+        ),
+        factors={"ensemble_spread": {f"{h}h": round(float(width), 2) for h, width in zip(ensemble.horizons, spread)}},
+        explanation="Forecast generated by the XGBoost seed ensemble",
+    )
+    forecast_cache.set(forecast_cache_key(features, model_version), forecast)
+    _log_forecast(aqi_data.aqi, forecast)
+    return forecast
+
+async def _single_model_forecast(aqi_data: AQIData) -> ForecastResponse:
+    """24h/48h/72h from the active single-step model, rolled forward in one batched call per horizon"""
+    features = [aqi_data.aqi]
+    cached = forecast_cache.get(forecast_cache_key(features, model_registry.active.version))
+    if cached is not None:
+        return cached
+
+    preds, model_version = await forecast_predictor.predict(features)
+
+    forecast = _forecast_response(
+        aqi_data.aqi, preds, HORIZONS, float(rollout_confidence([aqi_data.aqi], [preds])[0]), model_version,
+        confidence_explanation="Consistency of the 24h/48h/72h rollout around its fitted trend",
+        factors={},
+        explanation="Forecast generated using deployed HuggingFace model, rolled forward to 48h and 72h",
+    )
+    # Keyed by the version that actually produced it, in case a swap landed mid-request
+    forecast_cache.set(forecast_cache_key(features, model_version), forecast)
+    _log_forecast(aqi_data.aqi, forecast)
+    return forecast
+
 @api_router.get("/aqi/forecast", response_model=ForecastResponse)
 async def get_forecast():
+    if not (ensemble_loader.ready or model_loader.ready):
+        raise HTTPException(status_code=503, detail="Forecast model is still loading")
     try:
         aqi_data = await get_current_aqi()
 
-        pred_24 = model.predict([[aqi_data.aqi]])[0]
-
-        forecast_result = {
-            "aqi_24h": float(pred_24),
-            "aqi_48h": float(pred_24 + 10),
-            "aqi_72h": float(pred_24 + 20),
-            "trend": "stable",
-            "confidence": 0.85,
-            "confidence_level": "High",
-            "confidence_explanation": "Prediction based on trained ML model",
-            "factors": {},
-            "prediction_type": "ml",
-            "model_version": "v1.0",
-            "explanation": "Forecast generated using deployed HuggingFace model",
-            "weather_conditions": {}
-        }
-
-        return ForecastResponse(**forecast_result)
+        if ensemble_loader.ready:
+            return await _ensemble_forecast(aqi_data)
+        return await _single_model_forecast(aqi_data)
 
     except Exception as e:
         logger.error(f"Error generating forecast: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate forecast")
 
+def _parse_feature_row(value) -> List[float]:
+    if not isinstance(value, list) or not value:
+        raise ValueError("each row must be a non-empty array of numbers")
+    return [float(v) for v in value]
+
+async def _iter_lines(request: Request):
+    """Yield the non-blank lines of the request body as they arrive.
+
+    A line over MAX_UPLOAD_LINE_BYTES is yielded as a ValueError instead and the rest of
+    it discarded as it streams in, so one runaway line can't hold the whole body in memory.
+    """
+    too_long = ValueError(f"line exceeds {MAX_UPLOAD_LINE_BYTES} bytes")
+    buffer = b""
+    skipping = False  # inside an oversized line whose error was already yielded
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+            elif len(line) > MAX_UPLOAD_LINE_BYTES:
+                yield too_long
+            elif line.strip():
+                yield line
+        if len(buffer) > MAX_UPLOAD_LINE_BYTES:
+            if not skipping:
+                yield too_long
+            skipping = True
+            buffer = b""
+    if buffer.strip() and not skipping:
+        yield buffer
+
+async def _iter_ndjson(request: Request):
+    """Yield (line_number, parsed_json_or_exception) from an NDJSON body without buffering it"""
+    line_number = 0
+    async for line in _iter_lines(request):
+        try:
+            if isinstance(line, Exception):
+                raise line
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+        line_number += 1
+
+async def _iter_csv(request: Request):
+    """Yield (row_number, dict_or_exception) from a CSV body with a header row, without buffering it.
+
+    Records are split on line breaks, so quoted fields can't contain newlines. Empty cells become None.
+    """
+    header = None
+    row_number = 0
+    async for line in _iter_lines(request):
+        try:
+            if isinstance(line, Exception):
+                raise line
+            values = next(csv.reader([line.rstrip(b"\r").decode("utf-8-sig")]))
+        except (ValueError, csv.Error) as e:
+            values = e
+        if header is None:
+            if isinstance(values, Exception):
+                yield row_number, ValueError(f"unreadable CSV header: {values}")
+                return
+            header = [name.strip() for name in values]
+            continue
+        if isinstance(values, Exception):
+            yield row_number, values
+        elif len(values) != len(header):
+            yield row_number, ValueError(f"expected {len(header)} columns, got {len(values)}")
+        else:
+            yield row_number, {name: value.strip() or None for name, value in zip(header, values)}
+        row_number += 1
+
+async def _stream_batch_forecasts(rows):
+    """Predict `rows` (async iterable of (index, row-or-exception)) chunk by chunk as NDJSON"""
+    indices, chunk = [], []
+
+    async def flush():
+        # The response has already started, so a failed chunk becomes error lines rather than a broken stream
+        try:
+            preds, model_version = await forecast_predictor.predict_batch(chunk)
+            lines = [
+                json.dumps({
+                    "index": index, "aqi_24h": pred[0], "aqi_48h": pred[1], "aqi_72h": pred[2],
+                    "model_version": model_version,
+                })
+                for index, pred in zip(indices, preds.tolist())
+            ]
+        except Exception as e:
+            logger.error(f"Batch forecast chunk of {len(chunk)} rows failed: {str(e)}")
+            lines = [json.dumps({"index": index, "error": f"prediction failed: {str(e)}"}) for index in indices]
+        indices.clear()
+        chunk.clear()
+        return ("\n".join(lines) + "\n").encode()
+
+    width = None
+    async for index, value in rows:
+        try:
+            if isinstance(value, Exception):
+                raise value
+            row = _parse_feature_row(value)
+            if width is None:
+                width = len(row)
+            elif len(row) != width:
+                raise ValueError(f"expected {width} features, got {len(row)}")
+        except (TypeError, ValueError) as e:
+            yield (json.dumps({"index": index, "error": str(e)}) + "\n").encode()
+            continue
+        indices.append(index)
+        chunk.append(row)
+        if len(chunk) >= BATCH_FORECAST_CHUNK_ROWS:
+            yield await flush()
+    if chunk:
+        yield await flush()
+
+class DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse for bodies that are still reading the request while they write.
+
+    The stock response consumes `receive` to watch for disconnects, which would steal
+    the request body chunks; here the body iterator owns `receive` instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+async def _enumerate_rows(rows):
+    for index, row in enumerate(rows):
+        yield index, row
+
+@api_router.post("/aqi/forecast/batch", response_model=BatchForecastResponse)
+async def batch_forecast(request: Request):
+    """Forecast 24h/48h/72h for many feature rows with vectorized model calls.
+
+    - `application/json` body `{"rows": [[...], ...]}` returns a JSON document, or
+      streams NDJSON when the client sends `Accept: application/x-ndjson`.
+    - `application/x-ndjson` body (one feature array per line) is parsed and
+      predicted incrementally and always streams NDJSON back, so memory stays flat.
+    """
+    if not model_loader.ready:
+        raise HTTPException(status_code=503, detail="Forecast model is still loading")
+
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type:
+        return DuplexStreamingResponse(_stream_batch_forecasts(_iter_ndjson(request)), media_type="application/x-ndjson")
+
+    try:
+        batch = BatchForecastRequest.model_validate_json(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if "ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(_stream_batch_forecasts(_enumerate_rows(batch.rows)), media_type="application/x-ndjson")
+
+    if len(batch.rows) > BATCH_FORECAST_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batches over {BATCH_FORECAST_MAX_ROWS} rows must use NDJSON streaming"
+        )
+    if len({len(row) for row in batch.rows}) != 1:
+        raise HTTPException(status_code=422, detail="All rows must have the same number of features")
+
+    try:
+        preds, model_version = await forecast_predictor.predict_batch(batch.rows)
+    except Exception as e:
+        logger.error(f"Error generating batch forecast: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to generate batch forecast")
+
+    return BatchForecastResponse(
+        count=len(preds),
+        forecasts=[
+            BatchForecastItem(index=i, aqi_24h=pred[0], aqi_48h=pred[1], aqi_72h=pred[2])
+            for i, pred in enumerate(preds.tolist())
+        ],
+        prediction_type="ml",
+        model_version=model_version
+    )
+
 
 @api_router.get("/aqi/sources", response_model=SourceContribution)
 async def get_pollution_sources():
     try:
-        return SourceContribution(
-            contributions={
-                "traffic": 40,
-                "industry": 25,
-                "construction": 20,
-                "stubble_burning": 10,
-                "other": 5
+        aqi_data = await get_current_aqi()
+        attributor = source_attributor
+        cache_key = (aqi_data.timestamp.isoformat(), attributor.version)
+        cached = source_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        X = attribution_features(
+            [[aqi_data.pollutants.get(name) or 0.0 for name in POLLUTANTS]],
+            aqi_data.timestamp.month,
+            aqi_data.timestamp.hour,
+        )
+        shares, confidence = await asyncio.to_thread(attributor.attribute, X)
+        contributions = {source: round(float(share), 1) for source, share in zip(SOURCES, shares[0])}
+        confidence = float(confidence[0])
+
+        result = SourceContribution(
+            contributions=contributions,
+            dominant_source=max(contributions, key=contributions.get),
+            confidence=round(confidence, 3),
+            confidence_level=_confidence_level(confidence),
+            confidence_explanation="Margin of the dominant source, scaled by how many pollutants were reported",
+            factors_considered={"month": aqi_data.timestamp.month, "hour": aqi_data.timestamp.hour},
+            prediction_type=attributor.prediction_type,
+            model_version=attributor.version,
+            explanation=(
+                "Source shares from the Random-Forest attribution model"
+                if attributor.prediction_type == "ml" else
+                "Source shares estimated from pollutant indicators: NO2 (traffic), SO2 (industry), "
+                "PM10 - PM2.5 coarse dust (construction), fine PM2.5 with CO in Oct-Nov (stubble burning)"
+            ),
+            pollutant_indicators={
+                "pm_ratio": round(float(X[0, 6]), 2),
+                "no2_co_ratio": round(float(X[0, 7]), 2),
             },
-            dominant_source="traffic",
-            confidence=0.8,
-            confidence_level="High",
-            confidence_explanation="Simulated distribution",
-            factors_considered={},
-            prediction_type="simulation",
-            model_version="v1.0",
-            explanation="Source attribution simulated (ML model not deployed)",
-            pollutant_indicators={}
         )
+        source_cache.set(cache_key, result)
+        prediction_log.enqueue(
+            SourceAttributionLog,
+            **contributions,
+            dominant_source=result.dominant_source,
+            confidence=result.confidence,
+            model_version=result.model_version,
+            prediction_type=result.prediction_type,
+        )
+        return result
     except Exception as e:
         logger.error(f"Error getting sources: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get pollution sources")
 
 
+async def _enqueue_email(kind: str, to_email: str, **context):
+    """Queue a notification; the report change is already saved, so a failure here is only logged"""
+    try:
+        await email_outbox.enqueue(kind, to_email, **context)
+    except Exception as e:
+        logger.error(f"Failed to queue {kind} email to {to_email}: {str(e)}")
+
+def _report_document(report: PollutionReport) -> dict:
+    """MongoDB document: ISO created_at (sorts chronologically) and a GeoJSON point for the 2dsphere index"""
+    doc = report.model_dump()
+    doc["created_at"] = doc["created_at"].isoformat()
+    geo = geojson_point(report.latitude, report.longitude)
+    if geo is not None:
+        doc["geo"] = geo
+    return doc
+
+def _report_row(report: PollutionReport) -> dict:
+    """Column values for the SQLite fallback table"""
+    return dict(
+        report_id=report.id,
+        name=report.name,
+        mobile=report.mobile,
+        email=report.email,
+        location=report.location,
+        latitude=report.latitude,
+        longitude=report.longitude,
+        severity=report.severity,
+        description=report.description,
+        image_url=report.image_url,
+        status=report.status
+    )
+
 @api_router.post("/reports", response_model=PollutionReport)
 async def create_report(report: PollutionReportCreate):
     try:
         report_obj = PollutionReport(**report.model_dump())
-        doc = report_obj.model_dump()
-        doc["created_at"] = doc["created_at"].isoformat()
+        doc = _report_document(report_obj)
 
         # Try MongoDB first
         try:
             await db.pollution_reports.insert_one(doc)
         except Exception:
             # If MongoDB fails, fallback to SQLite
-            from database import PollutionReportDB
             sqlite_db = SessionLocal()
             try:
-                db_report = PollutionReportDB(
-                    report_id=report_obj.id,
-                    name=report_obj.name,
-                    mobile=report_obj.mobile,
-                    email=report_obj.email,
-                    location=report_obj.location,
-                    latitude=report_obj.latitude,
-                    longitude=report_obj.longitude,
-                    severity=report_obj.severity,
-                    description=report_obj.description,
-                    image_url=report_obj.image_url,
-                    status=report_obj.status
-                )
+                db_report = PollutionReportDB(**_report_row(report_obj))
                 sqlite_db.add(db_report)
                 sqlite_db.commit()
                 sqlite_db.refresh(db_report)
             finally:
                 sqlite_db.close()
 
-        await send_report_confirmation(report.email, report.name, report_obj.id)
+        await _enqueue_email("report_confirmation", report.email, name=report.name, report_id=report_obj.id)
 
         return report_obj
 
@@ -419,53 +1049,547 @@ async def create_report(report: PollutionReportCreate):
         raise HTTPException(status_code=500, detail="Failed to create report")
 
 
+def _insert_report_rows(rows: List[dict]):
+    sqlite_db = SessionLocal()
+    try:
+        sqlite_db.execute(insert(PollutionReportDB), rows)
+        sqlite_db.commit()
+    except Exception:
+        sqlite_db.rollback()
+        raise
+    finally:
+        sqlite_db.close()
+
+async def _insert_reports(reports: List[PollutionReport]) -> Dict[int, str]:
+    """Store a chunk with one unordered insert_many; returns {position: error} for the rows that failed.
+
+    Falls back to a single bulk INSERT into SQLite only when MongoDB can't be reached; any
+    other error is raised, since the chunk may already be partly stored in MongoDB.
+    """
+    docs = [_report_document(report) for report in reports]
+    try:
+        # Unordered: one bad document doesn't stop the rest of the chunk
+        await db.pollution_reports.insert_many(docs, ordered=False)
+        return {}
+    except BulkWriteError as e:
+        return {error["index"]: error.get("errmsg", "write failed") for error in e.details.get("writeErrors", [])}
+    except ConnectionFailure as e:  # includes server selection timeouts and AutoReconnect
+        logger.warning(f"MongoDB unavailable for bulk insert ({type(e).__name__}); storing in SQLite")
+        await asyncio.to_thread(_insert_report_rows, [_report_row(report) for report in reports])
+        return {}
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}" for detail in error.errors()
+    )
+
+async def _ingest_reports(rows):
+    """Validate `rows` (async iterable of (index, row-or-exception)) and store them chunk by chunk.
+
+    Streams one NDJSON result per row ({"index", "id"} or {"index", "error"}) and a final
+    {"summary": ...} line; confirmation emails for stored reports go through the outbox.
+    """
+    pending: List[Tuple[int, PollutionReport]] = []
+    summary = {"received": 0, "inserted": 0, "failed": 0}
+
+    async def flush():
+        try:
+            errors = await _insert_reports([report for _, report in pending])
+        except Exception as e:
+            logger.error(f"Error storing {len(pending)} bulk reports: {str(e)}")
+            errors = {position: "Failed to store report" for position in range(len(pending))}
+        results, confirmations = [], []
+        for position, (index, report) in enumerate(pending):
+            if position in errors:
+                summary["failed"] += 1
+                results.append({"index": index, "error": errors[position]})
+            else:
+                summary["inserted"] += 1
+                results.append({"index": index, "id": report.id})
+                confirmations.append((report.email, {"name": report.name, "report_id": report.id}))
+        pending.clear()
+        try:
+            await email_outbox.enqueue_many("report_confirmation", confirmations)
+        except Exception as e:
+            logger.error(f"Failed to queue {len(confirmations)} report confirmation emails: {str(e)}")
+        return "".join(json.dumps(result) + "\n" for result in results).encode()
+
+    async for index, value in rows:
+        summary["received"] += 1
+        try:
+            if isinstance(value, Exception):
+                raise value
+            if not isinstance(value, dict):
+                raise ValueError("each row must be a report object")
+            report = PollutionReport(**PollutionReportCreate.model_validate(value).model_dump())
+        except ValidationError as e:
+            summary["failed"] += 1
+            yield (json.dumps({"index": index, "error": _validation_message(e)}) + "\n").encode()
+            continue
+        except ValueError as e:
+            summary["failed"] += 1
+            yield (json.dumps({"index": index, "error": str(e)}) + "\n").encode()
+            continue
+        pending.append((index, report))
+        if len(pending) >= BULK_REPORTS_CHUNK_ROWS:
+            yield await flush()
+    if pending:
+        yield await flush()
+    yield (json.dumps({"summary": summary}) + "\n").encode()
+
+@api_router.post("/reports/bulk")
+async def bulk_create_reports(request: Request):
+    """Ingest many reports in one upload.
+
+    - `application/x-ndjson`: one `PollutionReportCreate` object per line.
+    - `text/csv`: a header row of `PollutionReportCreate` field names, then one report per row.
+
+    The body is parsed, validated and stored incrementally in chunks of
+    `BULK_REPORTS_CHUNK_ROWS`, so memory stays flat however large the upload.
+    The response streams NDJSON: one result per row, then a summary line.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type:
+        rows = _iter_ndjson(request)
+    elif "csv" in content_type:
+        rows = _iter_csv(request)
+    else:
+        raise HTTPException(status_code=415, detail="Send reports as application/x-ndjson or text/csv")
+    return DuplexStreamingResponse(_ingest_reports(rows), media_type="application/x-ndjson")
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def _encode_cursor(created_at: datetime, report_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([_as_utc(created_at).isoformat(), report_id]).encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        created_at, report_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return _as_utc(datetime.fromisoformat(created_at)), str(report_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _parse_bbox(bbox: str) -> Tuple[float, float, float, float]:
+    """`min_lon,min_lat,max_lon,max_lat` -> floats"""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be min_lon,min_lat,max_lon,max_lat")
+    if not (-180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise HTTPException(status_code=400, detail="bbox is out of range or inverted")
+    return min_lon, min_lat, max_lon, max_lat
+
+def _mongo_bbox_filter(bbox) -> dict:
+    """Viewport filter; the geo 2dsphere index narrows candidates before the exact range check"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    exact = {"longitude": {"$gte": min_lon, "$lte": max_lon}, "latitude": {"$gte": min_lat, "$lte": max_lat}}
+    if covers_hemisphere(bbox):
+        return exact
+    # The polygon's edges are geodesics, so it only approximates the lat/lon box; the range makes it exact
+    return {"geo": {"$geoWithin": {"$geometry": bbox_polygon(bbox)}}, **exact}
+
+def _sqlite_bbox_filter(bbox):
+    """Viewport filter; the R*Tree (when available) narrows candidates before the exact range check"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    exact = and_(PollutionReportDB.longitude.between(min_lon, max_lon),
+                 PollutionReportDB.latitude.between(min_lat, max_lat))
+    if not has_spatial_index():
+        return exact
+    # R*Tree boxes are float32, rounded outwards, so test overlap rather than containment
+    candidates = select(report_rtree.c.id).where(
+        report_rtree.c.max_lon >= min_lon, report_rtree.c.min_lon <= max_lon,
+        report_rtree.c.max_lat >= min_lat, report_rtree.c.min_lat <= max_lat,
+    )
+    return and_(PollutionReportDB.id.in_(candidates), exact)
+
+REPORT_LIST_PROJECTION = {"_id": 0, **{field: 1 for field in ReportListItem.model_fields}}
+
+async def _list_reports_mongo(status, severity, since, until, bbox, after, limit) -> List[dict]:
+    # created_at is stored as an ISO-8601 UTC string, which sorts chronologically
+    query = {}
+    if status is not None:
+        query["status"] = status
+    if severity is not None:
+        query["severity"] = severity
+    if since is not None or until is not None:
+        query["created_at"] = {}
+        if since is not None:
+            query["created_at"]["$gte"] = _as_utc(since).isoformat()
+        if until is not None:
+            query["created_at"]["$lt"] = _as_utc(until).isoformat()
+    if bbox is not None:
+        query.update(_mongo_bbox_filter(bbox))
+    if after is not None:
+        created_at, report_id = after[0].isoformat(), after[1]
+        query["$or"] = [{"created_at": {"$lt": created_at}}, {"created_at": created_at, "id": {"$lt": report_id}}]
+    cursor = (
+        db.pollution_reports.find(query, REPORT_LIST_PROJECTION)
+        .sort([("created_at", -1), ("id", -1)])
+        .limit(limit)
+    )
+    return await cursor.to_list(length=limit)
+
+def _list_reports_sqlite(status, severity, since, until, bbox, after, limit) -> List[dict]:
+    # SQLite stores naive UTC datetimes
+    naive = lambda value: _as_utc(value).replace(tzinfo=None)
+    columns = [
+        PollutionReportDB.report_id.label("id"), PollutionReportDB.name, PollutionReportDB.mobile,
+        PollutionReportDB.email, PollutionReportDB.location, PollutionReportDB.latitude,
+        PollutionReportDB.longitude, PollutionReportDB.severity, PollutionReportDB.status,
+        PollutionReportDB.created_at,
+    ]
+    query = select(*columns)
+    if status is not None:
+        query = query.where(PollutionReportDB.status == status)
+    if severity is not None:
+        query = query.where(PollutionReportDB.severity == severity)
+    if since is not None:
+        query = query.where(PollutionReportDB.created_at >= naive(since))
+    if until is not None:
+        query = query.where(PollutionReportDB.created_at < naive(until))
+    if bbox is not None:
+        query = query.where(_sqlite_bbox_filter(bbox))
+    if after is not None:
+        created_at, report_id = naive(after[0]), after[1]
+        query = query.where(or_(
+            PollutionReportDB.created_at < created_at,
+            and_(PollutionReportDB.created_at == created_at, PollutionReportDB.report_id < report_id),
+        ))
+    query = query.order_by(PollutionReportDB.created_at.desc(), PollutionReportDB.report_id.desc()).limit(limit)
+    sqlite_db = SessionLocal()
+    try:
+        return [{**row, "created_at": _as_utc(row["created_at"])} for row in sqlite_db.execute(query).mappings()]
+    finally:
+        sqlite_db.close()
+
+@api_router.get("/reports", response_model=ReportPage)
+async def list_reports(
+    status: Optional[str] = None,
+    severity: Optional[int] = Query(None, ge=1, le=5),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    bbox: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=REPORT_PAGE_MAX),
+    admin: str = Depends(require_admin),
+):
+    """List reports newest first, with keyset pagination; admin only, as items carry reporters' contact details.
+
+    Pass the returned `next_cursor` back as `cursor` for the following page. Each page
+    seeks straight to its (created_at, id) position in an index instead of skipping
+    rows, so deep pages cost the same as the first. `bbox` is `min_lon,min_lat,max_lon,max_lat`.
+    """
+    args = (
+        status, severity, since, until,
+        _parse_bbox(bbox) if bbox else None,
+        _decode_cursor(cursor) if cursor else None,
+        limit + 1,  # one extra row tells us whether there is a next page
+    )
+    try:
+        try:
+            rows = await _list_reports_mongo(*args)
+        except Exception:
+            # If MongoDB fails, fallback to SQLite
+            rows = await asyncio.to_thread(_list_reports_sqlite, *args)
+    except Exception as e:
+        logger.error(f"Error listing reports: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to list reports")
+
+    reports = [ReportListItem(**row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = reports[-1]
+        next_cursor = _encode_cursor(last.created_at, last.id)
+    return ReportPage(reports=reports, count=len(reports), next_cursor=next_cursor)
+
+async def _count_reports_mongo() -> Tuple[int, Dict[str, int]]:
+    # One count per status, each answered from the (status, created_at, id) index without reading documents
+    statuses = get_args(ReportStatus)
+    counts = await asyncio.gather(*(db.pollution_reports.count_documents({"status": s}) for s in statuses))
+    total = await db.pollution_reports.estimated_document_count()
+    return total, dict(zip(statuses, counts))
+
+def _count_reports_sqlite() -> Tuple[int, Dict[str, int]]:
+    query = select(PollutionReportDB.status, func.count()).group_by(PollutionReportDB.status)
+    sqlite_db = SessionLocal()
+    try:
+        by_status = {status: count for status, count in sqlite_db.execute(query)}
+    finally:
+        sqlite_db.close()
+    return sum(by_status.values()), {status: by_status.get(status, 0) for status in get_args(ReportStatus)}
+
+@api_router.get("/reports/counts", response_model=ReportCounts)
+async def get_report_counts(admin: str = Depends(require_admin)):
+    """Report totals per status for the admin counters, without paging through the reports themselves"""
+    try:
+        try:
+            total, by_status = await _count_reports_mongo()
+        except Exception:
+            # If MongoDB fails, fallback to SQLite
+            total, by_status = await asyncio.to_thread(_count_reports_sqlite)
+    except Exception as e:
+        logger.error(f"Error counting reports: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to count reports")
+    return ReportCounts(total=total, by_status=by_status)
+
+async def _cluster_reports_mongo(bbox, cell, status, limit) -> List[dict]:
+    match = _mongo_bbox_filter(bbox)
+    match.setdefault("geo", {})["$exists"] = True
+    if status is not None:
+        match["status"] = status
+    lon, lat = {"$arrayElemAt": ["$geo.coordinates", 0]}, {"$arrayElemAt": ["$geo.coordinates", 1]}
+    pipeline = [
+        {"$match": match},
+        # Grid anchored at (-180, -90) so clusters stay put while the map pans
+        {"$group": {
+            "_id": {
+                "x": {"$floor": {"$divide": [{"$add": [lon, 180]}, cell]}},
+                "y": {"$floor": {"$divide": [{"$add": [lat, 90]}, cell]}},
+            },
+            "count": {"$sum": 1},
+            "longitude": {"$avg": lon},
+            "latitude": {"$avg": lat},
+            "max_severity": {"$max": "$severity"},
+            "report_id": {"$first": "$id"},
+        }},
+        {"$sort": {"count": -1}},
+        {"$limit": limit},
+        {"$project": {"_id": 0, "count": 1, "longitude": 1, "latitude": 1, "max_severity": 1, "report_id": 1}},
+    ]
+    return await db.pollution_reports.aggregate(pipeline).to_list(length=limit)
+
+def _cluster_reports_sqlite(bbox, cell, status, limit) -> List[dict]:
+    # Same grid as the Mongo path; the offsets keep values positive so CAST truncation is floor
+    x = cast((PollutionReportDB.longitude + 180) / cell, Integer)
+    y = cast((PollutionReportDB.latitude + 90) / cell, Integer)
+    query = (
+        select(
+            func.count().label("count"),
+            func.avg(PollutionReportDB.longitude).label("longitude"),
+            func.avg(PollutionReportDB.latitude).label("latitude"),
+            func.max(PollutionReportDB.severity).label("max_severity"),
+            func.min(PollutionReportDB.report_id).label("report_id"),
+        )
+        .where(PollutionReportDB.latitude.is_not(None), PollutionReportDB.longitude.is_not(None))
+        .where(_sqlite_bbox_filter(bbox))
+        .group_by(x, y)
+        .order_by(func.count().desc())
+        .limit(limit)
+    )
+    if status is not None:
+        query = query.where(PollutionReportDB.status == status)
+    sqlite_db = SessionLocal()
+    try:
+        return [dict(row) for row in sqlite_db.execute(query).mappings()]
+    finally:
+        sqlite_db.close()
+
+@api_router.get("/reports/clusters", response_model=ReportClusters)
+async def get_report_clusters(
+    bbox: str,
+    zoom: int = Query(..., ge=0, le=22),
+    status: Optional[str] = None,
+):
+    """Reports in the viewport grouped into a zoom-dependent grid, for the map.
+
+    Each cell is 1/4 of a map tile edge (~64px), so a city-wide view returns a few
+    hundred clusters at most however many reports there are. Cells are coarsened
+    when the bbox would span more than CLUSTER_MAX_CELLS_PER_SIDE of them, which
+    bounds the grid whatever zoom is sent. `report_id` is only set on single-report
+    clusters. `bbox` is `min_lon,min_lat,max_lon,max_lat`.
+    """
+    box = _parse_bbox(bbox)
+    cell = viewport_cell_degrees(box, zoom, CLUSTER_MAX_CELLS_PER_SIDE)
+    # A grid-aligned box at most N cells across touches at most N + 1 per side
+    limit = (CLUSTER_MAX_CELLS_PER_SIDE + 1) ** 2
+    try:
+        try:
+            rows = await _cluster_reports_mongo(box, cell, status, limit)
+        except Exception:
+            # If MongoDB fails, fallback to SQLite
+            rows = await asyncio.to_thread(_cluster_reports_sqlite, box, cell, status, limit)
+    except Exception as e:
+        logger.error(f"Error clustering reports: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to cluster reports")
+
+    clusters = [
+        ReportCluster(
+            latitude=row["latitude"],
+            longitude=row["longitude"],
+            count=row["count"],
+            max_severity=row["max_severity"],
+            report_id=row["report_id"] if row["count"] == 1 else None,
+        )
+        for row in rows
+    ]
+    clusters.sort(key=lambda cluster: cluster.count, reverse=True)
+    return ReportClusters(
+        zoom=zoom,
+        cell_degrees=cell,
+        total=sum(cluster.count for cluster in clusters),
+        clusters=clusters,
+    )
+
+@api_router.get("/reports/indexes")
+async def get_report_indexes(admin: str = Depends(require_admin)):
+    """Reconcile outcome for the pollution_reports indexes, in-flight builds and hot-query plans"""
+    try:
+        builds = await report_indexes.build_progress()
+        plans = await report_indexes.explain()
+    except Exception as e:
+        logger.error(f"Error inspecting report indexes: {str(e)}")
+        raise HTTPException(status_code=503, detail="MongoDB is unavailable")
+    return {**report_indexes.stats(), "builds": builds, "plans": plans}
+
 @api_router.patch("/reports/{report_id}/status")
-async def update_report_status(report_id: str, status_update: StatusUpdate):
+async def update_report_status(report_id: str, status_update: StatusUpdate, admin: str = Depends(require_admin)):
     try:
         if db is not None:  # MongoDB available
 
-            report = await db.pollution_reports.find_one({"id": report_id}, {"_id": 0})
-            if not report:
-                raise HTTPException(status_code=404, detail="Report not found")
-
-            await db.pollution_reports.update_one(
+            # One atomic round trip; the prior document says who to notify and whether anything changed
+            report = await db.pollution_reports.find_one_and_update(
                 {"id": report_id},
-                {"$set": {"status": status_update.status}}
-            )
-
-            await send_status_update(
-                report['email'],
-                report['name'],
-                report_id,
-                status_update.status
+                {"$set": {"status": status_update.status}},
+                projection={"_id": 0, "email": 1, "name": 1, "status": 1},
+                return_document=ReturnDocument.BEFORE
             )
+            if not report:
+                raise HTTPException(status_code=404, detail="Report not found")
+            previous_status = report.get("status")
+
+            if previous_status != status_update.status:
+                await _enqueue_email(
+                    "status_update",
+                    report['email'],
+                    name=report['name'],
+                    report_id=report_id,
+                    new_status=status_update.status
+                )
         else:  # SQLite fallback
-            from database import PollutionReportDB
             sqlite_db = SessionLocal()
             try:
                 db_report = sqlite_db.query(PollutionReportDB).filter(PollutionReportDB.report_id == report_id).first()
                 if not db_report:
                     raise HTTPException(status_code=404, detail="Report not found")
 
+                previous_status = db_report.status
                 db_report.status = status_update.status
                 sqlite_db.commit()
 
-                await send_status_update(
-                    db_report.email,
-                    db_report.name,
-                    report_id,
-                    status_update.status
-                )
+                if previous_status != status_update.status:
+                    await _enqueue_email(
+                        "status_update",
+                        db_report.email,
+                        name=db_report.name,
+                        report_id=report_id,
+                        new_status=status_update.status
+                    )
             finally:
                 sqlite_db.close()
 
-        return {"message": "Status updated successfully"}
+        return {"message": "Status updated successfully", "previous_status": previous_status}
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error updating status: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update status")
 
+REPORT_NOTIFY_PROJECTION = {"_id": 0, "id": 1, "email": 1, "name": 1, "status": 1}
+
+async def _transition_reports_mongo(found: List[dict], new_status: str) -> Tuple[List[dict], List[str]]:
+    """Apply `new_status` to `found` with one bulk_write; returns (reports that transitioned, ids that failed)"""
+    changing = [report for report in found if report.get("status") != new_status]
+    if not changing:
+        return [], []
+    failed: List[str] = []
+    try:
+        # Each update is guarded by the status we read, so a concurrent change isn't overwritten or notified twice
+        result = await db.pollution_reports.bulk_write(
+            [UpdateOne({"id": report["id"], "status": report.get("status")}, {"$set": {"status": new_status}})
+             for report in changing],
+            ordered=False
+        )
+        modified = result.modified_count
+    except BulkWriteError as e:
+        # Unordered, so every update without a write error was still applied and must be notified
+        errors = e.details.get("writeErrors", [])
+        failed_positions = {error["index"] for error in errors}
+        failed = [changing[position]["id"] for position in sorted(failed_positions)]
+        logger.error(f"{len(failed)} of {len(changing)} status updates failed: {errors[0].get('errmsg') if errors else e}")
+        changing = [report for position, report in enumerate(changing) if position not in failed_positions]
+        modified = e.details.get("nModified", 0)
+    if modified < len(changing):
+        # Some lost a race; only notify for the ones that now carry our status
+        applied = set(await db.pollution_reports.distinct(
+            "id", {"id": {"$in": [report["id"] for report in changing]}, "status": new_status}
+        ))
+        changing = [report for report in changing if report["id"] in applied]
+    return changing, failed
+
+def _transition_reports_sqlite(ids: List[str], new_status: str) -> Tuple[List[dict], List[dict]]:
+    """SQLite fallback; returns (reports found, reports that transitioned)"""
+    sqlite_db = SessionLocal()
+    try:
+        found = [dict(report) for report in sqlite_db.execute(
+            select(PollutionReportDB.report_id.label("id"), PollutionReportDB.email, PollutionReportDB.name,
+                   PollutionReportDB.status)
+            .where(PollutionReportDB.report_id.in_(ids))
+        ).mappings()]
+        changing = [report for report in found if report["status"] != new_status]
+        if changing:
+            sqlite_db.execute(
+                update(PollutionReportDB)
+                .where(PollutionReportDB.report_id.in_([report["id"] for report in changing]))
+                .values(status=new_status)
+            )
+            sqlite_db.commit()
+        return found, changing
+    finally:
+        sqlite_db.close()
+
+@api_router.patch("/reports/status:bulk", response_model=BulkStatusResult)
+async def bulk_update_report_status(bulk: BulkStatusUpdate, admin: str = Depends(require_admin)):
+    """Move many reports to one status (e.g. closing out an enforcement drive).
+
+    Reports already in the target status count as unchanged and aren't notified;
+    every report that transitions gets a status_update email through the outbox.
+    Reports whose update hit a write error are listed in `failed`; the rest still apply.
+    """
+    ids = list(dict.fromkeys(bulk.ids))
+    try:
+        try:
+            found = await db.pollution_reports.find(
+                {"id": {"$in": ids}}, REPORT_NOTIFY_PROJECTION
+            ).to_list(length=None)
+        except Exception:
+            # If MongoDB fails, fallback to SQLite
+            found, changed = await asyncio.to_thread(_transition_reports_sqlite, ids, bulk.status)
+            failed = []
+        else:
+            changed, failed = await _transition_reports_mongo(found, bulk.status)
+    except Exception as e:
+        logger.error(f"Error updating {len(ids)} report statuses: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to update statuses")
+
+    try:
+        await email_outbox.enqueue_many("status_update", [
+            (report["email"], {"name": report["name"], "report_id": report["id"], "new_status": bulk.status})
+            for report in changed
+        ])
+    except Exception as e:
+        logger.error(f"Failed to queue {len(changed)} status update emails: {str(e)}")
+
+    found_ids = {report["id"] for report in found}
+    return BulkStatusResult(
+        requested=len(ids),
+        updated=len(changed),
+        unchanged=len(found) - len(changed) - len(failed),
+        not_found=[report_id for report_id in ids if report_id not in found_ids],
+        failed=failed,
+    )
+
 @api_router.post("/routes/safe", response_model=SafeRouteResponse)
 async def calculate_safe_route(route_req: SafeRouteRequest):
     try:
@@ -696,8 +1820,12 @@ async def get_gemini_response(prompt: str, fallback: str = "Analysis unavailable
         for model_name in model_names:
             try:
                 model = genai.GenerativeModel(model_name)
-                response = model.generate_content(prompt)
+                # generate_content blocks, so run it off the event loop under the breaker
+                response = await gemini_breaker.call(asyncio.to_thread, model.generate_content, prompt)
                 return response.text
+            except (CircuitOpenError, DeadlineExceeded) as e:
+                logger.warning(f"Gemini skipped: {str(e)} - using fallback response")
+                return fallback
             except Exception as model_error:
                 logger.debug(f"Model {model_name} failed: {str(model_error)}")
                 continue
@@ -714,6 +1842,25 @@ async def get_gemini_response(prompt: str, fallback: str = "Analysis unavailable
 async def get_aqi_heatmap():
     """Get pollution heatmap data for Delhi NCR region"""
     try:
+        # Prefer real station readings published by the station poller
+        stations = station_poller.snapshot
+        if stations is not None:
+            table = stations.data
+            intensities = np.clip(table.aqi / 500.0, 0.1, 1.0)
+            categories = aqi_categories(table.aqi)
+            points = [
+                HeatmapPoint(lat=lat, lng=lng, intensity=intensity, aqi=round(aqi, 1), category=category)
+                for lat, lng, intensity, aqi, category in zip(
+                    table.lat.tolist(), table.lng.tolist(), intensities.tolist(), table.aqi.tolist(), categories.tolist()
+                )
+            ]
+            return HeatmapResponse(
+                points=points,
+                timestamp=stations.fetched_at,
+                prediction_type="observed",
+                model_version="heatmap_stations_v1.0"
+            )
+
         # Get current AQI for base intensity
         aqi_data = await get_current_aqi()
         base_aqi = aqi_data.aqi
@@ -1007,6 +2154,9 @@ Format as JSON array with: title, description, priority, icon"""
             generated_at=datetime.now(timezone.utc)
         )
         
+    except HTTPException:
+        # e.g. the forecast's 503 while the model is still loading
+        raise
     except Exception as e:
         logger.error(f"Error generating recommendations: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate recommendations")
@@ -1049,7 +2199,7 @@ async def get_forecast_alerts():
             alert_id_counter += 1
 
         # Trend-based alert
-        if forecast_data.trend == "worsening":
+        if forecast_data.trend == "increasing":
             alerts.append(Alert(
                 id=f"alert_{alert_id_counter}",
                 severity="medium",
@@ -1062,7 +2212,7 @@ async def get_forecast_alerts():
             alert_id_counter += 1
 
         # Improvement alert
-        if forecast_data.trend == "improving" and aqi_data.aqi > 150:
+        if forecast_data.trend == "decreasing" and aqi_data.aqi > 150:
             alerts.append(Alert(
                 id=f"alert_{alert_id_counter}",
                 severity="low",
@@ -1107,6 +2257,8 @@ async def get_forecast_alerts():
             generated_at=datetime.now(timezone.utc)
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating alerts: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate alerts")
@@ -1167,15 +2319,15 @@ Return as simple bullet points (3-5 words each), no formatting."""
             if forecast_data.aqi_48h is not None and forecast_data.aqi_48h > 200:
                 key_insights.append("⚠️ Unhealthy conditions expected - take precautions")
 
-            if trend == "improving":
+            if trend == "decreasing":
                 key_insights.append("✅ Improving conditions - outdoor activities safer soon")
-            elif trend == "worsening":
+            elif trend == "increasing":
                 key_insights.append("⚠️ Deteriorating conditions - limit outdoor exposure")
         
         # Generate forecast summary
-        if trend == "improving":
+        if trend == "decreasing":
             forecast_summary = f"Air quality improving from {int(current_aqi)} to {int(forecast_data.aqi_72h or current_aqi)} over 72 hours"
-        elif trend == "worsening":
+        elif trend == "increasing":
             forecast_summary = f"Air quality deteriorating from {int(current_aqi)} to {int(forecast_data.aqi_72h or current_aqi)} over 72 hours"
         else:
             forecast_summary = f"Air quality stable around {int(current_aqi)} for next 72 hours"
@@ -1200,6 +2352,8 @@ Return as simple bullet points (3-5 words each), no formatting."""
             generated_at=datetime.now(timezone.utc)
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating insights: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate insights summary")
@@ -1211,7 +2365,7 @@ async def get_model_transparency():
     # Check ML model status
     forecaster_status = "ml"
 
-    attribution_status = "simulation"
+    attribution_status = "ml" if source_model_loader.ready else "heuristic"
 
     
     if forecaster_status == "ml" and attribution_status == "ml":
@@ -1219,7 +2373,7 @@ async def get_model_transparency():
         current_version = "v2.0 - Trained ML models on historical data (2015-2025)"
         limitations = [
             "Model predictions based on historical patterns - extreme weather events may affect accuracy",
-            "AQI memory features use current AQI as proxy (sliding window not yet implemented)",
+            "AQI memory features come from an in-memory 72h window of readings; current AQI is the proxy until it fills",
             "Source attribution trained on labeled Delhi NCR data",
             "Real-time data depends on WAQI API availability",
             "Ensemble predictions provide confidence intervals"
@@ -1307,6 +2461,91 @@ All API endpoints maintain consistent response schema regardless of model status
         update_frequency="Real-time AQI updates, ML predictions on-demand, Models retrained quarterly"
     )
 
+@api_router.get("/model/registry")
+async def get_model_registry():
+    """Active, previous and candidate forecasting models, with shadow-scoring comparison"""
+    return model_registry.stats()
+
+@api_router.post("/model/registry/candidate")
+async def load_model_candidate(candidate: ModelCandidateRequest, admin: str = Depends(require_admin)):
+    """Download, load and warm up a candidate model in the background; optionally shadow-score it.
+
+    The artifact must come from an allowed URL prefix and match its SHA-256, since loading it unpickles it.
+    """
+    segments = urlsplit(candidate.url).path.split("/")
+    if ".." in segments or not any(candidate.url.startswith(prefix) for prefix in MODEL_CANDIDATE_URL_PREFIXES):
+        raise HTTPException(status_code=400, detail="Model URL is not on the allowed list")
+    basename = segments[-1]
+    if not re.fullmatch(r"[A-Za-z0-9._-]+", basename) or basename == ".":
+        raise HTTPException(status_code=400, detail="Model URL must end in a plain file name")
+    filename = f"{candidate.version}-{basename}"
+    logger.info(f"{admin} requested candidate model {candidate.version} from {candidate.url}")
+    try:
+        model_registry.load_candidate(
+            candidate.version,
+            partial(load_forecast_model, candidate.url, candidate.sha256, filename),
+            source=candidate.url,
+            shadow_sample_rate=candidate.shadow_sample_rate,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"message": f"Loading candidate model {candidate.version}"}
+
+@api_router.post("/model/registry/promote")
+async def promote_model_candidate(admin: str = Depends(require_admin)):
+    """Atomically swap the warmed-up candidate in as the active model"""
+    try:
+        promoted = model_registry.promote()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    logger.info(f"{admin} promoted model {promoted.version}")
+    return {"message": f"Model {promoted.version} is now active", "active": promoted.describe()}
+
+@api_router.get("/health")
+async def liveness():
+    """Liveness probe: the process is up and serving, whether or not models are loaded"""
+    return {"status": "ok"}
+
+@api_router.get("/ready")
+async def readiness():
+    """Readiness probe: 200 once the forecasting model is loaded and warmed up, else 503"""
+    body = {"status": "ready" if model_loader.ready else model_loader.state, "model": model_loader.stats()}
+    return JSONResponse(status_code=200 if model_loader.ready else 503, content=body)
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Runtime metrics for monitoring: upstream data freshness and cache behaviour"""
+    return {
+        "waqi_poller": aqi_poller.stats(),
+        "aqi_cache": aqi_cache.stats(),
+        "circuit_breakers": breaker_stats(),
+        "inference": forecast_predictor.stats(),
+        "model": {**model_loader.stats(), "mmap": MODEL_MMAP},
+        "feature_store": feature_store.stats(),
+        "forecast_cache": forecast_cache.stats(),
+        "prediction_log": prediction_log.stats(),
+        "email_outbox": email_outbox.stats(),
+        "report_indexes": report_indexes.stats(),
+        "smtp_pool": smtp_pool_stats(),
+        "email_templates": email_templates.stats(),
+        "source_attribution": {
+            **source_attributor.stats(),
+            "model": source_model_loader.stats(),
+            "cache": source_cache.stats(),
+        },
+        "ensemble": {
+            **ensemble_loader.stats(),
+            **(ensemble_loader.model.stats() if ensemble_loader.ready else {}),
+            "inference": ensemble_predictor.stats(),
+        },
+        "process_memory": process_memory(),
+        "waqi_stations": {
+            **station_poller.stats(),
+            "stations": len(station_poller.snapshot.data) if station_poller.snapshot else 0,
+            "failed_stations": station_poller.snapshot.data.failed if station_poller.snapshot else None,
+        },
+    }
+
 app.include_router(api_router)
 
 app.add_middleware(
@@ -1318,12 +2557,81 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_deadline(request: Request, call_next):
+    """Give every request a latency budget that upstream calls spend from"""
+    with deadline(REQUEST_BUDGET_SECONDS):
+        return await call_next(request)
+
 @app.on_event("startup")
 async def startup_db():
     """Initialize database on startup"""
     init_db()
     logger.info("✅ Database initialized")
+    report_indexes.start()
+
+@app.on_event("startup")
+async def startup_http_client():
+    """Open the shared, pooled HTTP client used for upstream API calls"""
+    await start_http_session()
+
+@app.on_event("startup")
+async def startup_model():
+    """Load the forecasting models in the background so the app can bind immediately"""
+    model_loader.start()
+    if EnsembleForecaster.available(ML_MODEL1_DIR):
+        ensemble_loader.start()
+    if SOURCE_MODEL_PATH.exists():
+        source_model_loader.start()
+
+@app.on_event("startup")
+async def startup_inference():
+    forecast_predictor.start()
+    ensemble_predictor.start()
+
+@app.on_event("startup")
+async def startup_log_sink():
+    prediction_log.start()
+
+@app.on_event("startup")
+async def startup_email_outbox():
+    """Start delivering queued emails, including any left over from a previous run"""
+    email_templates.precompile()
+    email_outbox.start()
+
+@app.on_event("startup")
+async def startup_waqi_poller():
+    """Start background WAQI ingestion so request handlers read snapshots instead of the network"""
+    if WAQI_POLL_INTERVAL_SECONDS > 0:
+        aqi_poller.start()
+    if WAQI_STATION_POLL_INTERVAL_SECONDS > 0:
+        station_poller.start()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await report_indexes.stop()
     client.close()
+
+@app.on_event("shutdown")
+async def shutdown_waqi_poller():
+    await aqi_poller.stop()
+    await station_poller.stop()
+
+@app.on_event("shutdown")
+async def shutdown_inference():
+    await forecast_predictor.stop()
+    await ensemble_predictor.stop()
+
+@app.on_event("shutdown")
+async def shutdown_email_outbox():
+    await email_outbox.stop()
+    await close_smtp_pool()
+
+@app.on_event("shutdown")
+async def shutdown_log_sink():
+    """Flush queued prediction and attribution logs before exit"""
+    await prediction_log.stop()
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    await close_http_session()
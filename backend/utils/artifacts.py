@@ -0,0 +1,163 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArtifactChecksumError(Exception):
+    """Downloaded artifact does not match the expected SHA-256"""
+
+
+def sha256_file(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextmanager
+def exclusive_lock(lock_path: Path):
+    """Cross-process lock so only one worker builds a given cache entry at a time"""
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _resume_state_path(part_path: Path) -> Path:
+    return part_path.with_name(f"{part_path.name}.resume")
+
+
+def _discard_partial(part_path: Path):
+    part_path.unlink(missing_ok=True)
+    _resume_state_path(part_path).unlink(missing_ok=True)
+
+
+def _content_range(header: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """(first byte, total size) from `bytes a-b/N` or `bytes */N`; None where absent or unknown"""
+    match = re.fullmatch(r"bytes (?:(\d+)-\d+|\*)/(\d+|\*)", (header or "").strip())
+    if match is None:
+        return None, None
+    start, total = match.groups()
+    return (int(start) if start else None), (int(total) if total != "*" else None)
+
+
+def _download_to(url: str, part_path: Path, chunk_size: int, timeout: float):
+    """Append the rest of `url` to `part_path`, resuming with an HTTP Range request.
+
+    A resume sends If-Range with the ETag (or Last-Modified) of the response that
+    started the partial file, so a changed artifact comes back whole instead of being
+    spliced onto the old bytes; the Content-Range must also start at our offset and
+    report the size we started with. Without a validator the download restarts.
+    """
+    state_path = _resume_state_path(part_path)
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    state = json.loads(state_path.read_text()) if offset and state_path.exists() else {}
+    if offset and not state.get("validator"):
+        logger.info("Partial artifact has no validator to resume against; restarting download")
+        _discard_partial(part_path)
+        offset = 0
+    headers = {"Range": f"bytes={offset}-", "If-Range": state["validator"]} if offset else {}
+
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as r:
+        if offset and r.status_code == 416:
+            _, total = _content_range(r.headers.get("Content-Range"))
+            if total == offset and state.get("size") in (None, total):
+                return  # the partial file already holds the whole artifact
+            logger.warning(f"Partial artifact is {offset} bytes but the server has {total}; restarting download")
+            _discard_partial(part_path)
+            raise requests.ConnectionError("partial artifact does not match the remote file")
+        r.raise_for_status()
+        if offset and r.status_code == 206:
+            start, total = _content_range(r.headers.get("Content-Range"))
+            if start != offset or total is None or state.get("size") not in (None, total):
+                logger.warning(f"Unexpected Content-Range {r.headers.get('Content-Range')!r} for offset {offset}; "
+                               "restarting download")
+                _discard_partial(part_path)
+                raise requests.ConnectionError("range response does not continue the partial artifact")
+            logger.info(f"Resuming artifact download at byte {offset}")
+        elif offset:
+            # 200: the server ignored the range, or If-Range said the artifact changed
+            logger.info("Server sent the whole artifact instead of the requested range; restarting download")
+            offset = 0
+        if not offset:
+            etag = r.headers.get("ETag")
+            length = r.headers.get("Content-Length")
+            state = {
+                # Weak ETags can't be used with If-Range
+                "validator": etag if etag and not etag.startswith("W/") else r.headers.get("Last-Modified"),
+                "size": int(length) if length and length.isdigit() else None,
+            }
+            state_path.write_text(json.dumps(state))
+        with open(part_path, "ab" if offset else "wb") as f:
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    size = part_path.stat().st_size
+    if state.get("size") is not None and size != state["size"]:
+        raise requests.ConnectionError(f"artifact body ended at {size} of {state['size']} bytes")
+
+
+def fetch_artifact(url: str, cache_dir: Path, filename: Optional[str] = None, sha256: Optional[str] = None,
+                   chunk_size: int = CHUNK_SIZE, timeout: float = 60, max_attempts: int = 3) -> Path:
+    """Return a local path to the artifact at `url`, downloading it into `cache_dir` if needed.
+
+    The body is streamed to `<name>.part` in chunks, resumed with HTTP Range after a
+    dropped connection (or a crash in a previous run), verified against `sha256`
+    when given, and only then renamed into place, so the cache never holds a
+    truncated artifact under its final name. Workers sharing `cache_dir` serialize
+    on a lock file and reuse whatever the first one downloaded.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    filename = filename or url.rstrip("/").rsplit("/", 1)[-1]
+    dest = cache_dir / filename
+    part = cache_dir / f"{filename}.part"
+
+    with exclusive_lock(cache_dir / f"{filename}.lock"):
+        if dest.exists():
+            if sha256 is None or sha256_file(dest, chunk_size) == sha256.lower():
+                return dest
+            logger.warning(f"Cached {filename} failed checksum verification; re-downloading")
+            dest.unlink()
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                _download_to(url, part, chunk_size, timeout)
+                break
+            except requests.RequestException as e:
+                if attempt == max_attempts:
+                    raise
+                logger.warning(f"Artifact download interrupted ({str(e)}); retry {attempt}/{max_attempts - 1}")
+
+        if sha256 is not None:
+            actual = sha256_file(part, chunk_size)
+            if actual != sha256.lower():
+                _discard_partial(part)
+                raise ArtifactChecksumError(f"{filename}: expected sha256 {sha256}, got {actual}")
+
+        os.replace(part, dest)
+        _resume_state_path(part).unlink(missing_ok=True)
+        dir_fd = os.open(cache_dir, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        logger.info(f"Artifact {filename} cached at {dest}")
+        return dest
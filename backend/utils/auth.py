@@ -0,0 +1,30 @@
+import base64
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+
+def issue_token(secret: str, subject: str, ttl_seconds: float) -> str:
+    """Signed `<subject>.<expiry>.<signature>` bearer token; any worker sharing `secret` can verify it"""
+    expires = int(time.time() + ttl_seconds)
+    payload = f"{base64.urlsafe_b64encode(subject.encode()).decode().rstrip('=')}.{expires}"
+    return f"{payload}.{_sign(secret, payload)}"
+
+
+def verify_token(secret: str, token: str) -> Optional[str]:
+    """Return the token's subject, or None if it is malformed, tampered with or expired"""
+    try:
+        encoded, expires, signature = token.split(".")
+        if not hmac.compare_digest(signature, _sign(secret, f"{encoded}.{expires}")):
+            return None
+        if int(expires) < time.time():
+            return None
+        return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode()
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _sign(secret: str, payload: str) -> str:
+    digest = hmac.new(secret.encode(), payload.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
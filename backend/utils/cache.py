@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightCache:
+    """Single-value async cache with a TTL, request coalescing and stale-while-revalidate.
+
+    - Fresh value: returned immediately.
+    - Stale value: returned immediately while one background refresh runs.
+    - No value yet: concurrent callers share a single in-flight load.
+
+    The loader must return the new value, or raise / return None on failure.
+    A failed refresh never discards a previously cached value.
+    """
+
+    def __init__(self, ttl_seconds: float, name: str = "cache"):
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self._value: Any = None
+        self._loaded_at: Optional[float] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_failures = 0
+
+    @property
+    def has_value(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    def set(self, value: Any):
+        """Store a value obtained elsewhere (e.g. by a background poller)"""
+        self._value = value
+        self._loaded_at = time.monotonic()
+
+    def peek(self) -> Any:
+        """Return the cached value (fresh or stale) without triggering a load"""
+        return self._value
+
+    async def get(self, loader: Callable[[], Awaitable[Any]]) -> Any:
+        age = self.age_seconds
+        if age is not None:
+            if age < self.ttl_seconds:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._start_load(loader)
+            return self._value
+
+        self.misses += 1
+        task = self._start_load(loader)
+        # Shield so one cancelled caller doesn't cancel the load for everyone else
+        await asyncio.shield(task)
+        if not self.has_value:
+            raise RuntimeError(f"{self.name}: upstream load failed and nothing is cached")
+        return self._value
+
+    def _start_load(self, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._load(loader))
+        return self._inflight
+
+    async def _load(self, loader: Callable[[], Awaitable[Any]]):
+        self.loads += 1
+        try:
+            value = await loader()
+        except Exception as e:
+            self.load_failures += 1
+            logger.warning(f"{self.name}: refresh failed: {str(e)}")
+            return
+        if value is None:
+            self.load_failures += 1
+            return
+        self.set(value)
+
+    def stats(self) -> dict:
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "age_seconds": self.age_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "load_failures": self.load_failures,
+        }
+
+
+class LRUCache:
+    """Bounded key/value cache with least-recently-used eviction and hit/miss counters.
+
+    Safe to clear from other threads (e.g. a model loader activating a new version).
+    """
+
+    def __init__(self, max_entries: int = 256, name: str = "lru"):
+        self.max_entries = max_entries
+        self.name = name
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for `key` (marking it recently used), or None"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, e.g. when the inputs or the model behind them change"""
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, or_, select, update
+
+from backend.database import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# renderer(**context) -> (subject, html, text), passed after the address to send_fn
+Renderer = Callable[..., Tuple[str, ...]]
+
+
+class EmailOutboxWorker:
+    """Durable email outbox in the SQL database, drained by background workers.
+
+    `enqueue` commits one row and returns, so API handlers only pay for a local
+    insert. Workers claim due rows (pending, or `sending` whose lease expired
+    after a crash) one UPDATE at a time, so several processes can share the
+    table without sending a message twice. A failed send is retried with
+    exponential backoff and jitter until `max_attempts`, then marked failed;
+    one that `is_permanent` says can never succeed is marked failed straight away.
+    """
+
+    def __init__(self, session_factory: Callable, send_fn: Callable[..., Awaitable[None]],
+                 renderers: Dict[str, Renderer], workers: int = 2, batch_size: int = 20,
+                 poll_interval: float = 5.0, max_attempts: int = 6, base_backoff: float = 30.0,
+                 max_backoff: float = 3600.0, lease_seconds: float = 300.0,
+                 is_permanent: Optional[Callable[[Exception], bool]] = None, name: str = "email_outbox"):
+        self.session_factory = session_factory
+        self.send_fn = send_fn
+        self.renderers = renderers
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.lease = timedelta(seconds=lease_seconds)
+        self.is_permanent = is_permanent
+        self.name = name
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self.enqueued = 0
+        self.sent = 0
+        self.retries = 0
+        self.failed = 0
+
+    def start(self):
+        if not self._tasks:
+            self._wakeup = asyncio.Event()
+            self._tasks = [asyncio.create_task(self._run(i)) for i in range(self.workers)]
+
+    async def stop(self):
+        """Stop the workers; anything unsent stays in the table for the next start"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def enqueue(self, kind: str, to_email: str, **context) -> int:
+        """Persist one email for delivery; returns its outbox id"""
+        if kind not in self.renderers:
+            raise ValueError(f"Unknown email kind {kind!r}")
+        outbox_id = await asyncio.to_thread(self._insert, kind, to_email, context)
+        self.enqueued += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return outbox_id
+
+    async def enqueue_many(self, kind: str, messages: List[Tuple[str, dict]]) -> int:
+        """Persist many emails of one kind in a single transaction; `messages` is [(to_email, context)]"""
+        if kind not in self.renderers:
+            raise ValueError(f"Unknown email kind {kind!r}")
+        if not messages:
+            return 0
+        await asyncio.to_thread(self._insert_many, kind, messages)
+        self.enqueued += len(messages)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return len(messages)
+
+    def _insert_many(self, kind: str, messages: List[Tuple[str, dict]]):
+        session = self.session_factory()
+        try:
+            session.execute(insert(EmailOutbox), [
+                dict(kind=kind, to_email=to_email, context=json.dumps(context))
+                for to_email, context in messages
+            ])
+            session.commit()
+        finally:
+            session.close()
+
+    def _insert(self, kind: str, to_email: str, context: dict) -> int:
+        session = self.session_factory()
+        try:
+            row = EmailOutbox(kind=kind, to_email=to_email, context=json.dumps(context))
+            session.add(row)
+            session.commit()
+            return row.id
+        finally:
+            session.close()
+
+    def _claim(self) -> List[EmailOutbox]:
+        """Lease up to `batch_size` due rows to this worker"""
+        now = datetime.utcnow()
+        session = self.session_factory()
+        try:
+            candidates = session.scalars(
+                select(EmailOutbox.id)
+                .where(or_(
+                    (EmailOutbox.status == "pending") & (EmailOutbox.next_attempt_at <= now),
+                    (EmailOutbox.status == "sending") & (EmailOutbox.locked_until < now),
+                ))
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+            ).all()
+            claimed = []
+            for outbox_id in candidates:
+                # Conditional update: only one worker/process wins each row
+                result = session.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id == outbox_id)
+                    .where(or_(
+                        EmailOutbox.status == "pending",
+                        (EmailOutbox.status == "sending") & (EmailOutbox.locked_until < now),
+                    ))
+                    .values(status="sending", locked_until=now + self.lease)
+                )
+                session.commit()
+                if result.rowcount == 1:
+                    claimed.append(outbox_id)
+            if not claimed:
+                return []
+            rows = session.scalars(select(EmailOutbox).where(EmailOutbox.id.in_(claimed))).all()
+            session.expunge_all()
+            return rows
+        finally:
+            session.close()
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _finish(self, row: EmailOutbox, error: Optional[str], permanent: bool = False):
+        now = datetime.utcnow()
+        attempts = (row.attempts or 0) + 1
+        if error is None:
+            values = dict(status="sent", attempts=attempts, sent_at=now, locked_until=None, last_error=None)
+        elif permanent or attempts >= self.max_attempts:
+            values = dict(status="failed", attempts=attempts, locked_until=None, last_error=error)
+        else:
+            values = dict(
+                status="pending", attempts=attempts, locked_until=None, last_error=error,
+                next_attempt_at=now + timedelta(seconds=self._backoff(attempts)),
+            )
+        session = self.session_factory()
+        try:
+            session.execute(update(EmailOutbox).where(EmailOutbox.id == row.id).values(**values))
+            session.commit()
+        finally:
+            session.close()
+        return values["status"]
+
+    async def _deliver(self, row: EmailOutbox):
+        error = None
+        permanent = False
+        try:
+            await self.send_fn(row.to_email, *self.renderers[row.kind](**json.loads(row.context)))
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+            permanent = self.is_permanent is not None and self.is_permanent(e)
+        status = await asyncio.to_thread(self._finish, row, error, permanent)
+        if status == "sent":
+            self.sent += 1
+        elif status == "failed":
+            self.failed += 1
+            logger.error(f"{self.name}: giving up on email {row.id} to {row.to_email}: {error}")
+        else:
+            self.retries += 1
+            logger.warning(f"{self.name}: email {row.id} failed ({error}); will retry")
+
+    async def drain_once(self) -> int:
+        """Claim and deliver one batch of due emails; returns how many were attempted"""
+        rows = await asyncio.to_thread(self._claim)
+        # Sent concurrently; the SMTP pool caps how many are actually on the wire
+        await asyncio.gather(*(self._deliver(row) for row in rows))
+        return len(rows)
+
+    async def _run(self, worker: int):
+        while True:
+            # Cleared before claiming, so an enqueue during the claim still wakes us
+            self._wakeup.clear()
+            try:
+                if await self.drain_once():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{self.name} worker {worker}: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "retries": self.retries,
+            "failed": self.failed,
+        }
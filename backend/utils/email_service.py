@@ -1,8 +1,11 @@
 import os
-import aiosmtplib
+from typing import Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import logging
+from backend.utils.email_templates import EmailTemplates, RenderedEmail
+from backend.utils.resilience import CircuitBreaker
+from backend.utils.smtp_pool import REJECTION_ERRORS, SMTPPool
 
 logger = logging.getLogger(__name__)
 
@@ -11,82 +14,100 @@ EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '587'))
 EMAIL_USER = os.environ.get('EMAIL_USER')
 EMAIL_PASSWORD = os.environ.get('EMAIL_PASSWORD')
 EMAIL_FROM = os.environ.get('EMAIL_FROM', EMAIL_USER)
+SMTP_TIMEOUT = float(os.environ.get('SMTP_TIMEOUT', '10'))
+EMAIL_STARTTLS = os.environ.get('EMAIL_STARTTLS', 'true').lower() in ('1', 'true', 'yes')
+# Concurrent SMTP sessions; keep at or below the provider's connection limit
+SMTP_POOL_SIZE = int(os.environ.get('SMTP_POOL_SIZE', '4'))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.environ.get('SMTP_MAX_MESSAGES_PER_CONNECTION', '100'))
 
-async def send_email(to_email: str, subject: str, html_content: str):
-    try:
-        message = MIMEMultipart('alternative')
-        message['From'] = EMAIL_FROM
-        message['To'] = to_email
-        message['Subject'] = subject
-        
-        html_part = MIMEText(html_content, 'html')
-        message.attach(html_part)
-        
-        await aiosmtplib.send(
-            message,
-            hostname=EMAIL_HOST,
-            port=EMAIL_PORT,
+# Fail fast instead of waiting out a full SMTP timeout for every message while the server is down.
+# A refused address says nothing about the server, so a few bad recipients don't block everyone else.
+smtp_breaker = CircuitBreaker("smtp", failure_threshold=3, reset_timeout=60, call_timeout=SMTP_TIMEOUT,
+                              ignored_errors=REJECTION_ERRORS)
+
+def build_message(to_email: str, subject: str, html_content: str, text_content: Optional[str] = None) -> MIMEMultipart:
+    message = MIMEMultipart('alternative')
+    message['From'] = EMAIL_FROM
+    message['To'] = to_email
+    message['Subject'] = subject
+    # Plain text first: clients show the last alternative they can render
+    if text_content:
+        message.attach(MIMEText(text_content, 'plain'))
+    message.attach(MIMEText(html_content, 'html'))
+    return message
+
+_smtp_pool = None
+
+def get_smtp_pool() -> SMTPPool:
+    """Shared pool of authenticated sessions, created on first send from the current settings"""
+    global _smtp_pool
+    if _smtp_pool is None:
+        _smtp_pool = SMTPPool(
+            EMAIL_HOST,
+            EMAIL_PORT,
             username=EMAIL_USER,
             password=EMAIL_PASSWORD,
-            start_tls=True
+            start_tls=EMAIL_STARTTLS,
+            timeout=SMTP_TIMEOUT,
+            size=SMTP_POOL_SIZE,
+            max_messages_per_connection=SMTP_MAX_MESSAGES_PER_CONNECTION,
+            breaker=smtp_breaker,
         )
-        logger.info(f"Email sent successfully to {to_email}")
+    return _smtp_pool
+
+async def close_smtp_pool():
+    global _smtp_pool
+    if _smtp_pool is not None:
+        await _smtp_pool.close()
+        _smtp_pool = None
+
+def smtp_pool_stats():
+    return _smtp_pool.stats() if _smtp_pool is not None else None
+
+async def deliver_email(to_email: str, subject: str, html_content: str, text_content: Optional[str] = None):
+    """Send one message, raising on failure (the outbox uses the error to schedule a retry)"""
+    await get_smtp_pool().send(build_message(to_email, subject, html_content, text_content))
+    logger.info(f"Email sent successfully to {to_email}")
+
+async def send_email(to_email: str, subject: str, html_content: str, text_content: Optional[str] = None):
+    try:
+        await deliver_email(to_email, subject, html_content, text_content)
         return True
     except Exception as e:
         logger.error(f"Failed to send email to {to_email}: {str(e)}")
         return False
 
+SUBJECTS = {
+    'report_confirmation': "Pollution Report Submitted - Delhi Air Command",
+    'status_update': "Report Status Update: {{ new_status | title }} - Delhi Air Command",
+}
+
+STATUS_MESSAGES = {
+    'viewed': 'Your report has been reviewed by our team.',
+    'processing': 'We are actively working on addressing the issue you reported.',
+    'completed': 'The issue has been resolved. Thank you for helping us keep Delhi clean!'
+}
+
+# Compiled at startup (precompile); templates live in backend/templates/email. Everything but the
+# recipient's name and report id is rendered once per kind and status and reused across a bulk run
+email_templates = EmailTemplates(SUBJECTS, per_recipient=('name', 'report_id'))
+
+def render_report_confirmation(name: str, report_id: str) -> RenderedEmail:
+    return email_templates.render('report_confirmation', name=name, report_id=report_id)
+
 async def send_report_confirmation(to_email: str, name: str, report_id: str):
-    subject = "Pollution Report Submitted - Delhi Air Command"
-    html = f"""
-    <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #0F766E;">Thank You for Your Report</h2>
-                <p>Dear {name},</p>
-                <p>Your pollution report has been successfully submitted and logged in our system.</p>
-                <div style="background: #F8FAFC; padding: 15px; border-radius: 8px; margin: 20px 0;">
-                    <p style="margin: 0;"><strong>Report ID:</strong> {report_id}</p>
-                </div>
-                <p>Our team will review your report and take appropriate action. You will receive updates via email as the status changes.</p>
-                <p style="color: #64748B; font-size: 14px; margin-top: 30px;">
-                    Best regards,<br>
-                    Delhi Air Command Team
-                </p>
-            </div>
-        </body>
-    </html>
-    """
-    return await send_email(to_email, subject, html)
+    return await send_email(to_email, *render_report_confirmation(name, report_id))
+
+def render_status_update(name: str, report_id: str, new_status: str) -> RenderedEmail:
+    message = STATUS_MESSAGES.get(new_status, 'Your report status has been updated.')
+    return email_templates.render('status_update', name=name, report_id=report_id, new_status=new_status,
+                                  message=message)
 
 async def send_status_update(to_email: str, name: str, report_id: str, new_status: str):
-    subject = f"Report Status Update: {new_status.title()} - Delhi Air Command"
-    
-    status_messages = {
-        'viewed': 'Your report has been reviewed by our team.',
-        'processing': 'We are actively working on addressing the issue you reported.',
-        'completed': 'The issue has been resolved. Thank you for helping us keep Delhi clean!'
-    }
-    
-    message = status_messages.get(new_status, 'Your report status has been updated.')
-    
-    html = f"""
-    <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #0F766E;">Report Status Update</h2>
-                <p>Dear {name},</p>
-                <p>{message}</p>
-                <div style="background: #F8FAFC; padding: 15px; border-radius: 8px; margin: 20px 0;">
-                    <p style="margin: 0;"><strong>Report ID:</strong> {report_id}</p>
-                    <p style="margin: 10px 0 0 0;"><strong>New Status:</strong> <span style="color: #0F766E; text-transform: uppercase;">{new_status}</span></p>
-                </div>
-                <p style="color: #64748B; font-size: 14px; margin-top: 30px;">
-                    Best regards,<br>
-                    Delhi Air Command Team
-                </p>
-            </div>
-        </body>
-    </html>
-    """
-    return await send_email(to_email, subject, html)
\ No newline at end of file
+    return await send_email(to_email, *render_status_update(name, report_id, new_status))
+
+# Outbox message kinds -> renderer(**context) returning (subject, html, text)
+RENDERERS = {
+    'report_confirmation': render_report_confirmation,
+    'status_update': render_status_update,
+}
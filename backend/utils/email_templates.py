@@ -0,0 +1,176 @@
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from markupsafe import escape
+
+from backend.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    html: str
+    text: str
+
+
+# Alternating literal text and per-recipient field names: [text, field, text, field, ..., text]
+Skeleton = List[str]
+
+
+class _Skeletons(NamedTuple):
+    subject: Skeleton
+    html: Skeleton
+    text: Skeleton
+
+
+def _fill(skeleton: Skeleton, values: dict, escape_values: bool) -> str:
+    return "".join(
+        part if i % 2 == 0 else str(escape(values[part]) if escape_values else values[part])
+        for i, part in enumerate(skeleton)
+    )
+
+
+class EmailTemplates:
+    """Jinja2 email templates, compiled once and rendered with an LRU cache.
+
+    Each kind has `<kind>.html` and `<kind>.txt` in `directory` (usually extending
+    `base.html`/`base.txt`) plus a subject template string. HTML templates are
+    autoescaped, so user-supplied values such as the reporter's name can't inject
+    markup; text and subject templates are not. `precompile` parses everything up
+    front and `auto_reload` is off, so a render never touches the filesystem.
+
+    Fields named in `per_recipient` (e.g. the reporter's name and report id) are
+    rendered as placeholders: the rest of the email, layout included, is rendered
+    once per kind and shared context and cached as a skeleton, and each recipient
+    only splices their own values in. Such fields must be interpolated as-is; a
+    template that filters or branches on one is detected and rendered in full.
+    """
+
+    def __init__(self, subjects: Dict[str, str], directory: Path = TEMPLATE_DIR, cache_size: int = 512,
+                 per_recipient: Sequence[str] = (), name: str = "email_templates"):
+        self.subjects = subjects
+        self.per_recipient = tuple(per_recipient)
+        self.env = Environment(
+            loader=FileSystemLoader(str(directory)),
+            autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        self.name = name
+        self.cache = LRUCache(max_entries=cache_size, name=name)
+        self._compiled: Dict[str, Tuple[Template, Template, Template]] = {}
+        self.renders = 0
+        self.fills = 0
+        self.compile_ms: Optional[float] = None
+
+    def _compile(self, kind: str) -> Tuple[Template, Template, Template]:
+        if kind not in self.subjects:
+            raise ValueError(f"Unknown email kind {kind!r}")
+        compiled = (
+            self.env.from_string(self.subjects[kind]),
+            self.env.get_template(f"{kind}.html"),
+            self.env.get_template(f"{kind}.txt"),
+        )
+        self._compiled[kind] = compiled
+        return compiled
+
+    def precompile(self):
+        """Parse every template now so the first email doesn't pay for it (and a broken template fails startup)"""
+        started = time.perf_counter()
+        for kind in self.subjects:
+            self._compile(kind)
+        self.compile_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"{self.name}: compiled {len(self._compiled)} email templates in {self.compile_ms:.1f}ms")
+
+    def _render_full(self, kind: str, context: dict) -> RenderedEmail:
+        subject, html, text = self._compiled.get(kind) or self._compile(kind)
+        self.renders += 1
+        return RenderedEmail(subject.render(context).strip(), html.render(context), text.render(context))
+
+    def _skeletons(self, kind: str, shared: dict, fields: Tuple[str, ...]) -> Optional[_Skeletons]:
+        """Render with a marker in place of each per-recipient field, then split on the markers"""
+        rendered = self._render_full(kind, {**shared, **{field: f"\x00{field}\x00" for field in fields}})
+        marker = re.compile("\x00(" + "|".join(re.escape(field) for field in fields) + ")\x00")
+        skeletons = _Skeletons(*(marker.split(part) for part in rendered))
+        if any("\x00" in literal for skeleton in skeletons for literal in skeleton[::2]):
+            # A filter changed a marker, so splicing raw values in would be wrong
+            logger.warning(f"{self.name}: {kind} transforms a per-recipient field; rendering it in full")
+            return None
+        return skeletons
+
+    def render(self, kind: str, **context) -> RenderedEmail:
+        fields = tuple(field for field in self.per_recipient if field in context)
+        shared = {key: value for key, value in context.items() if key not in fields}
+        if not fields:
+            return self._render_full(kind, context)
+        try:
+            key = (kind, fields, tuple(sorted(shared.items())))
+            hash(key)
+        except TypeError:
+            return self._render_full(kind, context)
+        skeletons = self.cache.get(key)
+        if skeletons is None:
+            skeletons = self._skeletons(kind, shared, fields) or False
+            self.cache.set(key, skeletons)
+        if skeletons is False:
+            return self._render_full(kind, context)
+        self.fills += 1
+        return RenderedEmail(
+            _fill(skeletons.subject, context, escape_values=False).strip(),
+            _fill(skeletons.html, context, escape_values=True),
+            _fill(skeletons.text, context, escape_values=False),
+        )
+
+    def stats(self) -> dict:
+        return {
+            "kinds": sorted(self._compiled),
+            "compile_ms": round(self.compile_ms, 3) if self.compile_ms is not None else None,
+            "renders": self.renders,
+            "fills": self.fills,
+            "cache": self.cache.stats(),
+        }
+
+
+def _benchmark(messages: int = 5000) -> None:
+    from backend.utils.email_service import SUBJECTS, build_message, render_status_update
+
+    def per_message(fn, n=messages):
+        started = time.perf_counter()
+        for i in range(n):
+            fn(i)
+        return (time.perf_counter() - started) / n * 1e6
+
+    templates = EmailTemplates(SUBJECTS, per_recipient=("name", "report_id"))
+    started = time.perf_counter()
+    templates.precompile()
+    print(f"precompile: {(time.perf_counter() - started) * 1000:.1f}ms for {len(SUBJECTS)} kinds")
+
+    full = EmailTemplates(SUBJECTS)
+    full.precompile()
+    source = (TEMPLATE_DIR / "status_update.html").read_text()
+    uncompiled = per_message(lambda i: templates.env.from_string(source), n=200)
+    rendered = per_message(lambda i: full.render("status_update", name=f"Citizen {i}", report_id=f"r-{i}",
+                                                 new_status="processing", message="In progress"))
+    filled = per_message(lambda i: templates.render("status_update", name=f"Citizen {i}", report_id=f"r-{i}",
+                                                    new_status="processing", message="In progress"))
+    mime = per_message(lambda i: build_message(f"c{i}@example.com",
+                                               *render_status_update(f"Citizen {i}", f"r-{i}", "processing")))
+
+    print(f"{messages} status_update emails to distinct recipients, per message:")
+    print(f"  parse template source only:     {uncompiled:8.1f}us (what every send would pay without precompile)")
+    print(f"  full render:                    {rendered:8.1f}us")
+    print(f"  cached skeleton + fields:       {filled:8.1f}us ({templates.renders} full renders)")
+    print(f"  skeleton + fields + MIME:       {mime:8.1f}us")
+
+
+if __name__ == "__main__":
+    # python -m backend.utils.email_templates
+    _benchmark()
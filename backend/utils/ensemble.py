@@ -0,0 +1,171 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import xgboost as xgb
+
+from backend.utils.features import FEATURE_NAMES
+
+logger = logging.getLogger(__name__)
+
+BOOSTER_PATTERN = "booster_seed*.json"
+METADATA_FILE = "ensemble_metadata.json"
+DEFAULT_HORIZONS = (24, 48, 72)
+# Relative spread at which confidence reaches zero is 1 / CONFIDENCE_SCALE (here 50% of the mean)
+CONFIDENCE_SCALE = 2.0
+
+
+def ensemble_confidence(mean: np.ndarray, spread: np.ndarray) -> np.ndarray:
+    """Map booster disagreement to a 0-1 confidence: 1 when they agree, falling with relative spread"""
+    relative = np.asarray(spread) / np.maximum(np.abs(mean), 1.0)
+    return np.clip(1.0 - CONFIDENCE_SCALE * relative, 0.0, 1.0)
+
+
+class EnsembleForecaster:
+    """Seed ensemble of multi-output XGBoost boosters, one output column per horizon.
+
+    Boosters are loaded once and predict with `inplace_predict` (no DMatrix per
+    call). For a batch, every booster runs concurrently on its own thread - XGBoost
+    releases the GIL while predicting - each limited to `nthread` cores so the
+    ensemble together doesn't oversubscribe the machine.
+    """
+
+    def __init__(self, boosters: Sequence[xgb.Booster], feature_names: Sequence[str] = FEATURE_NAMES,
+                 horizons: Sequence[int] = DEFAULT_HORIZONS, nthread: Optional[int] = None,
+                 version: str = "ensemble"):
+        if not boosters:
+            raise ValueError("An ensemble needs at least one booster")
+        self.boosters = list(boosters)
+        self.feature_names = tuple(feature_names)
+        self.horizons = tuple(horizons)
+        self.version = version
+        self.nthread = nthread or max(1, (os.cpu_count() or 1) // len(self.boosters))
+        for booster in self.boosters:
+            booster.set_param({"nthread": self.nthread})
+        self._executor = ThreadPoolExecutor(max_workers=len(self.boosters), thread_name_prefix="ensemble")
+
+    @staticmethod
+    def available(model_dir: Path) -> bool:
+        return any(Path(model_dir).glob(BOOSTER_PATTERN))
+
+    @classmethod
+    def from_directory(cls, model_dir: Path, nthread: Optional[int] = None) -> "EnsembleForecaster":
+        """Load booster_seed*.json and the optional ensemble_metadata.json from `model_dir`"""
+        model_dir = Path(model_dir)
+        paths = sorted(model_dir.glob(BOOSTER_PATTERN))
+        if not paths:
+            raise FileNotFoundError(f"No {BOOSTER_PATTERN} files in {model_dir}")
+
+        boosters = []
+        for path in paths:
+            boosters.append(xgb.Booster(model_file=str(path)))
+            logger.info(f"✅ Loaded booster: {path.name}")
+
+        metadata = {}
+        metadata_path = model_dir / METADATA_FILE
+        if metadata_path.exists():
+            metadata = json.loads(metadata_path.read_text())
+
+        return cls(
+            boosters,
+            feature_names=metadata.get("feature_names") or metadata.get("features") or FEATURE_NAMES,
+            horizons=metadata.get("horizons") or DEFAULT_HORIZONS,
+            nthread=nthread,
+            version=metadata.get("version") or f"xgb-ensemble-{len(boosters)}",
+        )
+
+    @staticmethod
+    def _predict_one(booster: xgb.Booster, X: np.ndarray) -> np.ndarray:
+        return booster.inplace_predict(X, validate_features=False).reshape(len(X), -1)
+
+    def _prepare(self, X) -> np.ndarray:
+        # Converted once here rather than by every booster; XGBoost predicts in float32
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected rows of {len(self.feature_names)} features, got shape {X.shape}")
+        return X
+
+    def _check_outputs(self, members: np.ndarray) -> np.ndarray:
+        if members.shape[2] != len(self.horizons):
+            raise ValueError(f"Boosters return {members.shape[2]} outputs for {len(self.horizons)} horizons")
+        return members
+
+    def predict_members(self, X) -> np.ndarray:
+        """Per-booster predictions, shape (n_boosters, n_rows, n_horizons), boosters in parallel"""
+        X = self._prepare(X)
+        futures = [self._executor.submit(self._predict_one, booster, X) for booster in self.boosters]
+        return self._check_outputs(np.stack([future.result() for future in futures]))
+
+    def predict_members_sequential(self, X) -> np.ndarray:
+        """Same as `predict_members` but one booster after another (benchmark baseline)"""
+        X = self._prepare(X)
+        return self._check_outputs(np.stack([self._predict_one(booster, X) for booster in self.boosters]))
+
+    def predict(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """Ensemble mean and spread (std across boosters), each of shape (n_rows, n_horizons)"""
+        members = self.predict_members(X).astype(np.float64)
+        return members.mean(axis=0), members.std(axis=0)
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "boosters": len(self.boosters),
+            "nthread_per_booster": self.nthread,
+            "horizons": list(self.horizons),
+            "features": len(self.feature_names),
+        }
+
+
+def _synthetic_ensemble(model_dir: Path, n_features: int, horizons: Sequence[int]) -> None:
+    """Train a small stand-in ensemble so the benchmark runs without the real artifacts"""
+    rng = np.random.default_rng(0)
+    X = rng.random((5000, n_features))
+    y = np.stack([X[:, 0] * 300 + X[:, i + 1] * 50 for i in range(len(horizons))], axis=1)
+    data = xgb.DMatrix(X, label=y)
+    for seed in (42, 53, 64, 75, 86):
+        booster = xgb.train({"tree_method": "hist", "max_depth": 6, "seed": seed, "subsample": 0.8}, data, 200)
+        booster.save_model(str(model_dir / f"booster_seed{seed}.json"))
+    (model_dir / METADATA_FILE).write_text(json.dumps({"horizons": list(horizons)}))
+
+
+def _best_ms(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _benchmark(model_dir: Path, batch_sizes: List[int], repeats: int = 5) -> None:
+    ensemble = EnsembleForecaster.from_directory(model_dir)
+    # Baseline: how the boosters are typically called - one DMatrix predict after another, all cores each
+    baseline = [xgb.Booster(model_file=str(path)) for path in sorted(model_dir.glob(BOOSTER_PATTERN))]
+    rng = np.random.default_rng(1)
+
+    print(f"{len(ensemble.boosters)} boosters, {ensemble.nthread} thread(s) each, horizons {list(ensemble.horizons)}")
+    print(f"{'rows':>8} {'sequential DMatrix':>20} {'sequential inplace':>20} {'parallel inplace':>18}")
+    for n in batch_sizes:
+        X = rng.random((n, len(ensemble.feature_names)))
+        dmatrix_ms = _best_ms(lambda: [b.predict(xgb.DMatrix(X)) for b in baseline], repeats)
+        sequential_ms = _best_ms(lambda: ensemble.predict_members_sequential(X), repeats)
+        parallel_ms = _best_ms(lambda: ensemble.predict(X), repeats)
+        print(f"{n:>8} {dmatrix_ms:>18.2f}ms {sequential_ms:>18.2f}ms {parallel_ms:>16.2f}ms")
+
+
+if __name__ == "__main__":
+    # python -m backend.utils.ensemble [model_dir]
+    import sys
+    import tempfile
+
+    if len(sys.argv) > 1:
+        _benchmark(Path(sys.argv[1]), [1, 64, 1024, 16384])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            _synthetic_ensemble(Path(tmp), len(FEATURE_NAMES), DEFAULT_HORIZONS)
+            _benchmark(Path(tmp), [1, 64, 1024, 16384])
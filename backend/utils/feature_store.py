@@ -0,0 +1,134 @@
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from backend.utils.waqi_stations import POLLUTANTS
+
+# Column 0 is AQI, then one column per pollutant in POLLUTANTS order
+COLUMNS = ("aqi",) + tuple(POLLUTANTS)
+LAGS = (1, 6, 12, 24)
+
+
+class FeatureStore:
+    """Fixed-size ring buffer of recent readings, one slot per `step_seconds` bucket.
+
+    Readings within the same bucket overwrite its slot (latest wins); a reading in a
+    new bucket advances the ring, carrying the last value forward over missed
+    buckets. Running sums per rolling window are adjusted for the slot that enters
+    and the one that leaves, so pushes and feature reads are O(1) - no per-request
+    rescans of history or database queries.
+    """
+
+    def __init__(self, capacity: int = 72, step_seconds: float = 3600, windows: Sequence[int] = (24, 72)):
+        if max(max(windows), max(LAGS) + 1) > capacity:
+            raise ValueError(f"capacity {capacity} is too small for windows {tuple(windows)} and lags {LAGS}")
+        self.capacity = capacity
+        self.step_seconds = step_seconds
+        self.windows = tuple(windows)
+        self._values = np.zeros((capacity, len(COLUMNS)))
+        self._sums = {window: np.zeros(len(COLUMNS)) for window in self.windows}
+        self._head = -1  # slot of the newest bucket
+        self._count = 0  # filled slots, up to capacity
+        self._bucket: Optional[int] = None
+        self._updates = 0
+        self._lock = threading.Lock()
+        self.pushes = 0
+        self.ignored = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _slot(self, steps_back: int) -> int:
+        return (self._head - steps_back) % self.capacity
+
+    def _set_head(self, row: np.ndarray):
+        """Write `row` into the head slot, keeping every window sum in step"""
+        old = self._values[self._head].copy()
+        self._values[self._head] = row
+        for window in self.windows:
+            self._sums[window] += row - old
+
+    def _advance(self, row: np.ndarray):
+        """Move the head to a new bucket holding `row`, dropping the oldest slot from each window"""
+        for window in self.windows:
+            if self._count >= window:
+                self._sums[window] -= self._values[self._slot(window - 1)]
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        # The slot being reused fell out of every window already; clear it before adding
+        self._values[self._head] = 0.0
+        self._set_head(row)
+
+    def push(self, aqi: float, pollutants: dict, when: datetime):
+        """Record a reading taken at `when`; readings older than the newest bucket are ignored"""
+        row = np.array([aqi] + [float(pollutants.get(name) or 0.0) for name in POLLUTANTS], dtype=np.float64)
+        bucket = int(when.timestamp() // self.step_seconds)
+        with self._lock:
+            if self._bucket is not None and bucket < self._bucket:
+                self.ignored += 1
+                return
+            if self._bucket is None:
+                self._advance(row)
+            elif bucket == self._bucket:
+                self._set_head(row)
+            else:
+                # Carry the last reading over missed buckets (at most a full ring's worth)
+                last = self._values[self._head].copy()
+                for _ in range(min(bucket - self._bucket - 1, self.capacity)):
+                    self._advance(last)
+                self._advance(row)
+            self._bucket = bucket
+            self.pushes += 1
+            self._updates += 1
+            if self._updates >= self.capacity:
+                self._resync()
+
+    def _resync(self):
+        """Recompute window sums from the ring to shed floating-point drift (amortized O(1))"""
+        for window in self.windows:
+            n = min(window, self._count)
+            slots = [self._slot(i) for i in range(n)]
+            self._sums[window] = self._values[slots].sum(axis=0)
+        self._updates = 0
+
+    def lag(self, steps: int, column: str = "aqi") -> Optional[float]:
+        """Value `steps` buckets before the newest one, or None without enough history"""
+        with self._lock:
+            if steps >= self._count:
+                return None
+            return float(self._values[self._slot(steps), COLUMNS.index(column)])
+
+    def rolling_mean(self, window: int, column: str = "aqi") -> Optional[float]:
+        """Mean over the newest `window` buckets (fewer while the ring is filling)"""
+        with self._lock:
+            if not self._count:
+                return None
+            return float(self._sums[window][COLUMNS.index(column)] / min(window, self._count))
+
+    def features(self) -> Dict[str, float]:
+        """AQI memory and pollutant-ratio features for `build_feature_row`; only those with data"""
+        features = {}
+        if not self._count:
+            return features
+        for steps in LAGS:
+            value = self.lag(steps)
+            if value is not None:
+                features[f"AQI_t-{steps}"] = value
+        for window in self.windows:
+            features[f"rolling_mean_{window}h"] = self.rolling_mean(window)
+        pm25, pm10, no2, co = (self.lag(0, name) for name in ("pm25", "pm10", "no2", "co"))
+        features["pm_ratio"] = pm10 / pm25 if pm25 > 0 else 0.0
+        features["traffic_ratio"] = no2 / co if co > 0 else 0.0
+        return features
+
+    def stats(self) -> dict:
+        return {
+            "buckets": self._count,
+            "capacity": self.capacity,
+            "step_seconds": self.step_seconds,
+            "pushes": self.pushes,
+            "ignored": self.ignored,
+            "latest_aqi": self.lag(0),
+        }
@@ -0,0 +1,73 @@
+import math
+import re
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# Feature order of the AQI forecasting ensemble (see ML_INTEGRATION_GUIDE.md); ensemble_metadata.json may override it
+FEATURE_NAMES = (
+    "PM2.5", "PM10", "NO2", "SO2", "CO", "O3",
+    "hour", "day", "month", "day_of_week", "is_weekend",
+    "month_sin", "month_cos", "hour_sin", "hour_cos",
+    "lat", "lon",
+    "AQI_t-1", "AQI_t-6", "AQI_t-12", "AQI_t-24", "rolling_mean_24h", "rolling_mean_72h",
+    "pm_ratio", "traffic_ratio",
+)
+
+MEMORY_FEATURES = ("AQI_t-1", "AQI_t-6", "AQI_t-12", "AQI_t-24", "rolling_mean_24h", "rolling_mean_72h")
+
+DELHI_LAT = 28.6139
+DELHI_LON = 77.2090
+
+
+def _normalize(name: str) -> str:
+    """'PM2.5' -> 'pm25', 'AQI_t-1' -> 'aqit1', so metadata spelling variants resolve to one feature"""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def build_feature_row(pollutants: dict, aqi: float, when: datetime, lat: float = DELHI_LAT, lon: float = DELHI_LON,
+                      memory: Optional[Dict[str, float]] = None,
+                      feature_names: Sequence[str] = FEATURE_NAMES) -> np.ndarray:
+    """Build one model input row in `feature_names` order from a WAQI reading.
+
+    `memory` (see `FeatureStore.features`) supplies the AQI lag, rolling-mean and
+    ratio features; lags and means that are missing fall back to the current AQI
+    as a proxy.
+    """
+    pm25 = float(pollutants.get("pm25") or 0.0)
+    pm10 = float(pollutants.get("pm10") or 0.0)
+    no2 = float(pollutants.get("no2") or 0.0)
+    co = float(pollutants.get("co") or 0.0)
+
+    values = {
+        "PM2.5": pm25,
+        "PM10": pm10,
+        "NO2": no2,
+        "SO2": float(pollutants.get("so2") or 0.0),
+        "CO": co,
+        "O3": float(pollutants.get("o3") or 0.0),
+        "hour": when.hour,
+        "day": when.day,
+        "month": when.month,
+        "day_of_week": when.weekday(),
+        "is_weekend": float(when.weekday() >= 5),
+        "month_sin": math.sin(2 * math.pi * when.month / 12),
+        "month_cos": math.cos(2 * math.pi * when.month / 12),
+        "hour_sin": math.sin(2 * math.pi * when.hour / 24),
+        "hour_cos": math.cos(2 * math.pi * when.hour / 24),
+        "lat": lat,
+        "lon": lon,
+        "pm_ratio": pm10 / pm25 if pm25 > 0 else 0.0,
+        "traffic_ratio": no2 / co if co > 0 else 0.0,
+    }
+    memory = memory or {}
+    for name in MEMORY_FEATURES:
+        values[name] = aqi
+    values.update(memory)
+
+    by_key = {_normalize(name): float(value) for name, value in values.items()}
+    unknown = [name for name in feature_names if _normalize(name) not in by_key]
+    if unknown:
+        raise KeyError(f"Unknown forecasting features: {', '.join(unknown)}")
+    return np.array([by_key[_normalize(name)] for name in feature_names], dtype=np.float64)
@@ -0,0 +1,66 @@
+import hashlib
+from typing import Callable, Sequence
+
+import numpy as np
+
+HORIZONS = (24, 48, 72)
+# Projected change over the last horizon, relative to current AQI, that counts as a trend
+TREND_THRESHOLD = 0.05
+# Relative deviation from the fitted trend at which rollout confidence reaches zero is 1 / CONFIDENCE_SCALE
+CONFIDENCE_SCALE = 2.0
+
+
+def forecast_cache_key(features, model_version: str) -> str:
+    """Stable key for a forecast: the exact input feature bytes plus the model that scores them"""
+    digest = hashlib.sha1(np.ascontiguousarray(features, dtype=np.float64).tobytes())
+    digest.update(model_version.encode())
+    return digest.hexdigest()
+
+
+def multi_horizon_predict(predict: Callable[[np.ndarray], np.ndarray], X, horizons: Sequence[int] = HORIZONS,
+                          feedback_column: int = 0) -> np.ndarray:
+    """Predict every horizon for a batch, shape (n_rows, n_horizons).
+
+    A multi-output model answers in its first call. A single-step model is rolled
+    forward recursively: each step's predictions replace `feedback_column` (the
+    current AQI) for the whole batch at once, so the cost is one vectorized call
+    per horizon rather than one per row.
+    """
+    X = np.array(X, dtype=np.float64)
+    steps = len(horizons)
+    out = np.empty((len(X), steps))
+    for step in range(steps):
+        preds = np.asarray(predict(X), dtype=np.float64).reshape(len(X), -1)
+        if step == 0 and preds.shape[1] >= steps:
+            return preds[:, :steps]
+        out[:, step] = preds[:, 0]
+        X[:, feedback_column] = preds[:, 0]
+    return out
+
+
+def _trend_fit(current: np.ndarray, preds: np.ndarray, horizons: Sequence[int]):
+    """Least-squares line through (0, current) and every (horizon, prediction), per row"""
+    hours = np.concatenate([[0.0], np.asarray(horizons, dtype=np.float64)])
+    values = np.column_stack([current, preds])
+    centered = hours - hours.mean()
+    slope = (values - values.mean(axis=1, keepdims=True)) @ centered / (centered ** 2).sum()
+    fitted = values.mean(axis=1, keepdims=True) + slope[:, np.newaxis] * centered
+    return slope, values - fitted
+
+
+def forecast_trends(current, preds, horizons: Sequence[int] = HORIZONS) -> np.ndarray:
+    """'increasing' / 'decreasing' / 'stable' per row from the slope across the horizons"""
+    current = np.asarray(current, dtype=np.float64).reshape(-1)
+    preds = np.asarray(preds, dtype=np.float64).reshape(len(current), -1)
+    slope, _ = _trend_fit(current, preds, horizons)
+    change = slope * horizons[-1] / np.maximum(np.abs(current), 1.0)
+    return np.select([change > TREND_THRESHOLD, change < -TREND_THRESHOLD], ["increasing", "decreasing"], "stable")
+
+
+def rollout_confidence(current, preds, horizons: Sequence[int] = HORIZONS) -> np.ndarray:
+    """0-1 confidence per row for a single model: lower when the horizons zig-zag around their trend"""
+    current = np.asarray(current, dtype=np.float64).reshape(-1)
+    preds = np.asarray(preds, dtype=np.float64).reshape(len(current), -1)
+    _, residuals = _trend_fit(current, preds, horizons)
+    rmse = np.sqrt((residuals ** 2).mean(axis=1))
+    return np.clip(1.0 - CONFIDENCE_SCALE * rmse / np.maximum(np.abs(preds).mean(axis=1), 1.0), 0.0, 1.0)
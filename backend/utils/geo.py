@@ -0,0 +1,72 @@
+import math
+from typing import Optional, Tuple
+
+BBox = Tuple[float, float, float, float]  # min_lon, min_lat, max_lon, max_lat
+
+# Grid cells per 256px map tile edge when clustering: 4 gives ~64px clusters at any zoom
+CLUSTER_CELLS_PER_TILE = 4
+
+
+def geojson_point(latitude: Optional[float], longitude: Optional[float]) -> Optional[dict]:
+    """GeoJSON Point for a 2dsphere index, or None when the coordinates are missing or invalid"""
+    if latitude is None or longitude is None:
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return {"type": "Point", "coordinates": [longitude, latitude]}
+
+
+def geodesic_bulge(bbox: BBox) -> float:
+    """Most degrees a geodesic between two points at one latitude, as wide apart as the box, bows poleward.
+
+    The bulge depends on the latitude and peaks at atan(sqrt(cos(half_span))). This
+    returns that peak, so it bounds every edge of the box.
+    """
+    min_lon, _, max_lon, _ = bbox
+    squeeze = math.cos(math.radians(max_lon - min_lon) / 2)
+    if squeeze <= 0:
+        return 90.0
+    peak = math.atan(math.sqrt(squeeze))
+    return math.degrees(math.atan(math.tan(peak) / squeeze) - peak)
+
+
+def bbox_polygon(bbox: BBox) -> dict:
+    """Closed GeoJSON Polygon covering a bounding box, for $geoWithin.
+
+    GeoJSON edges are geodesics, so the latitude edges are pushed out by `geodesic_bulge` to
+    keep points near the box's equator-side edge inside; pair it with an exact lat/lon range.
+    """
+    pad = geodesic_bulge(bbox) + 1e-9
+    min_lon, min_lat, max_lon, max_lat = bbox
+    min_lat, max_lat = max(min_lat - pad, -90.0), min(max_lat + pad, 90.0)
+    return {
+        "type": "Polygon",
+        "coordinates": [[[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat],
+                         [min_lon, min_lat]]],
+    }
+
+
+def covers_hemisphere(bbox: BBox) -> bool:
+    """GeoJSON polygons wider than a hemisphere are ambiguous; such boxes skip the spatial filter"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return max_lon - min_lon >= 180 or max_lat - min_lat >= 90
+
+
+def cell_degrees(zoom: int, cells_per_tile: int = CLUSTER_CELLS_PER_TILE) -> float:
+    """Grid cell edge in degrees for a web-map zoom level (a tile spans 360 / 2**zoom degrees)"""
+    return 360.0 / (2 ** zoom) / cells_per_tile
+
+
+def viewport_cell_degrees(bbox: BBox, zoom: int, max_cells_per_side: int,
+                          cells_per_tile: int = CLUSTER_CELLS_PER_TILE) -> float:
+    """`cell_degrees` for the zoom, doubled until the box is at most `max_cells_per_side` cells across.
+
+    Doubling keeps the grid aligned with the one a lower zoom would use, so a mismatched
+    zoom/bbox pair (e.g. zoom 22 over the whole city) can't ask for millions of cells.
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    span = max(max_lon - min_lon, max_lat - min_lat)
+    cell = cell_degrees(zoom, cells_per_tile)
+    while span / cell > max_cells_per_side:
+        cell *= 2
+    return cell
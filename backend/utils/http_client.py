@@ -0,0 +1,63 @@
+import os
+import logging
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+HTTP_POOL_LIMIT = int(os.environ.get('HTTP_POOL_LIMIT', '100'))
+HTTP_POOL_LIMIT_PER_HOST = int(os.environ.get('HTTP_POOL_LIMIT_PER_HOST', '20'))
+HTTP_KEEPALIVE_SECONDS = float(os.environ.get('HTTP_KEEPALIVE_SECONDS', '30'))
+HTTP_DNS_CACHE_SECONDS = int(os.environ.get('HTTP_DNS_CACHE_SECONDS', '300'))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '3'))
+HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '5'))
+HTTP_TOTAL_TIMEOUT = float(os.environ.get('HTTP_TOTAL_TIMEOUT', '10'))
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def _build_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+        use_dns_cache=True,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=HTTP_TOTAL_TIMEOUT,
+        connect=HTTP_CONNECT_TIMEOUT,
+        sock_connect=HTTP_CONNECT_TIMEOUT,
+        sock_read=HTTP_READ_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+async def start_http_session() -> aiohttp.ClientSession:
+    """Create the shared upstream HTTP session (called from app startup)"""
+    global _session
+    if _session is None or _session.closed:
+        _session = _build_session()
+        logger.info(
+            f"HTTP client pool started (limit={HTTP_POOL_LIMIT}, per_host={HTTP_POOL_LIMIT_PER_HOST}, "
+            f"connect_timeout={HTTP_CONNECT_TIMEOUT}s, read_timeout={HTTP_READ_TIMEOUT}s)"
+        )
+    return _session
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared session, creating it lazily if startup has not run"""
+    global _session
+    if _session is None or _session.closed:
+        _session = _build_session()
+    return _session
+
+
+async def close_http_session():
+    """Close the shared session and its pooled connections (called from app shutdown)"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("HTTP client pool closed")
+    _session = None
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingPredictor:
+    """Runs model inference off the event loop, micro-batching concurrent requests.
+
+    Single-row requests that arrive within `max_wait_ms` of each other are stacked
+    into one 2-D array, passed to `predict_fn` once in a worker thread, and the
+    per-row results are fanned back out to the waiting callers.
+
+    `predict_fn(X)` returns `(predictions, meta)`; `meta` (e.g. the model version that
+    produced the batch) is handed back to every caller alongside its row.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], Tuple[Any, Any]], max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, max_workers: int = 1, name: str = "inference"):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Requests taken off the queue for the batch being collected or predicted
+        self._inflight: List[Tuple[Sequence[float], asyncio.Future]] = []
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.max_batch_seen = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.last_latency_ms: Optional[float] = None
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        # Recreated after stop(), which shuts the previous one down
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}-worker")
+        return self._executor
+
+    def start(self):
+        self._ensure_executor()
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop batching; every request still queued or in flight fails instead of hanging"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        pending, self._inflight = self._inflight, []
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError(f"{self.name} predictor stopped"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def predict(self, row: Sequence[float]) -> Tuple[Any, Any]:
+        """Predict a single feature row; concurrent calls are batched together"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, future))
+        return await future
+
+    async def predict_batch(self, rows: Any) -> Tuple[np.ndarray, Any]:
+        """Predict an already-batched 2-D input in one call, bypassing the queue"""
+        X = np.asarray(rows, dtype=np.float64)
+        return await self._run_in_executor(X)
+
+    async def _run_in_executor(self, X: np.ndarray) -> Tuple[np.ndarray, Any]:
+        started = time.perf_counter()
+        try:
+            preds, meta = await asyncio.get_running_loop().run_in_executor(self._ensure_executor(), self.predict_fn, X)
+        except Exception:
+            self.errors += 1
+            raise
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.batches += 1
+        self.requests += len(X)
+        self.max_batch_seen = max(self.max_batch_seen, len(X))
+        self.total_latency_ms += latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self.last_latency_ms = latency_ms
+        return np.asarray(preds), meta
+
+    async def _collect(self) -> List[Tuple[Sequence[float], asyncio.Future]]:
+        # Collected into _inflight so a cancel mid-collection can still fail these requests
+        batch = self._inflight
+        batch.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        flush_at = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = flush_at - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            batch = [(row, future) for row, future in batch if not future.cancelled()]
+            self._inflight = batch
+            if not batch:
+                continue
+            try:
+                X = np.asarray([row for row, _ in batch], dtype=np.float64)
+                preds, meta = await self._run_in_executor(X)
+            except Exception as e:
+                logger.error(f"{self.name} batch of {len(batch)} failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self._inflight = []
+                continue
+            for (_, future), pred in zip(batch, preds):
+                if not future.done():
+                    future.set_result((pred, meta))
+            self._inflight = []
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else None,
+            "max_batch_size": self.max_batch_seen,
+            "avg_latency_ms": round(self.total_latency_ms / self.batches, 3) if self.batches else None,
+            "max_latency_ms": round(self.max_latency_ms, 3),
+            "last_latency_ms": round(self.last_latency_ms, 3) if self.last_latency_ms is not None else None,
+        }
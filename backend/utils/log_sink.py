@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import insert
+
+logger = logging.getLogger(__name__)
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+
+class LogSink:
+    """Write-behind sink for analytics rows (prediction and attribution logs).
+
+    Request handlers only enqueue; a background task drains the queue and writes
+    each batch with one bulk INSERT per table, in a worker thread, whenever
+    `batch_size` rows are waiting or `flush_interval_ms` has passed. When the
+    queue is full `enqueue` never blocks: it drops the incoming row
+    (`drop_newest`) or evicts the oldest one (`drop_oldest`). Producers that
+    would rather wait can use `put`, which blocks up to `put_timeout_ms` for room.
+    Everything still queued is flushed on `stop`.
+    """
+
+    def __init__(self, session_factory: Callable, batch_size: int = 200, flush_interval_ms: float = 1000,
+                 max_queue: int = 10000, drop_policy: str = DROP_NEWEST, put_timeout_ms: float = 50,
+                 name: str = "log_sink"):
+        if drop_policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown drop policy {drop_policy!r}")
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_queue = max_queue
+        self.drop_policy = drop_policy
+        self.put_timeout = put_timeout_ms / 1000.0
+        self.name = name
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Rows taken off the queue but not yet handed to a write, and the write in progress
+        self._pending: List[Tuple[Type, dict]] = []
+        self._flushing: Optional[asyncio.Future] = None
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.write_failures = 0
+        self.last_flush_ms: Optional[float] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the writer after flushing every queued row"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._flushing is not None:
+            await self._flushing
+        pending, self._pending = self._pending, []
+        await self._flush(pending)
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+
+    def _row(self, model: Type, row: dict) -> Tuple[Type, dict]:
+        # Stamp at enqueue time so a write delayed by batching keeps the real event time
+        row.setdefault("created_at", datetime.utcnow())
+        return model, row
+
+    def enqueue(self, model: Type, **row) -> bool:
+        """Queue one row for `model`'s table without blocking; returns False if it was dropped"""
+        if self._queue is None:
+            self.dropped += 1
+            return False
+        item = self._row(model, row)
+        if self._queue.full():
+            self.dropped += 1
+            if self.drop_policy == DROP_NEWEST:
+                return False
+            self._queue.get_nowait()
+        self._queue.put_nowait(item)
+        self.enqueued += 1
+        return True
+
+    async def put(self, model: Type, **row) -> bool:
+        """Queue one row, waiting up to `put_timeout_ms` for room before applying the drop policy"""
+        if self._queue is None:
+            self.dropped += 1
+            return False
+        try:
+            await asyncio.wait_for(self._queue.put(self._row(model, row)), timeout=self.put_timeout)
+        except asyncio.TimeoutError:
+            return self.enqueue(model, **row)
+        self.enqueued += 1
+        return True
+
+    def _drain(self, limit: int) -> List[Tuple[Type, dict]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._pending
+            batch.append(await self._queue.get())
+            flush_at = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                batch.extend(self._drain(self.batch_size - len(batch)))
+                remaining = flush_at - loop.time()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            self._pending = []
+            # Shielded so stop() can't abandon a batch halfway through its write
+            self._flushing = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    async def _flush(self, batch: List[Tuple[Type, dict]]):
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._write, batch)
+        except Exception as e:
+            self.write_failures += 1
+            logger.error(f"{self.name}: failed to write {len(batch)} rows: {str(e)}")
+            return
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        self.written += len(batch)
+        self.batches += 1
+
+    def _write(self, batch: List[Tuple[Type, dict]]):
+        by_model: Dict[Type, List[dict]] = defaultdict(list)
+        for model, row in batch:
+            by_model[model].append(row)
+        session = self.session_factory()
+        try:
+            for model, rows in by_model.items():
+                session.execute(insert(model), rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "drop_policy": self.drop_policy,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "write_failures": self.write_failures,
+            "last_flush_ms": round(self.last_flush_ms, 3) if self.last_flush_ms is not None else None,
+        }
@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ModelLoader:
+    """Loads a model in a background thread so the app can bind and answer liveness
+    probes while the artifact is downloaded, unpickled and warmed up.
+
+    `state` moves pending -> loading -> ready (or failed). Readers use `model` only
+    once `ready` is True; `on_ready` runs in the loader thread just before that.
+    """
+
+    def __init__(self, load_fn: Callable[[], Any], warmup_fn: Optional[Callable[[Any], None]] = None,
+                 name: str = "model", started_at: Optional[float] = None,
+                 on_ready: Optional[Callable[[Any], None]] = None):
+        self.load_fn = load_fn
+        self.warmup_fn = warmup_fn
+        self.on_ready = on_ready
+        self.name = name
+        # time.perf_counter() at process/module import, for the import-to-ready metric
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.state = "pending"
+        self.model: Any = None
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.import_to_ready_seconds: Optional[float] = None
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self):
+        if self._thread is None:
+            self.state = "loading"
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-loader", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the model is ready (for scripts and tests); returns readiness"""
+        self._ready.wait(timeout)
+        return self.ready
+
+    def _run(self):
+        try:
+            started = time.perf_counter()
+            model = self.load_fn()
+            self.load_seconds = time.perf_counter() - started
+
+            if self.warmup_fn is not None:
+                started = time.perf_counter()
+                self.warmup_fn(model)
+                self.warmup_seconds = time.perf_counter() - started
+
+            if self.on_ready is not None:
+                self.on_ready(model)
+            self.model = model
+            self.state = "ready"
+            self.import_to_ready_seconds = time.perf_counter() - self.started_at
+            self._ready.set()
+            logger.info(
+                f"✅ {self.name} ready: load={self.load_seconds:.2f}s, "
+                f"warmup={(self.warmup_seconds or 0):.3f}s, import_to_ready={self.import_to_ready_seconds:.2f}s"
+            )
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            logger.error(f"❌ {self.name} failed to load: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "error": self.error,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "warmup_seconds": round(self.warmup_seconds, 3) if self.warmup_seconds is not None else None,
+            "import_to_ready_seconds": (
+                round(self.import_to_ready_seconds, 3) if self.import_to_ready_seconds is not None else None
+            ),
+        }
@@ -0,0 +1,166 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+from backend.utils.model_loader import ModelLoader
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    version: str
+    model: Any
+    source: str = ""
+    activated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def describe(self) -> dict:
+        return {"version": self.version, "source": self.source, "activated_at": self.activated_at.isoformat()}
+
+
+class ShadowStats:
+    """Running comparison of candidate vs active predictions on sampled traffic"""
+
+    def __init__(self):
+        self.samples = 0
+        self.rows = 0
+        self.errors = 0
+        self.sum_abs_diff = 0.0
+        self.max_abs_diff = 0.0
+        self.active_latency_ms = 0.0
+        self.candidate_latency_ms = 0.0
+
+    def record(self, active_preds: np.ndarray, candidate_preds: np.ndarray, active_ms: float, candidate_ms: float):
+        diff = np.abs(np.asarray(candidate_preds, dtype=np.float64) - np.asarray(active_preds, dtype=np.float64))
+        self.samples += 1
+        self.rows += diff.size
+        self.sum_abs_diff += float(diff.sum())
+        self.max_abs_diff = max(self.max_abs_diff, float(diff.max(initial=0.0)))
+        self.active_latency_ms += active_ms
+        self.candidate_latency_ms += candidate_ms
+
+    def as_dict(self) -> dict:
+        return {
+            "samples": self.samples,
+            "rows": self.rows,
+            "errors": self.errors,
+            "mean_abs_diff": round(self.sum_abs_diff / self.rows, 4) if self.rows else None,
+            "max_abs_diff": round(self.max_abs_diff, 4),
+            "avg_active_latency_ms": round(self.active_latency_ms / self.samples, 3) if self.samples else None,
+            "avg_candidate_latency_ms": round(self.candidate_latency_ms / self.samples, 3) if self.samples else None,
+        }
+
+
+class ModelRegistry:
+    """Holds the active forecasting model and at most one candidate.
+
+    Readers take `active` once per batch; `promote()` swaps it with a single
+    reference assignment, so in-flight predictions finish on the model they started
+    with and no request is dropped. A warmed-up candidate can score a sampled share
+    of live batches in shadow, on its own thread, without adding request latency.
+    """
+
+    def __init__(self, warmup_fn: Optional[Callable[[Any], None]] = None,
+                 predict_fn: Optional[Callable[[Any, np.ndarray], np.ndarray]] = None):
+        self.warmup_fn = warmup_fn
+        # How a model is scored, so shadow predictions are comparable to what is served
+        self.predict_fn = predict_fn or (lambda model, X: model.predict(X))
+        self.active: Optional[ModelVersion] = None
+        self.previous: Optional[ModelVersion] = None
+        self.candidate: Optional[ModelVersion] = None
+        self.candidate_loader: Optional[ModelLoader] = None
+        self.shadow_sample_rate = 0.0
+        self.shadow = ShadowStats()
+        self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow-scoring")
+        self._shadow_busy = threading.Event()
+        self._subscribers: List[Callable[[ModelVersion], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[ModelVersion], None]):
+        """Register a callback invoked whenever a new model becomes active"""
+        self._subscribers.append(callback)
+
+    def activate(self, version: ModelVersion):
+        with self._lock:
+            self.previous, self.active = self.active, version
+        logger.info(f"Model {version.version} is now active")
+        for callback in self._subscribers:
+            try:
+                callback(version)
+            except Exception as e:
+                logger.error(f"Model registry subscriber failed: {str(e)}")
+
+    def load_candidate(self, version: str, load_fn: Callable[[], Any], source: str = "",
+                       shadow_sample_rate: float = 0.0) -> ModelLoader:
+        """Load and warm up a candidate in the background; it is not served until promoted"""
+        with self._lock:
+            if self.candidate_loader is not None and self.candidate_loader.state == "loading":
+                raise RuntimeError("A candidate model is already loading")
+            self.candidate = None
+            self.shadow = ShadowStats()
+            self.shadow_sample_rate = shadow_sample_rate
+
+            def on_ready(model):
+                self.candidate = ModelVersion(version=version, model=model, source=source)
+                logger.info(f"Candidate model {version} ready (shadow sample rate {shadow_sample_rate:.0%})")
+
+            self.candidate_loader = ModelLoader(
+                load_fn, warmup_fn=self.warmup_fn, name=f"candidate model {version}", on_ready=on_ready
+            )
+        self.candidate_loader.start()
+        return self.candidate_loader
+
+    def promote(self) -> ModelVersion:
+        with self._lock:
+            candidate = self.candidate
+            if candidate is None:
+                raise RuntimeError("No warmed-up candidate model to promote")
+            self.candidate = None
+            self.candidate_loader = None
+            self.shadow_sample_rate = 0.0
+        promoted = ModelVersion(version=candidate.version, model=candidate.model, source=candidate.source)
+        self.activate(promoted)
+        return promoted
+
+    def maybe_shadow(self, X: np.ndarray, active_preds: np.ndarray, active_ms: float):
+        """Score X with the candidate on the shadow thread for a sampled share of batches"""
+        candidate = self.candidate
+        if candidate is None or self.shadow_sample_rate <= 0 or random.random() >= self.shadow_sample_rate:
+            return
+        # Drop the sample rather than queue behind a slow candidate
+        if self._shadow_busy.is_set():
+            return
+        self._shadow_busy.set()
+        self._shadow_executor.submit(self._score_shadow, candidate, X, active_preds, active_ms)
+
+    def _score_shadow(self, candidate: ModelVersion, X: np.ndarray, active_preds: np.ndarray, active_ms: float):
+        try:
+            started = time.perf_counter()
+            candidate_preds = self.predict_fn(candidate.model, X)
+            candidate_ms = (time.perf_counter() - started) * 1000
+            self.shadow.record(active_preds, candidate_preds, active_ms, candidate_ms)
+        except Exception as e:
+            self.shadow.errors += 1
+            logger.warning(f"Shadow scoring with {candidate.version} failed: {str(e)}")
+        finally:
+            self._shadow_busy.clear()
+
+    def stats(self) -> dict:
+        loader = self.candidate_loader
+        return {
+            "active": self.active.describe() if self.active else None,
+            "previous": self.previous.describe() if self.previous else None,
+            "candidate": {
+                "version": self.candidate.version if self.candidate else None,
+                "loader": loader.stats() if loader else None,
+                "shadow_sample_rate": self.shadow_sample_rate,
+                "shadow": self.shadow.as_dict(),
+            },
+        }
@@ -0,0 +1,65 @@
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import joblib
+
+from backend.utils.artifacts import exclusive_lock
+
+logger = logging.getLogger(__name__)
+
+
+def mmap_layout_path(pickle_path: Path) -> Path:
+    return pickle_path.with_name(f"{pickle_path.stem}.mmap.joblib")
+
+
+def load_shared_model(pickle_path: Path) -> Any:
+    """Load a joblib/pickle model so its NumPy arrays are memory-mapped read-only.
+
+    The first worker re-dumps the artifact uncompressed next to it (a layout joblib
+    can map), then every worker loads that file with ``mmap_mode="r"``. The large
+    arrays are then backed by the same page-cache pages in every process instead of
+    one private copy per worker. The layout is rebuilt when the source artifact is
+    newer, and swapped in with an atomic rename so running workers keep their map.
+    """
+    pickle_path = Path(pickle_path)
+    mmap_path = mmap_layout_path(pickle_path)
+
+    with exclusive_lock(pickle_path.with_name(f"{mmap_path.name}.lock")):
+        if not mmap_path.exists() or mmap_path.stat().st_mtime < pickle_path.stat().st_mtime:
+            logger.info(f"Writing memory-mappable layout for {pickle_path.name}")
+            model = joblib.load(pickle_path)
+            tmp_path = mmap_path.with_name(f"{mmap_path.name}.tmp")
+            joblib.dump(model, tmp_path, compress=0)
+            os.replace(tmp_path, mmap_path)
+            del model
+
+    return joblib.load(mmap_path, mmap_mode="r")
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Resident memory of this worker in kB (Linux /proc), split into private and shared parts.
+
+    `rss_file_kb` covers file-backed pages such as memory-mapped model arrays, which
+    are shared between workers; `pss_kb` divides shared pages across the processes
+    mapping them, so summing it over workers gives the real footprint.
+    """
+    fields = {"VmRSS": "rss_kb", "RssAnon": "rss_anon_kb", "RssFile": "rss_file_kb", "RssShmem": "rss_shmem_kb"}
+    stats: Dict[str, Optional[int]] = {name: None for name in fields.values()}
+    stats["pss_kb"] = None
+    stats["pid"] = os.getpid()
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in fields:
+                    stats[fields[key]] = int(value.split()[0])
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    stats["pss_kb"] = int(line.split()[1])
+                    break
+    except OSError:
+        pass
+    return stats
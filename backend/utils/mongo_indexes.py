@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+
+logger = logging.getLogger(__name__)
+
+# Options that change an index's behaviour; a difference in any of them means drop and rebuild
+OPTION_KEYS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds", "collation")
+
+
+class Backfill(NamedTuple):
+    """Derived field to populate on existing documents before indexes are reconciled"""
+    filter: dict
+    update: list  # aggregation-pipeline update, so it can compute from the document's own fields
+
+
+class HotQuery(NamedTuple):
+    filter: dict
+    sort: Optional[List[Tuple[str, int]]] = None
+    limit: int = 50
+    projection: Optional[dict] = None
+
+
+# Declared indexes for pollution_reports; reconciled against the collection on startup
+# Lists page newest first by (created_at, id); id is in every list index so the keyset tie-break stays in the index
+REPORT_INDEXES = [
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+    IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="status_created_at"),
+    IndexModel([("severity", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="severity_created_at"),
+    IndexModel([("geo", GEOSPHERE)], name="geo_2dsphere"),
+]
+
+# Reports stored before `geo` existed get a GeoJSON point from their latitude/longitude
+REPORT_BACKFILLS = {
+    "geo": Backfill(
+        {
+            "geo": {"$exists": False},
+            "latitude": {"$type": "number", "$gte": -90, "$lte": 90},
+            "longitude": {"$type": "number", "$gte": -180, "$lte": 180},
+        },
+        [{"$set": {"geo": {"type": "Point", "coordinates": ["$longitude", "$latitude"]}}}],
+    ),
+}
+
+# The queries the API runs most; their plans are reported so a lost index shows up as a COLLSCAN
+REPORT_HOT_QUERIES = {
+    "report_by_id": HotQuery({"id": "00000000-0000-0000-0000-000000000000"}, limit=1),
+    "reports_page": HotQuery({}, sort=[("created_at", DESCENDING), ("id", DESCENDING)],
+                             projection={"_id": 0, "description": 0, "image_url": 0}),
+    "reports_by_status": HotQuery({"status": "pending"}, sort=[("created_at", DESCENDING), ("id", DESCENDING)]),
+    "reports_by_severity": HotQuery({"severity": 5}, sort=[("created_at", DESCENDING), ("id", DESCENDING)]),
+    "reports_in_viewport": HotQuery({"geo": {"$geoWithin": {"$geometry": {
+        "type": "Polygon",
+        "coordinates": [[[77.0, 28.5], [77.3, 28.5], [77.3, 28.8], [77.0, 28.8], [77.0, 28.5]]],
+    }}}}, limit=0, projection={"_id": 0, "geo": 1}),
+}
+
+
+def _key(spec) -> List[Tuple[str, Any]]:
+    return [(field, direction) for field, direction in (spec.items() if hasattr(spec, "items") else spec)]
+
+
+def _options(spec: dict) -> dict:
+    return {option: spec[option] for option in OPTION_KEYS if option in spec}
+
+
+def _plan_stages(plan: dict) -> List[dict]:
+    """Flatten a winning plan tree into its stages, root first"""
+    plan = plan.get("queryPlan", plan)  # slot-based engine nests the classic tree
+    stages = [plan]
+    for child in ([plan["inputStage"]] if "inputStage" in plan else []) + plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+def summarize_plan(explain: dict) -> dict:
+    """Reduce an explain() document to what matters for a regression check"""
+    stages = _plan_stages(explain["queryPlanner"]["winningPlan"])
+    execution = explain.get("executionStats", {})
+    return {
+        "stages": [stage.get("stage") for stage in stages],
+        "indexes": [stage["indexName"] for stage in stages if "indexName" in stage],
+        "collection_scan": any(stage.get("stage") == "COLLSCAN" for stage in stages),
+        "in_memory_sort": any(stage.get("stage") == "SORT" for stage in stages),
+        "returned": execution.get("nReturned"),
+        "keys_examined": execution.get("totalKeysExamined"),
+        "docs_examined": execution.get("totalDocsExamined"),
+        "execution_ms": execution.get("executionTimeMillis"),
+    }
+
+
+class IndexManager:
+    """Declares the indexes a collection should have and reconciles them.
+
+    `reconcile` first runs any backfills (derived fields, such as GeoJSON
+    points, that an index covers), then creates missing indexes, rebuilds any
+    whose key or options drifted from the declaration, and leaves undeclared
+    ones alone unless `drop_unknown` is set. It never raises: the outcome of each index (or the
+    error) is recorded for `stats`, and `start` runs it in the background so an
+    unreachable server doesn't hold up startup. `build_progress` reports
+    in-flight index builds from `currentOp`, and `explain` runs the
+    collection's hot queries and summarizes their winning plans.
+    """
+
+    def __init__(self, collection, indexes: Sequence[IndexModel], hot_queries: Optional[Dict[str, HotQuery]] = None,
+                 backfills: Optional[Dict[str, Backfill]] = None, drop_unknown: bool = False):
+        self.collection = collection
+        self.indexes = list(indexes)
+        self.hot_queries = hot_queries or {}
+        self.backfills = backfills or {}
+        self.backfilled: Dict[str, int] = {}
+        self.drop_unknown = drop_unknown
+        self.last_result: Dict[str, str] = {}
+        self.last_error: Optional[str] = None
+        self.reconciled_at: Optional[datetime] = None
+        self.reconcile_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.reconcile())
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def reconcile(self) -> Dict[str, str]:
+        """Bring the collection's indexes in line with the declarations; returns {index name: action}"""
+        started = time.perf_counter()
+        result: Dict[str, str] = {}
+        try:
+            for field, backfill in self.backfills.items():
+                update = await self.collection.update_many(backfill.filter, backfill.update)
+                self.backfilled[field] = self.backfilled.get(field, 0) + update.modified_count
+            existing = await self.collection.index_information()
+            to_create = []
+            for model in self.indexes:
+                wanted = model.document
+                name = wanted["name"]
+                current = existing.get(name)
+                if current is None:
+                    # Same key under another name (e.g. created by hand) counts if the options match too
+                    alias = next((other for other, spec in existing.items()
+                                  if _key(spec["key"]) == _key(wanted["key"])), None)
+                    if alias is not None and _options(existing[alias]) == _options(wanted):
+                        result[name] = f"unchanged (as {alias})"
+                        existing.pop(alias)
+                        continue
+                    if alias is not None:
+                        await self.collection.drop_index(alias)
+                        existing.pop(alias)
+                    to_create.append(model)
+                    result[name] = "created"
+                elif _key(current["key"]) != _key(wanted["key"]) or _options(current) != _options(wanted):
+                    await self.collection.drop_index(name)
+                    to_create.append(model)
+                    result[name] = "rebuilt"
+                else:
+                    result[name] = "unchanged"
+                existing.pop(name, None)
+            for name in existing:
+                if name == "_id_":
+                    continue
+                if self.drop_unknown:
+                    await self.collection.drop_index(name)
+                    result[name] = "dropped"
+                else:
+                    result[name] = "unmanaged"
+            if to_create:
+                await self.collection.create_indexes(to_create)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {str(e)}"
+            logger.error(f"Index reconcile for {self.collection.name} failed: {self.last_error}")
+        self.last_result = result
+        self.reconciled_at = datetime.now(timezone.utc)
+        self.reconcile_ms = (time.perf_counter() - started) * 1000
+        if self.last_error is None:
+            changed = {name: action for name, action in result.items() if not action.startswith("unchanged")}
+            logger.info(f"Indexes on {self.collection.name} reconciled in {self.reconcile_ms:.0f}ms: {changed or 'no changes'}")
+        return result
+
+    async def build_progress(self) -> List[dict]:
+        """In-flight index builds on this collection, with done/total progress where the server reports it"""
+        namespace = f"{self.collection.database.name}.{self.collection.name}"
+        current = await self.collection.database.client.admin.command({
+            "currentOp": 1,
+            "ns": namespace,
+            "$or": [{"command.createIndexes": {"$exists": True}}, {"msg": {"$regex": "^Index Build"}}],
+        })
+        builds = []
+        for op in current.get("inprog", []):
+            progress = op.get("progress") or {}
+            builds.append({
+                "indexes": [index.get("name") for index in op.get("command", {}).get("indexes", [])],
+                "message": op.get("msg"),
+                "done": progress.get("done"),
+                "total": progress.get("total"),
+                "running_seconds": op.get("secs_running"),
+            })
+        return builds
+
+    async def explain(self) -> Dict[str, dict]:
+        """Winning plan summary for each hot query"""
+        plans = {}
+        for name, query in self.hot_queries.items():
+            cursor = self.collection.find(query.filter, query.projection).limit(query.limit)
+            if query.sort:
+                cursor = cursor.sort(query.sort)
+            plans[name] = summarize_plan(await cursor.explain())
+        return plans
+
+    def stats(self) -> dict:
+        return {
+            "collection": self.collection.name,
+            "declared": [model.document["name"] for model in self.indexes],
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+            "backfilled": self.backfilled,
+            "reconciled_at": self.reconciled_at.isoformat() if self.reconciled_at else None,
+            "reconcile_ms": round(self.reconcile_ms, 1) if self.reconcile_ms is not None else None,
+        }
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+# Absolute time.monotonic() by which the current request must finish, if any
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+_MISSING = object()
+
+
+class DeadlineExceeded(Exception):
+    """The request's latency budget was spent before the upstream call could complete"""
+
+
+class CircuitOpenError(Exception):
+    """The circuit for an upstream dependency is open; the call was not attempted"""
+
+
+@contextmanager
+def deadline(budget_seconds: float):
+    """Give the enclosed code a latency budget.
+
+    Nested budgets can only shrink the deadline, never extend it, so a helper that
+    asks for 5s inside a request with 1s left still only gets 1s.
+    """
+    new_deadline = time.monotonic() + budget_seconds
+    current = _request_deadline.get()
+    if current is not None:
+        new_deadline = min(current, new_deadline)
+    token = _request_deadline.set(new_deadline)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current request's budget, or None outside a budget"""
+    current = _request_deadline.get()
+    if current is None:
+        return None
+    return current - time.monotonic()
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures; open -> half-open
+    after `reset_timeout` seconds, where a single trial call decides whether to close
+    again or re-open.
+
+    Each call is bounded by the smaller of `call_timeout` and the remaining request
+    budget. Running out of request budget is not held against the upstream, and
+    neither are `ignored_errors`: the upstream answered, it just refused this call.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 call_timeout: Optional[float] = None, ignored_errors: Tuple[Type[Exception], ...] = ()):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.call_timeout = call_timeout
+        self.ignored_errors = ignored_errors
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejections = 0
+        self.budget_exhausted = 0
+        self.trips = 0
+        _breakers[name] = self
+
+    def _allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def _record_success(self):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+        if self.state != "closed":
+            logger.info(f"Circuit '{self.name}' closed")
+        self.state = "closed"
+
+    def _record_failure(self):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+                logger.warning(f"Circuit '{self.name}' opened after {self.consecutive_failures} consecutive failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args, fallback: Any = _MISSING, **kwargs) -> Any:
+        """Await `func(*args, **kwargs)` under the breaker.
+
+        When `fallback` is given it is returned instead of raising on an open circuit,
+        an exhausted budget, a timeout or an upstream error.
+        """
+        budget = remaining_budget()
+        timeout = self.call_timeout
+        limited_by_budget = budget is not None and (timeout is None or budget < timeout)
+        if limited_by_budget:
+            timeout = budget
+
+        if timeout is not None and timeout <= 0:
+            self.budget_exhausted += 1
+            return self._fail(DeadlineExceeded(f"No budget left for '{self.name}'"), fallback)
+
+        if not self._allow():
+            self.rejections += 1
+            return self._fail(CircuitOpenError(f"Circuit '{self.name}' is open"), fallback)
+
+        self.calls += 1
+        try:
+            result = await asyncio.wait_for(func(*args, **kwargs), timeout=timeout)
+        except asyncio.TimeoutError:
+            if limited_by_budget:
+                # The request ran out of time; that says nothing about the upstream's health
+                self._trial_in_flight = False
+                self.budget_exhausted += 1
+                return self._fail(DeadlineExceeded(f"Budget exhausted waiting for '{self.name}'"), fallback)
+            self.timeouts += 1
+            self._record_failure()
+            return self._fail(TimeoutError(f"'{self.name}' timed out after {timeout}s"), fallback)
+        except asyncio.CancelledError:
+            self._trial_in_flight = False
+            raise
+        except self.ignored_errors as e:
+            self._record_success()
+            return self._fail(e, fallback)
+        except Exception as e:
+            self._record_failure()
+            return self._fail(e, fallback)
+        self._record_success()
+        return result
+
+    def _fail(self, error: Exception, fallback: Any) -> Any:
+        if fallback is _MISSING:
+            raise error
+        logger.debug(f"'{self.name}' call failed ({error!r}); using fallback")
+        return fallback
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "rejections": self.rejections,
+            "budget_exhausted": self.budget_exhausted,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def breaker_stats() -> Dict[str, dict]:
+    """State and counters for every circuit breaker created in this process"""
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from email.message import Message
+from typing import Deque, Optional
+
+import aiosmtplib
+
+from backend.utils.resilience import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the session is gone rather than the message being rejected; safe to resend once
+RECONNECT_ERRORS = (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, ConnectionError)
+
+# The server answered and refused this one message; aiosmtplib has already RSET the session, so it stays pooled
+REJECTION_ERRORS = (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPRecipientRefused,
+                    aiosmtplib.SMTPSenderRefused, aiosmtplib.SMTPDataError)
+
+
+def is_permanent_rejection(error: BaseException) -> bool:
+    """True for a 5xx refusal of the message itself: resending it will get the same answer"""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return bool(error.recipients) and all(r.code >= 500 for r in error.recipients)
+    return isinstance(error, REJECTION_ERRORS) and error.code >= 500
+
+
+class _Connection:
+    def __init__(self, smtp: aiosmtplib.SMTP):
+        self.smtp = smtp
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    """Keeps up to `size` authenticated SMTP sessions open and sends many messages on each.
+
+    A new session pays TCP connect, STARTTLS and AUTH once; after that each message
+    costs only MAIL/RCPT/DATA. `size` also caps concurrent sends to respect provider
+    limits. Sessions are retired after `max_messages_per_connection` messages or
+    `idle_timeout` seconds unused (before the server drops them), and a send that
+    finds its session dead reconnects and retries once. A refused message
+    (REJECTION_ERRORS) is raised to the caller but keeps its session.
+    """
+
+    def __init__(self, hostname: str, port: int, username: Optional[str] = None, password: Optional[str] = None,
+                 start_tls: bool = True, timeout: float = 10, size: int = 4,
+                 max_messages_per_connection: int = 100, idle_timeout: float = 60,
+                 breaker: Optional[CircuitBreaker] = None, name: str = "smtp"):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self.size = size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_timeout = idle_timeout
+        self.breaker = breaker
+        self.name = name
+        self._idle: Deque[_Connection] = deque()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.connects = 0
+        self.reconnects = 0
+        self.sent = 0
+        self.errors = 0
+        self.rejected = 0
+
+    async def _connect(self) -> _Connection:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await smtp.connect()  # includes STARTTLS and AUTH when configured
+        self.connects += 1
+        return _Connection(smtp)
+
+    async def _acquire(self) -> _Connection:
+        now = time.monotonic()
+        while self._idle:
+            conn = self._idle.pop()  # most recently used first: most likely still alive
+            if conn.smtp.is_connected and now - conn.last_used < self.idle_timeout:
+                return conn
+            await self._discard(conn)
+        return await self._connect()
+
+    def _release(self, conn: _Connection):
+        conn.last_used = time.monotonic()
+        if conn.messages >= self.max_messages_per_connection:
+            asyncio.ensure_future(self._discard(conn, quit=True))
+        else:
+            self._idle.append(conn)
+
+    async def _discard(self, conn: _Connection, quit: bool = False):
+        try:
+            if quit and conn.smtp.is_connected:
+                await conn.smtp.quit()
+            else:
+                conn.smtp.close()
+        except Exception:
+            conn.smtp.close()
+
+    async def _send(self, message: Message):
+        conn = await self._acquire()
+        try:
+            try:
+                await conn.smtp.send_message(message)
+            except RECONNECT_ERRORS as e:
+                await self._discard(conn)
+                self.reconnects += 1
+                logger.info(f"{self.name}: session dropped ({str(e)}); reconnecting")
+                conn = await self._connect()
+                await conn.smtp.send_message(message)
+        except REJECTION_ERRORS:
+            self.rejected += 1
+            conn.messages += 1
+            self._release(conn)
+            raise
+        except BaseException:
+            # Includes a timeout cancelling us mid-transaction: the session state is unknown
+            self.errors += 1
+            await self._discard(conn)
+            raise
+        conn.messages += 1
+        self.sent += 1
+        self._release(conn)
+
+    async def send(self, message: Message):
+        """Send one message on a pooled session; raises if it can't be delivered"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+        # Only the network part goes through the breaker, so queueing for a slot doesn't count as a timeout
+        async with self._semaphore:
+            if self.breaker is not None:
+                await self.breaker.call(self._send, message)
+            else:
+                await self._send(message)
+
+    async def close(self):
+        while self._idle:
+            await self._discard(self._idle.pop(), quit=True)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle_connections": len(self._idle),
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "sent": self.sent,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "messages_per_connect": round(self.sent / self.connects, 1) if self.connects else None,
+        }
+
+
+async def _benchmark(messages: int = 500, size: int = 4) -> None:
+    import socket
+    from email.mime.text import MIMEText
+
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.handlers import Sink
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    controller = Controller(Sink(), hostname="127.0.0.1", port=port)
+    controller.start()
+
+    def message(i):
+        msg = MIMEText(f"Report r-{i} status: processing", "html")
+        msg["From"], msg["To"], msg["Subject"] = "alerts@delhiair.test", f"citizen{i}@example.com", "Status update"
+        return msg
+
+    try:
+        semaphore = asyncio.Semaphore(size)
+
+        async def send_unpooled(i):
+            async with semaphore:
+                await aiosmtplib.send(message(i), hostname="127.0.0.1", port=port, start_tls=False)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send_unpooled(i) for i in range(messages)))
+        unpooled = time.perf_counter() - started
+
+        pool = SMTPPool("127.0.0.1", port, start_tls=False, size=size)
+        started = time.perf_counter()
+        await asyncio.gather(*(pool.send(message(i)) for i in range(messages)))
+        pooled = time.perf_counter() - started
+        await pool.close()
+    finally:
+        controller.stop()
+
+    print(f"{messages} messages, concurrency {size}, local aiosmtpd stub (no TLS/AUTH - real servers widen the gap)")
+    print(f"  connection per message: {unpooled:.2f}s ({messages / unpooled:.0f} msg/s)")
+    print(f"  pooled sessions:        {pooled:.2f}s ({messages / pooled:.0f} msg/s, {pool.connects} connects)")
+
+
+if __name__ == "__main__":
+    # python -m backend.utils.smtp_pool
+    asyncio.run(_benchmark())
@@ -0,0 +1,116 @@
+import logging
+import time
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.utils.waqi_stations import POLLUTANTS
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("traffic", "industry", "construction", "stubble_burning", "other")
+
+# Input order of the Random-Forest artifact (see ML_INTEGRATION_GUIDE.md)
+ATTRIBUTION_FEATURES = ("PM2.5", "PM10", "NO2", "SO2", "CO", "O3", "pm_ratio", "no2_co_ratio", "month", "hour")
+
+# Indicator -> source weights for the heuristic. Indicators are WAQI sub-indices:
+# NO2 marks vehicle exhaust, SO2 coal and industrial stacks, the PM10 - PM2.5 coarse
+# fraction road and construction dust, fine PM2.5 with CO biomass burning.
+#                      traffic industry construction stubble other
+_WEIGHTS = np.array([
+    [1.0, 0.2, 0.0, 0.0, 0.0],  # NO2
+    [0.1, 1.5, 0.0, 0.0, 0.0],  # SO2
+    [0.4, 0.1, 0.0, 0.5, 0.0],  # CO
+    [0.0, 0.0, 1.0, 0.0, 0.0],  # coarse PM (PM10 - PM2.5)
+    [0.2, 0.1, 0.0, 0.5, 0.0],  # fine PM2.5
+    [0.0, 0.0, 0.0, 0.0, 0.1],  # total load -> background / other
+])
+_BURNING_MONTHS = (10, 11)
+_RUSH_HOURS = (8, 9, 10, 18, 19, 20, 21)
+
+
+def attribution_features(pollutants: np.ndarray, month, hour) -> np.ndarray:
+    """(n, 10) model input from (n, 6) pollutant sub-indices in POLLUTANTS order plus month/hour"""
+    P = np.asarray(pollutants, dtype=np.float64).reshape(-1, len(POLLUTANTS))
+    pm25, pm10, no2, co = P[:, 0], P[:, 1], P[:, 2], P[:, 4]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pm_ratio = np.where(pm25 > 0, pm10 / pm25, 0.0)
+        no2_co_ratio = np.where(co > 0, no2 / co, 0.0)
+    month = np.broadcast_to(np.asarray(month, dtype=np.float64), len(P))
+    hour = np.broadcast_to(np.asarray(hour, dtype=np.float64), len(P))
+    return np.column_stack([P, pm_ratio, no2_co_ratio, month, hour])
+
+
+def heuristic_attribution(X: np.ndarray) -> np.ndarray:
+    """Percent contribution per source, shape (n, 5), from indicator ratios - one matrix product"""
+    pm25, pm10, no2, so2, co = X[:, 0], X[:, 1], X[:, 2], X[:, 3], X[:, 4]
+    indicators = np.column_stack([
+        no2, so2, co, np.maximum(pm10 - pm25, 0.0), pm25, X[:, :6].sum(axis=1),
+    ])
+    scores = indicators @ _WEIGHTS
+    scores[:, SOURCES.index("traffic")] *= np.where(np.isin(X[:, 9], _RUSH_HOURS), 1.5, 1.0)
+    scores[:, SOURCES.index("stubble_burning")] *= np.where(np.isin(X[:, 8], _BURNING_MONTHS), 1.0, 0.15)
+    scores[:, SOURCES.index("other")] += 1.0  # keeps all-zero readings well defined
+    return _to_percent(scores)
+
+
+def _to_percent(scores: np.ndarray) -> np.ndarray:
+    scores = np.clip(scores, 0.0, None)
+    return 100.0 * scores / np.maximum(scores.sum(axis=1, keepdims=True), 1e-9)
+
+
+def attribution_confidence(shares: np.ndarray, X: np.ndarray) -> np.ndarray:
+    """0-1 per row: how clearly one source dominates, scaled by how many pollutants were reported"""
+    top_two = np.sort(shares, axis=1)[:, -2:]
+    margin = (top_two[:, 1] - top_two[:, 0]) / 100.0
+    completeness = (X[:, :6] > 0).mean(axis=1)
+    return np.clip(completeness * (0.6 + margin), 0.0, 1.0)
+
+
+class SourceAttributor:
+    """Pollution-source shares for one reading or many station-hours at once.
+
+    Uses the Random-Forest artifact when one is given, else the indicator-ratio
+    heuristic. Either way the whole batch is a single vectorized call.
+    """
+
+    def __init__(self, model: Any = None, version: Optional[str] = None):
+        self.model = model
+        self.prediction_type = "ml" if model is not None else "heuristic"
+        self.version = version or ("rf-v1.0" if model is not None else "heuristic-v1.0")
+
+    def attribute(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (percent shares (n, 5) in SOURCES order, confidence (n,))"""
+        X = np.asarray(X, dtype=np.float64)
+        if self.model is not None:
+            shares = _to_percent(np.asarray(self.model.predict(X), dtype=np.float64).reshape(len(X), -1))
+        else:
+            shares = heuristic_attribution(X)
+        return shares, attribution_confidence(shares, X)
+
+    def stats(self) -> dict:
+        return {"prediction_type": self.prediction_type, "model_version": self.version}
+
+
+def _benchmark(batch_sizes: Sequence[int], repeats: int = 5) -> None:
+    rng = np.random.default_rng(0)
+    attributor = SourceAttributor()
+    print(f"{'rows':>8} {'batch total':>12} {'per row':>10} {'row loop per row':>17}")
+    for n in batch_sizes:
+        X = attribution_features(rng.uniform(0, 400, size=(n, len(POLLUTANTS))), rng.integers(1, 13, n),
+                                 rng.integers(0, 24, n))
+        best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            attributor.attribute(X)
+            best = min(best, time.perf_counter() - started)
+        started = time.perf_counter()
+        for row in X[:min(n, 1000)]:
+            attributor.attribute(row[np.newaxis, :])
+        loop = (time.perf_counter() - started) / min(n, 1000)
+        print(f"{n:>8} {best * 1000:>10.2f}ms {best / n * 1e6:>8.2f}us {loop * 1e6:>15.2f}us")
+
+
+if __name__ == "__main__":
+    # python -m backend.utils.source_attribution
+    _benchmark([1, 100, 10_000, 100_000])
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AQISnapshot:
+    """Immutable view of the latest upstream reading published by the poller"""
+    data: Any
+    fetched_at: datetime
+    fetched_monotonic: float
+    sequence: int
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.fetched_monotonic
+
+
+class WAQIPoller:
+    """Polls an upstream fetch function on a jittered schedule and publishes snapshots.
+
+    Readers only ever look at `snapshot`, which is replaced atomically, so the
+    request path never waits on the network. Failed polls back off exponentially
+    (capped at `max_backoff_seconds`) and keep the last good snapshot in place.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[Optional[Any]]],
+        interval_seconds: float = 300.0,
+        jitter_ratio: float = 0.1,
+        retry_seconds: float = 5.0,
+        max_backoff_seconds: float = 300.0,
+        name: str = "waqi",
+    ):
+        self.fetch = fetch
+        self.interval_seconds = interval_seconds
+        self.jitter_ratio = jitter_ratio
+        self.retry_seconds = retry_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.name = name
+        self._snapshot: Optional[AQISnapshot] = None
+        self._subscribers: List[Callable[[AQISnapshot], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.consecutive_failures = 0
+        self.polls = 0
+        self.failures = 0
+
+    @property
+    def snapshot(self) -> Optional[AQISnapshot]:
+        return self._snapshot
+
+    def subscribe(self, callback: Callable[[AQISnapshot], None]):
+        """Register a callback invoked synchronously whenever a new snapshot is published"""
+        self._subscribers.append(callback)
+
+    def publish(self, data: Any) -> AQISnapshot:
+        sequence = self._snapshot.sequence + 1 if self._snapshot else 1
+        snapshot = AQISnapshot(
+            data=data,
+            fetched_at=datetime.now(timezone.utc),
+            fetched_monotonic=time.monotonic(),
+            sequence=sequence,
+        )
+        self._snapshot = snapshot
+        for callback in self._subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"{self.name} poller: subscriber failed: {str(e)}")
+        return snapshot
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"{self.name} poller started (interval={self.interval_seconds}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _next_delay(self) -> float:
+        if self.consecutive_failures:
+            base = min(self.max_backoff_seconds, self.retry_seconds * 2 ** (self.consecutive_failures - 1))
+        else:
+            base = self.interval_seconds
+        return base * (1 + random.uniform(-self.jitter_ratio, self.jitter_ratio))
+
+    async def poll_once(self) -> bool:
+        self.polls += 1
+        try:
+            data = await self.fetch()
+        except Exception as e:
+            data = None
+            logger.warning(f"{self.name} poll failed: {str(e)}")
+        if data is None:
+            self.failures += 1
+            self.consecutive_failures += 1
+            return False
+        self.consecutive_failures = 0
+        self.publish(data)
+        return True
+
+    async def _run(self):
+        while True:
+            await self.poll_once()
+            await asyncio.sleep(self._next_delay())
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval_seconds,
+            "polls": self.polls,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "snapshot_sequence": snapshot.sequence if snapshot else None,
+            "snapshot_fetched_at": snapshot.fetched_at.isoformat() if snapshot else None,
+            "snapshot_age_seconds": round(snapshot.age_seconds, 3) if snapshot else None,
+        }
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+POLLUTANTS = ('pm25', 'pm10', 'no2', 'so2', 'co', 'o3')
+
+# lat1, lng1, lat2, lng2 - covers Delhi, Noida, Ghaziabad, Gurugram and Faridabad
+DELHI_NCR_BOUNDS = (28.38, 76.84, 28.89, 77.48)
+
+AQI_CATEGORY_THRESHOLDS = (
+    (300, "Hazardous"),
+    (200, "Very Unhealthy"),
+    (150, "Unhealthy"),
+    (100, "Unhealthy for Sensitive Groups"),
+    (50, "Moderate"),
+)
+
+
+def aqi_categories(aqi: np.ndarray) -> np.ndarray:
+    """Vectorized AQI -> category label, same thresholds as the current-AQI endpoint"""
+    conditions = [aqi > limit for limit, _ in AQI_CATEGORY_THRESHOLDS]
+    labels = [label for _, label in AQI_CATEGORY_THRESHOLDS]
+    return np.select(conditions, labels, default="Good")
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+@dataclass(frozen=True)
+class StationTable:
+    """Columnar station readings; every array has one entry per station.
+
+    Missing readings are NaN so callers can vectorize with nan-aware NumPy ops.
+    """
+    uids: np.ndarray
+    names: Tuple[str, ...]
+    lat: np.ndarray
+    lng: np.ndarray
+    aqi: np.ndarray
+    pollutants: Dict[str, np.ndarray]
+    fetched_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    failed: int = 0
+
+    def __len__(self) -> int:
+        return len(self.uids)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[dict], failed: int = 0) -> "StationTable":
+        return cls(
+            uids=np.array([row['uid'] for row in rows], dtype=np.int64),
+            names=tuple(row.get('name', '') for row in rows),
+            lat=np.array([_to_float(row.get('lat')) for row in rows], dtype=np.float64),
+            lng=np.array([_to_float(row.get('lng')) for row in rows], dtype=np.float64),
+            aqi=np.array([_to_float(row.get('aqi')) for row in rows], dtype=np.float64),
+            pollutants={
+                p: np.array([_to_float(row.get(p)) for row in rows], dtype=np.float64)
+                for p in POLLUTANTS
+            },
+            failed=failed,
+        )
+
+    def valid(self) -> "StationTable":
+        """Rows with a usable position and AQI reading"""
+        mask = ~(np.isnan(self.lat) | np.isnan(self.lng) | np.isnan(self.aqi))
+        return StationTable(
+            uids=self.uids[mask],
+            names=tuple(n for n, keep in zip(self.names, mask) if keep),
+            lat=self.lat[mask],
+            lng=self.lng[mask],
+            aqi=self.aqi[mask],
+            pollutants={p: values[mask] for p, values in self.pollutants.items()},
+            fetched_at=self.fetched_at,
+            failed=self.failed,
+        )
+
+
+class WAQIStationFetcher:
+    """Fetches every station in a region concurrently and returns a StationTable.
+
+    Stations come from `station_ids` when configured, otherwise from the WAQI
+    map-bounds endpoint. Per-station feeds are fetched under a semaphore with a
+    per-station timeout; a failed station keeps whatever the bounds listing gave
+    us (position + AQI) or is dropped, it never fails the whole fetch.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], aiohttp.ClientSession],
+        token: Optional[str],
+        base_url: str = "https://api.waqi.info",
+        bounds: Tuple[float, float, float, float] = DELHI_NCR_BOUNDS,
+        station_ids: Optional[Sequence[int]] = None,
+        concurrency: int = 8,
+        station_timeout: float = 4.0,
+    ):
+        self.session_factory = session_factory
+        self.token = token
+        self.base_url = base_url.rstrip('/')
+        self.bounds = bounds
+        self.station_ids = list(station_ids) if station_ids else []
+        self.concurrency = concurrency
+        self.station_timeout = station_timeout
+
+    async def _get_json(self, path: str, params: dict) -> Optional[dict]:
+        session = self.session_factory()
+        params = {**params, 'token': self.token or ''}
+        async with session.get(f"{self.base_url}{path}", params=params) as response:
+            if response.status != 200:
+                return None
+            data = await response.json(content_type=None)
+            if data.get('status') != 'ok':
+                return None
+            return data.get('data')
+
+    async def discover(self) -> List[dict]:
+        """List stations inside the bounding box via the map-bounds endpoint"""
+        latlng = ','.join(str(v) for v in self.bounds)
+        data = await asyncio.wait_for(
+            self._get_json('/map/bounds', {'latlng': latlng}), timeout=self.station_timeout
+        )
+        stations = []
+        for item in data or []:
+            stations.append({
+                'uid': int(item['uid']),
+                'name': (item.get('station') or {}).get('name', ''),
+                'lat': item.get('lat'),
+                'lng': item.get('lon'),
+                'aqi': item.get('aqi'),
+            })
+        return stations
+
+    async def fetch_station(self, uid: int) -> Optional[dict]:
+        data = await self._get_json(f'/feed/@{uid}/', {})
+        if not data:
+            return None
+        geo = (data.get('city') or {}).get('geo') or [None, None]
+        iaqi = data.get('iaqi') or {}
+        row = {
+            'uid': uid,
+            'name': (data.get('city') or {}).get('name', ''),
+            'lat': geo[0],
+            'lng': geo[1],
+            'aqi': data.get('aqi'),
+        }
+        for p in POLLUTANTS:
+            row[p] = (iaqi.get(p) or {}).get('v')
+        return row
+
+    async def fetch(self) -> StationTable:
+        if self.station_ids:
+            listed = {uid: {'uid': uid} for uid in self.station_ids}
+        else:
+            listed = {s['uid']: s for s in await self.discover()}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(uid: int) -> Optional[dict]:
+            async with semaphore:
+                return await asyncio.wait_for(self.fetch_station(uid), timeout=self.station_timeout)
+
+        results = await asyncio.gather(*(bounded(uid) for uid in listed), return_exceptions=True)
+
+        rows, failed = [], 0
+        for (uid, base), result in zip(listed.items(), results):
+            if isinstance(result, BaseException) or result is None:
+                failed += 1
+                if isinstance(result, BaseException):
+                    logger.debug(f"Station {uid} fetch failed: {result!r}")
+                # Fall back to the bounds listing, which already has position and AQI
+                if 'lat' in base:
+                    rows.append(base)
+                continue
+            rows.append({**base, **{k: v for k, v in result.items() if v is not None}})
+
+        if failed:
+            logger.warning(f"WAQI station fetch: {failed}/{len(listed)} stations failed")
+        return StationTable.from_rows(rows, failed=failed).valid()
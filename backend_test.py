@@ -13,12 +13,15 @@ from typing import Dict, Any, List
 # Configuration
 BASE_URL = "https://aqi-predict-1.preview.emergentagent.com/api"
 TIMEOUT = 10  # seconds
+ADMIN_EMAIL = "admin@delhiair.gov.in"
+ADMIN_PASSWORD = "DelhiAir@2026"
 
 class APITester:
     def __init__(self):
         self.results = []
         self.total_tests = 0
         self.passed_tests = 0
+        self._admin_token = None
         
     def log_result(self, endpoint: str, test_name: str, passed: bool, details: str = ""):
         """Log test result"""
@@ -41,6 +44,15 @@ class APITester:
         if details and not passed:
             print(f"   Details: {details}")
     
+    def admin_headers(self) -> Dict[str, str]:
+        """Bearer token for admin-only endpoints, logging in once"""
+        if self._admin_token is None:
+            response = requests.post(f"{BASE_URL}/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+                                     timeout=TIMEOUT)
+            response.raise_for_status()
+            self._admin_token = response.json()["token"]
+        return {"Authorization": f"Bearer {self._admin_token}"}
+
     def test_endpoint(self, endpoint: str, expected_fields: List[str] = None, params: Dict = None):
         """Generic endpoint test"""
         url = f"{BASE_URL}{endpoint}"
@@ -272,6 +284,239 @@ class APITester:
         else:
             self.log_result("/model/transparency", "Limitations", False, "Empty or invalid limitations array")
     
+    def test_batch_forecast_endpoint(self):
+        """Test POST /api/aqi/forecast/batch (JSON and NDJSON streaming)"""
+        print("\n📦 Testing Batch Forecast Endpoint")
+        endpoint = "/aqi/forecast/batch"
+        rows = [[120.0], [180.0], [260.0]]
+
+        try:
+            response = requests.post(f"{BASE_URL}{endpoint}", json={"rows": rows}, timeout=TIMEOUT)
+            if response.status_code != 200:
+                self.log_result(endpoint, "Status code", False, f"Got {response.status_code}")
+                return
+            data = response.json()
+            forecasts = data.get("forecasts", [])
+            if (data.get("count") == len(rows) and [f.get("index") for f in forecasts] == [0, 1, 2]
+                    and all("aqi_48h" in f and "aqi_72h" in f for f in forecasts)):
+                self.log_result(endpoint, "JSON batch", True, f"{len(forecasts)} forecasts")
+            else:
+                self.log_result(endpoint, "JSON batch", False, f"Unexpected body: {data}")
+
+            body = "\n".join(json.dumps(row) for row in rows) + "\nnot-json\n"
+            response = requests.post(
+                f"{BASE_URL}{endpoint}",
+                data=body,
+                headers={"Content-Type": "application/x-ndjson"},
+                timeout=TIMEOUT
+            )
+            lines = [json.loads(line) for line in response.text.splitlines() if line.strip()]
+            predicted = sorted(line["index"] for line in lines if "aqi_24h" in line)
+            errors = [line["index"] for line in lines if "error" in line]
+            if predicted == [0, 1, 2] and errors == [3]:
+                self.log_result(endpoint, "NDJSON streaming", True, f"{len(lines)} lines")
+            else:
+                self.log_result(endpoint, "NDJSON streaming", False, f"Unexpected lines: {lines}")
+        except requests.exceptions.RequestException as e:
+            self.log_result(endpoint, "Basic functionality", False, f"Request error: {str(e)}")
+
+    def test_bulk_reports_endpoint(self):
+        """Test POST /api/reports/bulk (NDJSON and CSV uploads)"""
+        print("\n📥 Testing Bulk Reports Endpoint")
+        endpoint = "/reports/bulk"
+        report = {"name": "Field Team", "mobile": "9999999999", "email": "team@example.com",
+                  "location": "ITO", "severity": 3}
+
+        try:
+            body = "\n".join([json.dumps(report), json.dumps({**report, "severity": 9}), json.dumps(report)]) + "\n"
+            response = requests.post(
+                f"{BASE_URL}{endpoint}",
+                data=body,
+                headers={"Content-Type": "application/x-ndjson"},
+                timeout=TIMEOUT
+            )
+            if response.status_code != 200:
+                self.log_result(endpoint, "Status code", False, f"Got {response.status_code}")
+                return
+            lines = [json.loads(line) for line in response.text.splitlines() if line.strip()]
+            stored = sorted(line["index"] for line in lines if "id" in line)
+            errors = [line["index"] for line in lines if "error" in line]
+            summary = lines[-1].get("summary") if lines else None
+            if stored == [0, 2] and errors == [1] and summary == {"received": 3, "inserted": 2, "failed": 1}:
+                self.log_result(endpoint, "NDJSON upload", True, f"{len(lines)} lines")
+            else:
+                self.log_result(endpoint, "NDJSON upload", False, f"Unexpected lines: {lines}")
+
+            body = "name,mobile,email,location,severity\nField Team,9999999999,team@example.com,ITO,2\n"
+            response = requests.post(
+                f"{BASE_URL}{endpoint}",
+                data=body,
+                headers={"Content-Type": "text/csv"},
+                timeout=TIMEOUT
+            )
+            lines = [json.loads(line) for line in response.text.splitlines() if line.strip()]
+            if response.status_code == 200 and "id" in lines[0] and lines[-1].get("summary", {}).get("inserted") == 1:
+                self.log_result(endpoint, "CSV upload", True, f"{len(lines)} lines")
+            else:
+                self.log_result(endpoint, "CSV upload", False, f"Unexpected response: {response.text}")
+        except requests.exceptions.RequestException as e:
+            self.log_result(endpoint, "Basic functionality", False, f"Request error: {str(e)}")
+
+    def test_bulk_status_endpoint(self):
+        """Test PATCH /api/reports/status:bulk (bulk status transitions)"""
+        print("\n✅ Testing Bulk Status Endpoint")
+        endpoint = "/reports/status:bulk"
+        report = {"name": "Field Team", "mobile": "9999999999", "email": "team@example.com",
+                  "location": "ITO", "severity": 2}
+
+        try:
+            response = requests.post(
+                f"{BASE_URL}/reports/bulk",
+                data="\n".join(json.dumps(report) for _ in range(3)) + "\n",
+                headers={"Content-Type": "application/x-ndjson"},
+                timeout=TIMEOUT
+            )
+            ids = [json.loads(line)["id"] for line in response.text.splitlines() if '"id"' in line]
+            if len(ids) != 3:
+                self.log_result(endpoint, "Setup", False, f"Could not create reports: {response.text}")
+                return
+
+            body = {"ids": ids + ["missing-report"], "status": "completed"}
+            response = requests.patch(f"{BASE_URL}{endpoint}", json=body, timeout=TIMEOUT)
+            self.log_result(endpoint, "Requires admin", response.status_code == 401, f"Got {response.status_code}")
+
+            response = requests.patch(f"{BASE_URL}{endpoint}", json=body, headers=self.admin_headers(), timeout=TIMEOUT)
+            data = response.json()
+            if (response.status_code == 200 and data.get("updated") == 3
+                    and data.get("not_found") == ["missing-report"]):
+                self.log_result(endpoint, "Bulk transition", True, f"{data}")
+            else:
+                self.log_result(endpoint, "Bulk transition", False, f"Got {response.status_code}: {data}")
+
+            response = requests.patch(f"{BASE_URL}{endpoint}", json=body, headers=self.admin_headers(), timeout=TIMEOUT)
+            data = response.json()
+            if data.get("updated") == 0 and data.get("unchanged") == 3:
+                self.log_result(endpoint, "Idempotent repeat", True, "No reports re-notified")
+            else:
+                self.log_result(endpoint, "Idempotent repeat", False, f"Unexpected body: {data}")
+
+            response = requests.patch(f"{BASE_URL}{endpoint}", json={"ids": ids, "status": "archived"},
+                                      headers=self.admin_headers(), timeout=TIMEOUT)
+            self.log_result(endpoint, "Unknown status rejected", response.status_code == 422, f"Got {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            self.log_result(endpoint, "Basic functionality", False, f"Request error: {str(e)}")
+
+    def test_report_listing_endpoint(self):
+        """Test GET /api/reports (keyset pagination and projection)"""
+        print("\n📄 Testing Report Listing Endpoint")
+        endpoint = "/reports"
+
+        try:
+            response = requests.get(f"{BASE_URL}{endpoint}", params={"limit": 2}, timeout=TIMEOUT)
+            self.log_result(endpoint, "Requires admin", response.status_code == 401, f"Got {response.status_code}")
+
+            response = requests.get(f"{BASE_URL}{endpoint}", params={"limit": 2}, headers=self.admin_headers(),
+                                    timeout=TIMEOUT)
+            if response.status_code != 200:
+                self.log_result(endpoint, "Status code", False, f"Got {response.status_code}")
+                return
+            first = response.json()
+            reports = first.get("reports", [])
+            if reports and all("description" not in r and "image_url" not in r for r in reports):
+                self.log_result(endpoint, "Projection", True, f"{len(reports)} reports without description/image_url")
+            else:
+                self.log_result(endpoint, "Projection", False, f"Unexpected reports: {reports}")
+
+            if not first.get("next_cursor"):
+                self.log_result(endpoint, "Keyset pagination", True, "Single page only")
+                return
+            response = requests.get(
+                f"{BASE_URL}{endpoint}", params={"limit": 2, "cursor": first["next_cursor"]},
+                headers=self.admin_headers(), timeout=TIMEOUT
+            )
+            second = response.json().get("reports", [])
+            ordered = [(r["created_at"], r["id"]) for r in reports + second]
+            if second and ordered == sorted(ordered, reverse=True) and len(set(ordered)) == len(ordered):
+                self.log_result(endpoint, "Keyset pagination", True, "Second page continues the first")
+            else:
+                self.log_result(endpoint, "Keyset pagination", False, f"Pages overlap or are unordered: {ordered}")
+        except requests.exceptions.RequestException as e:
+            self.log_result(endpoint, "Basic functionality", False, f"Request error: {str(e)}")
+
+    def test_report_counts_endpoint(self):
+        """Test GET /api/reports/counts (dashboard counters across all reports)"""
+        print("\n🔢 Testing Report Counts Endpoint")
+        endpoint = "/reports/counts"
+
+        try:
+            response = requests.get(f"{BASE_URL}{endpoint}", timeout=TIMEOUT)
+            self.log_result(endpoint, "Requires admin", response.status_code == 401, f"Got {response.status_code}")
+
+            response = requests.get(f"{BASE_URL}{endpoint}", headers=self.admin_headers(), timeout=TIMEOUT)
+            if response.status_code != 200:
+                self.log_result(endpoint, "Status code", False, f"Got {response.status_code}")
+                return
+            data = response.json()
+            by_status = data.get("by_status", {})
+            if set(by_status) == {"pending", "viewed", "processing", "completed"} and data.get("total", -1) >= 0:
+                self.log_result(endpoint, "Counts per status", True, f"{data['total']} reports: {by_status}")
+            else:
+                self.log_result(endpoint, "Counts per status", False, f"Unexpected body: {data}")
+        except requests.exceptions.RequestException as e:
+            self.log_result(endpoint, "Basic functionality", False, f"Request error: {str(e)}")
+
+    def test_report_clusters_endpoint(self):
+        """Test GET /api/reports/clusters (viewport clustering)"""
+        print("\n🗺️ Testing Report Clusters Endpoint")
+        endpoint = "/reports/clusters"
+        bbox = "76.8,28.3,77.5,29.0"
+
+        try:
+            response = requests.get(f"{BASE_URL}{endpoint}", params={"bbox": bbox, "zoom": 11}, timeout=TIMEOUT)
+            if response.status_code != 200:
+                self.log_result(endpoint, "Status code", False, f"Got {response.status_code}")
+                return
+            data = response.json()
+            clusters = data.get("clusters", [])
+            inside = all(76.8 <= c["longitude"] <= 77.5 and 28.3 <= c["latitude"] <= 29.0 for c in clusters)
+            if inside and data.get("total") == sum(c["count"] for c in clusters):
+                self.log_result(endpoint, "City-wide clusters", True, f"{len(clusters)} clusters, {data['total']} reports")
+            else:
+                self.log_result(endpoint, "City-wide clusters", False, f"Unexpected body: {data}")
+
+            response = requests.get(f"{BASE_URL}{endpoint}", params={"bbox": "1,2", "zoom": 11}, timeout=TIMEOUT)
+            self.log_result(endpoint, "Invalid bbox", response.status_code == 400, f"Got {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            self.log_result(endpoint, "Basic functionality", False, f"Request error: {str(e)}")
+
+    def test_report_indexes_endpoint(self):
+        """Test GET /api/reports/indexes (reconciled indexes and hot-query plans)"""
+        print("\n🗂️ Testing Report Indexes Endpoint")
+        endpoint = "/reports/indexes"
+
+        try:
+            response = requests.get(f"{BASE_URL}{endpoint}", timeout=TIMEOUT)
+            self.log_result(endpoint, "Requires admin", response.status_code == 401, f"Got {response.status_code}")
+
+            response = requests.get(f"{BASE_URL}{endpoint}", headers=self.admin_headers(), timeout=TIMEOUT)
+            if response.status_code != 200:
+                self.log_result(endpoint, "Status code", False, f"Got {response.status_code}")
+                return
+            data = response.json()
+            declared = data.get("declared", [])
+            if {"id_unique", "status_created_at", "severity_created_at", "geo_2dsphere"} <= set(declared) and not data.get("last_error"):
+                self.log_result(endpoint, "Declared indexes", True, f"{data.get('last_result')}")
+            else:
+                self.log_result(endpoint, "Declared indexes", False, f"Unexpected body: {data}")
+
+            scans = [name for name, plan in data.get("plans", {}).items() if plan.get("collection_scan")]
+            if data.get("plans") and not scans:
+                self.log_result(endpoint, "Hot query plans", True, f"{len(data['plans'])} queries use indexes")
+            else:
+                self.log_result(endpoint, "Hot query plans", False, f"Collection scans: {scans or data.get('plans')}")
+        except requests.exceptions.RequestException as e:
+            self.log_result(endpoint, "Basic functionality", False, f"Request error: {str(e)}")
+
     def test_existing_endpoints(self):
         """Test existing endpoints for regression"""
         print("\n🔄 Testing Existing Endpoints (Regression Check)")
@@ -287,6 +532,10 @@ class APITester:
         # Test sources
         source_fields = ["contributions", "dominant_source", "confidence", "prediction_type", "model_version"]
         self.test_endpoint("/aqi/sources", source_fields)
+
+        # Test liveness and readiness probes
+        self.test_endpoint("/health", ["status"])
+        self.test_endpoint("/ready", ["status", "model"])
     
     def run_all_tests(self):
         """Run all tests"""
@@ -300,6 +549,13 @@ class APITester:
         self.test_alerts_endpoint()
         self.test_insights_endpoint()
         self.test_transparency_endpoint()
+        self.test_batch_forecast_endpoint()
+        self.test_bulk_reports_endpoint()
+        self.test_bulk_status_endpoint()
+        self.test_report_listing_endpoint()
+        self.test_report_counts_endpoint()
+        self.test_report_clusters_endpoint()
+        self.test_report_indexes_endpoint()
         
         # Test existing endpoints
         self.test_existing_endpoints()
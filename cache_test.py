@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-flight TTL cache
+Run with: python -m pytest cache_test.py
+"""
+
+import asyncio
+
+import pytest
+
+from backend.utils.cache import SingleFlightCache
+
+
+class Upstream:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    async def load(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("upstream down")
+        return {"aqi": 100 + self.calls}
+
+
+def test_concurrent_misses_share_one_load():
+    upstream = Upstream()
+    cache = SingleFlightCache(ttl_seconds=60)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get(upstream.load) for _ in range(20)))
+
+    results = asyncio.run(scenario())
+
+    assert upstream.calls == 1
+    assert all(r == {"aqi": 101} for r in results)
+    assert cache.stats()["misses"] == 20 and cache.stats()["loads"] == 1
+
+
+def test_fresh_value_is_served_without_loading():
+    upstream = Upstream()
+    cache = SingleFlightCache(ttl_seconds=60)
+
+    async def scenario():
+        await cache.get(upstream.load)
+        return [await cache.get(upstream.load) for _ in range(5)]
+
+    assert asyncio.run(scenario()) == [{"aqi": 101}] * 5
+    assert upstream.calls == 1 and cache.stats()["hits"] == 5
+
+
+def test_stale_value_is_served_while_one_refresh_runs():
+    upstream = Upstream()
+    cache = SingleFlightCache(ttl_seconds=0.01)
+
+    async def scenario():
+        await cache.get(upstream.load)
+        await asyncio.sleep(0.02)
+        stale = await asyncio.gather(*(cache.get(upstream.load) for _ in range(5)))
+        await cache._inflight
+        return stale, await cache.get(upstream.load)
+
+    stale, refreshed = asyncio.run(scenario())
+
+    assert stale == [{"aqi": 101}] * 5  # returned immediately, not after the refresh
+    assert refreshed == {"aqi": 102}
+    assert cache.stats()["stale_hits"] >= 5 and upstream.calls == 2
+
+
+def test_failed_refresh_keeps_the_previous_value():
+    upstream = Upstream()
+    cache = SingleFlightCache(ttl_seconds=0.01)
+
+    async def scenario():
+        await cache.get(upstream.load)
+        upstream.fail = True
+        await asyncio.sleep(0.02)
+        stale = await cache.get(upstream.load)
+        await cache._inflight
+        return stale
+
+    assert asyncio.run(scenario()) == {"aqi": 101}
+    assert cache.peek() == {"aqi": 101} and cache.stats()["load_failures"] == 1
+
+
+def test_failed_first_load_raises():
+    upstream = Upstream()
+    upstream.fail = True
+    cache = SingleFlightCache(ttl_seconds=60, name="waqi")
+
+    with pytest.raises(RuntimeError, match="waqi"):
+        asyncio.run(cache.get(upstream.load))
+    assert not cache.has_value
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the email outbox against a local aiosmtpd SMTP server
+Run with: python -m pytest email_outbox_test.py
+"""
+
+import asyncio
+import json
+import socket
+
+import aiosmtplib
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Message
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, EmailOutbox
+from backend.utils import email_service
+from backend.utils.email_outbox import EmailOutboxWorker
+from backend.utils.smtp_pool import is_permanent_rejection
+
+
+class Inbox(Message):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def handle_message(self, message):
+        self.messages.append(message)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def smtp_server(monkeypatch):
+    inbox = Inbox()
+    controller = Controller(inbox, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    monkeypatch.setattr(email_service, "EMAIL_HOST", "127.0.0.1")
+    monkeypatch.setattr(email_service, "EMAIL_PORT", controller.port)
+    monkeypatch.setattr(email_service, "EMAIL_STARTTLS", False)
+    monkeypatch.setattr(email_service, "EMAIL_FROM", "alerts@delhiair.test")
+    return controller, inbox
+
+
+def rows(Session):
+    with Session() as session:
+        return session.scalars(select(EmailOutbox).order_by(EmailOutbox.id)).all()
+
+
+def test_enqueued_emails_are_delivered_by_workers(monkeypatch, tmp_path):
+    controller, inbox = smtp_server(monkeypatch)
+    Session = session_factory(tmp_path)
+
+    async def scenario():
+        outbox = EmailOutboxWorker(Session, email_service.deliver_email, email_service.RENDERERS, poll_interval=0.1)
+        outbox.start()
+        await outbox.enqueue("report_confirmation", "citizen@example.com", name="Asha", report_id="r-1")
+        await outbox.enqueue("status_update", "citizen@example.com", name="Asha", report_id="r-1",
+                             new_status="completed")
+        for _ in range(50):
+            if outbox.sent == 2:
+                break
+            await asyncio.sleep(0.05)
+        await outbox.stop()
+        await email_service.close_smtp_pool()
+        return outbox
+
+    try:
+        outbox = asyncio.run(scenario())
+    finally:
+        controller.stop()
+
+    assert outbox.sent == 2
+    assert sorted(m["Subject"] for m in inbox.messages) == [
+        "Pollution Report Submitted - Delhi Air Command",
+        "Report Status Update: Completed - Delhi Air Command",
+    ]
+    assert [(row.status, row.attempts) for row in rows(Session)] == [("sent", 1), ("sent", 1)]
+
+
+def test_failed_sends_are_retried_with_backoff_then_given_up(tmp_path):
+    Session = session_factory(tmp_path)
+    calls = []
+
+    async def flaky_send(to_email, subject, html, text):
+        calls.append(to_email)
+        if to_email == "down@example.com" or len(calls) == 1:
+            raise ConnectionRefusedError("SMTP unavailable")
+
+    async def scenario():
+        outbox = EmailOutboxWorker(Session, flaky_send, email_service.RENDERERS, base_backoff=0.01, max_attempts=3)
+        await outbox.enqueue("report_confirmation", "citizen@example.com", name="Asha", report_id="r-1")
+        await outbox.enqueue("report_confirmation", "down@example.com", name="Ravi", report_id="r-2")
+        for _ in range(20):
+            await outbox.drain_once()
+            await asyncio.sleep(0.02)
+        return outbox
+
+    outbox = asyncio.run(scenario())
+    ok, down = rows(Session)
+    assert (ok.status, ok.attempts, ok.last_error) == ("sent", 2, None)
+    assert (down.status, down.attempts) == ("failed", 3)
+    assert "SMTP unavailable" in down.last_error
+    assert json.loads(down.context) == {"name": "Ravi", "report_id": "r-2"}
+    assert outbox.retries == 3 and outbox.failed == 1
+
+
+def test_permanently_rejected_address_fails_without_retrying(tmp_path):
+    Session = session_factory(tmp_path)
+
+    async def picky_send(to_email, subject, html, text):
+        code = 550 if to_email.startswith("bounce") else 450  # 4xx is temporary (greylisting, full mailbox)
+        raise aiosmtplib.SMTPRecipientsRefused([aiosmtplib.SMTPRecipientRefused(code, "refused", to_email)])
+
+    async def scenario():
+        outbox = EmailOutboxWorker(Session, picky_send, email_service.RENDERERS, base_backoff=0.01, max_attempts=3,
+                                   is_permanent=is_permanent_rejection)
+        await outbox.enqueue("report_confirmation", "bounce@example.com", name="Asha", report_id="r-1")
+        await outbox.enqueue("report_confirmation", "busy@example.com", name="Ravi", report_id="r-2")
+        for _ in range(20):
+            await outbox.drain_once()
+            await asyncio.sleep(0.02)
+        return outbox
+
+    outbox = asyncio.run(scenario())
+    bounced, busy = rows(Session)
+    assert (bounced.status, bounced.attempts) == ("failed", 1)
+    assert bounced.last_error.startswith("SMTPRecipientsRefused")
+    assert (busy.status, busy.attempts) == ("failed", 3)
+    assert outbox.failed == 2 and outbox.retries == 2
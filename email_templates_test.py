@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the precompiled Jinja2 email templates
+Run with: python -m pytest email_templates_test.py
+"""
+
+from backend.utils.email_service import SUBJECTS, build_message
+from backend.utils.email_templates import EmailTemplates
+
+
+def test_html_is_autoescaped_and_text_alternative_is_plain():
+    templates = EmailTemplates(SUBJECTS)
+    templates.precompile()
+    email = templates.render("report_confirmation", name="<script>x</script> & Co", report_id="r-1")
+
+    assert email.subject == "Pollution Report Submitted - Delhi Air Command"
+    assert "Dear &lt;script&gt;x&lt;/script&gt; &amp; Co," in email.html
+    assert "<script>" not in email.html
+    assert email.text.startswith("Dear <script>x</script> & Co,\n")
+    assert "Report ID: r-1" in email.text
+
+    message = build_message("citizen@example.com", *email)
+    assert [part.get_content_type() for part in message.get_payload()] == ["text/plain", "text/html"]
+
+
+def test_bulk_run_renders_layout_once_and_fills_each_recipient():
+    templates = EmailTemplates(SUBJECTS, per_recipient=("name", "report_id"))
+    full = EmailTemplates(SUBJECTS)
+    recipients = [(f"Citizen <{i}> & Co", f"r-{i}") for i in range(50)]
+
+    batch = [templates.render("status_update", name=name, report_id=report_id, new_status="processing",
+                              message="In progress") for name, report_id in recipients]
+
+    # One Jinja render for the whole batch; every email matches a full render of its own context
+    assert templates.renders == 1 and templates.fills == 50
+    for (name, report_id), email in zip(recipients, batch):
+        assert email == full.render("status_update", name=name, report_id=report_id, new_status="processing",
+                                    message="In progress")
+    assert "Dear Citizen &lt;7&gt; &amp; Co," in batch[7].html and "Dear Citizen <7> & Co," in batch[7].text
+    assert batch[0].subject == "Report Status Update: Processing - Delhi Air Command"
+
+    # Shared context is part of the skeleton's key: another status is a second render
+    templates.render("status_update", name="Asha", report_id="r-x", new_status="completed", message="Done")
+    assert templates.renders == 2
+
+
+def test_filtered_per_recipient_field_falls_back_to_full_render():
+    templates = EmailTemplates({"status_update": "{{ name | upper }} - {{ report_id }}"},
+                               per_recipient=("name", "report_id"))
+
+    first = templates.render("status_update", name="asha", report_id="r-1", new_status="viewed", message="m")
+    second = templates.render("status_update", name="ravi", report_id="r-2", new_status="viewed", message="m")
+
+    assert (first.subject, second.subject) == ("ASHA - r-1", "RAVI - r-2")
+    assert templates.fills == 0
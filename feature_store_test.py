@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the ring-buffer feature store against synthetic hourly series
+Run with: python -m pytest feature_store_test.py
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from backend.utils.feature_store import FeatureStore
+from backend.utils.features import FEATURE_NAMES, build_feature_row
+
+START = datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+
+def push_series(store, values, start=START, step=timedelta(hours=1)):
+    for i, value in enumerate(values):
+        store.push(value, {"pm25": value / 2, "pm10": value, "no2": 40.0, "co": 2.0}, start + i * step)
+
+
+def test_lags_and_rolling_means_match_a_full_rescan():
+    rng = np.random.default_rng(7)
+    series = rng.uniform(50, 400, size=500)
+    store = FeatureStore(capacity=72)
+    push_series(store, series)
+
+    features = store.features()
+    assert features["AQI_t-1"] == series[-2]
+    assert features["AQI_t-24"] == series[-25]
+    assert np.isclose(features["rolling_mean_24h"], series[-24:].mean())
+    assert np.isclose(features["rolling_mean_72h"], series[-72:].mean())
+    assert features["pm_ratio"] == 2.0
+    assert features["traffic_ratio"] == 20.0
+    assert len(store) == 72
+
+
+def test_partial_history_uses_what_is_available():
+    store = FeatureStore()
+    push_series(store, [100.0, 200.0, 300.0])
+
+    features = store.features()
+    assert features["AQI_t-1"] == 200.0
+    assert "AQI_t-6" not in features
+    assert features["rolling_mean_24h"] == 200.0
+
+    row = build_feature_row({"pm25": 150}, 300.0, START, memory=features)
+    assert row[FEATURE_NAMES.index("AQI_t-6")] == 300.0  # proxy: current AQI
+    assert row[FEATURE_NAMES.index("AQI_t-1")] == 200.0
+
+
+def test_same_hour_overwrites_and_gaps_carry_forward():
+    store = FeatureStore()
+    store.push(100.0, {}, START)
+    store.push(120.0, {}, START + timedelta(minutes=30))
+    assert len(store) == 1
+    assert store.rolling_mean(24) == 120.0
+
+    store.push(180.0, {}, START + timedelta(hours=3))
+    assert len(store) == 4
+    assert [store.lag(i) for i in range(4)] == [180.0, 120.0, 120.0, 120.0]
+    assert np.isclose(store.rolling_mean(24), (180.0 + 3 * 120.0) / 4)
+
+    store.push(999.0, {}, START)
+    assert store.ignored == 1
+    assert store.lag(0) == 180.0
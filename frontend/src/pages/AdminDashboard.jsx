@@ -34,9 +34,14 @@ const POLICY_OPTIONS = [
   { id: 'stubble_control', name: 'Stubble Burning Control', description: 'Incentivize farmers to avoid stubble burning' }
 ];
 
+const adminConfig = () => ({
+  headers: { Authorization: `Bearer ${localStorage.getItem('admin_token')}` }
+});
+
 export default function AdminDashboard() {
   const navigate = useNavigate();
   const [reports, setReports] = useState([]);
+  const [counts, setCounts] = useState({ total: 0, by_status: {} });
   const [aqiData, setAqiData] = useState(null);
   const [sources, setSources] = useState(null);
   const [forecast, setForecast] = useState(null);
@@ -54,19 +59,40 @@ export default function AdminDashboard() {
     fetchData();
   }, [navigate]);
 
+  // An expired or missing admin token sends the user back to the login page
+  const redirectIfUnauthorized = (error) => {
+    if (error.response?.status !== 401) return false;
+    localStorage.removeItem('admin_token');
+    navigate('/admin/login');
+    return true;
+  };
+
+  // The forecast is 503 while the model warms up; that must not keep reports and AQI off the page
+  const fetchForecast = async () => {
+    try {
+      const response = await axios.get(`${API}/aqi/forecast`);
+      setForecast(response.data);
+    } catch (error) {
+      console.warn('Forecast unavailable:', error);
+      setForecast(null);
+    }
+  };
+
   const fetchData = async () => {
+    fetchForecast();
     try {
-      const [reportsRes, aqiRes, sourcesRes, forecastRes] = await Promise.all([
-        axios.get(`${API}/reports`),
+      const [reportsRes, countsRes, aqiRes, sourcesRes] = await Promise.all([
+        axios.get(`${API}/reports`, adminConfig()),
+        axios.get(`${API}/reports/counts`, adminConfig()),
         axios.get(`${API}/aqi/current`),
-        axios.get(`${API}/aqi/sources`),
-        axios.get(`${API}/aqi/forecast`)
+        axios.get(`${API}/aqi/sources`)
       ]);
-      setReports(reportsRes.data);
+      setReports(reportsRes.data.reports);
+      setCounts(countsRes.data);
       setAqiData(aqiRes.data);
       setSources(sourcesRes.data);
-      setForecast(forecastRes.data);
     } catch (error) {
+      if (redirectIfUnauthorized(error)) return;
       console.error('Error fetching data:', error);
       toast.error('Failed to fetch dashboard data');
     } finally {
@@ -76,10 +102,11 @@ export default function AdminDashboard() {
 
   const updateReportStatus = async (reportId, newStatus) => {
     try {
-      await axios.patch(`${API}/reports/${reportId}/status`, { status: newStatus });
+      await axios.patch(`${API}/reports/${reportId}/status`, { status: newStatus }, adminConfig());
       toast.success(`Report status updated to ${newStatus}`);
       fetchData();
     } catch (error) {
+      if (redirectIfUnauthorized(error)) return;
       console.error('Error updating status:', error);
       toast.error('Failed to update status');
     }
@@ -106,9 +133,10 @@ export default function AdminDashboard() {
     );
   }
 
-  const pendingReports = reports.filter(r => r.status === 'pending').length;
-  const processingReports = reports.filter(r => r.status === 'processing').length;
-  const completedReports = reports.filter(r => r.status === 'completed').length;
+  // The list shows one page of reports; the counters cover all of them
+  const pendingReports = counts.by_status.pending || 0;
+  const processingReports = counts.by_status.processing || 0;
+  const completedReports = counts.by_status.completed || 0;
 
   return (
     <div className="min-h-screen bg-slate-50" data-testid="admin-dashboard-page">
@@ -155,7 +183,7 @@ export default function AdminDashboard() {
               <span className="text-sm text-slate-500">Total Reports</span>
               <FileText className="h-5 w-5 text-slate-500" />
             </div>
-            <div className="text-3xl font-bold font-['Manrope'] text-slate-900" data-testid="total-count">{reports.length}</div>
+            <div className="text-3xl font-bold font-['Manrope'] text-slate-900" data-testid="total-count">{counts.total}</div>
           </div>
         </div>
 
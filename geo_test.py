@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for report geo helpers and the SQLite R*Tree spatial index
+Run with: python -m pytest geo_test.py
+"""
+
+import math
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, PollutionReportDB, init_spatial_index, report_rtree
+from backend.utils.geo import bbox_polygon, cell_degrees, covers_hemisphere, geojson_point, viewport_cell_degrees
+
+
+def report(report_id, latitude, longitude):
+    return PollutionReportDB(report_id=report_id, name="Asha", mobile="1", email="a@example.com", location="ITO",
+                             latitude=latitude, longitude=longitude, severity=3)
+
+
+def test_geojson_points_and_grid():
+    assert geojson_point(28.6, 77.2) == {"type": "Point", "coordinates": [77.2, 28.6]}
+    assert geojson_point(None, 77.2) is None and geojson_point(95.0, 77.2) is None
+    assert cell_degrees(0) == 90.0 and cell_degrees(11) == cell_degrees(10) / 2
+    assert covers_hemisphere((-180, -85, 180, 85)) and not covers_hemisphere((76.8, 28.3, 77.5, 29.0))
+    # Zoom 22 over the whole city is coarsened onto a lower zoom's grid, at most 64 cells across
+    city = (76.8, 28.3, 77.5, 29.0)
+    assert viewport_cell_degrees(city, 11, 64) == cell_degrees(11)
+    coarse = viewport_cell_degrees(city, 22, 64)
+    assert 0.7 / coarse <= 64 < 0.7 / (coarse / 2) and coarse in [cell_degrees(zoom) for zoom in range(23)]
+
+
+def geodesic_latitudes(a, b, steps=200):
+    """Latitudes along the great circle from a to b, each (lon, lat) in degrees"""
+    def unit(lon, lat):
+        lon, lat = math.radians(lon), math.radians(lat)
+        return np.array([math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)])
+    u, v = unit(*a), unit(*b)
+    points = [(1 - t) * u + t * v for t in np.linspace(0, 1, steps)]
+    return [math.degrees(math.asin(p[2] / np.linalg.norm(p))) for p in points]
+
+
+@pytest.mark.parametrize("bbox", [(76.8, 28.3, 77.5, 29.0), (-10.0, 50.0, 30.0, 70.0), (100.0, -45.0, 150.0, -10.0),
+                                  (-20.0, -5.0, 20.0, 5.0)])
+def test_bbox_polygon_geodesic_edges_contain_the_box(bbox):
+    min_lon, min_lat, max_lon, max_lat = bbox
+    ring = bbox_polygon(bbox)["coordinates"][0]
+    (_, south), (_, north) = ring[0], ring[2]
+    # The southern edge, traced as a geodesic, never rises above the box; the northern never dips below it
+    assert max(geodesic_latitudes(ring[0], ring[1])) <= min_lat
+    assert min(geodesic_latitudes(ring[2], ring[3])) >= max_lat
+    assert south < min_lat and north > max_lat
+
+
+def test_rtree_follows_inserts_updates_and_deletes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'geo.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        session.add_all([report("r-1", 28.6, 77.2), report("r-2", None, None)])
+        session.commit()
+    # Backfills rows stored before the index existed, then triggers keep it in sync
+    assert init_spatial_index(engine)
+
+    def indexed(session):
+        return session.execute(select(report_rtree.c.id, report_rtree.c.min_lat)).all()
+
+    with Session() as session:
+        assert [lat for _, lat in indexed(session)] == [pytest.approx(28.6)]  # stored as float32
+        session.add(report("r-3", 28.7, 77.1))
+        session.commit()
+        assert len(indexed(session)) == 2
+        moved = session.scalar(select(PollutionReportDB).where(PollutionReportDB.report_id == "r-1"))
+        moved.latitude = None
+        session.commit()
+        gone = session.scalar(select(PollutionReportDB).where(PollutionReportDB.report_id == "r-3"))
+        session.delete(gone)
+        session.commit()
+        assert indexed(session) == []
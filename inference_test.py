@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the micro-batching inference wrapper
+Run with: python -m pytest inference_test.py
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+
+from backend.utils.inference import BatchingPredictor
+
+
+def doubling(batches):
+    def predict_fn(X):
+        batches.append(len(X))
+        return X[:, 0] * 2, "v1"
+    return predict_fn
+
+
+def test_concurrent_requests_share_batches_up_to_the_cap():
+    batches = []
+
+    async def scenario():
+        predictor = BatchingPredictor(doubling(batches), max_batch_size=4, max_wait_ms=50)
+        results = await asyncio.gather(*(predictor.predict([float(i)]) for i in range(10)))
+        stats = predictor.stats()
+        await predictor.stop()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+
+    assert [pred for pred, _ in results] == [i * 2 for i in range(10)]
+    assert all(meta == "v1" for _, meta in results)
+    assert batches == [4, 4, 2]
+    assert stats["requests"] == 10 and stats["batches"] == 3 and stats["errors"] == 0
+
+
+def test_lone_request_is_flushed_after_max_wait():
+    batches = []
+
+    async def scenario():
+        predictor = BatchingPredictor(doubling(batches), max_batch_size=64, max_wait_ms=20)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        pred, _ = await asyncio.wait_for(predictor.predict([3.0]), timeout=2)
+        elapsed = loop.time() - started
+        await predictor.stop()
+        return pred, elapsed
+
+    pred, elapsed = asyncio.run(scenario())
+
+    assert pred == 6.0 and batches == [1]
+    assert 0.015 <= elapsed < 1
+
+
+def test_failed_batch_fails_every_caller():
+    def predict_fn(X):
+        raise ValueError("model exploded")
+
+    async def scenario():
+        predictor = BatchingPredictor(predict_fn, max_wait_ms=20)
+        results = await asyncio.gather(*(predictor.predict([1.0]) for _ in range(3)), return_exceptions=True)
+        stats = predictor.stats()
+        await predictor.stop()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert stats["errors"] == 1
+
+
+def test_stop_fails_queued_and_in_flight_requests_then_restarts():
+    entered, release = threading.Event(), threading.Event()
+
+    def blocking(X):
+        entered.set()
+        release.wait(5)
+        return X[:, 0], "v1"
+
+    async def scenario():
+        predictor = BatchingPredictor(blocking, max_batch_size=2, max_wait_ms=1)
+        calls = [asyncio.ensure_future(predictor.predict([float(i)])) for i in range(5)]
+        await asyncio.to_thread(entered.wait, 5)  # first batch is in the worker, the rest still queued
+        await predictor.stop()
+        results = await asyncio.wait_for(asyncio.gather(*calls, return_exceptions=True), timeout=2)
+        release.set()
+        # A stopped predictor starts again on demand, with a fresh executor
+        restarted = await asyncio.wait_for(predictor.predict([7.0]), timeout=2)
+        batched = await predictor.predict_batch([[1.0], [2.0]])
+        await predictor.stop()
+        return results, restarted, batched
+
+    results, restarted, batched = asyncio.run(scenario())
+
+    assert all(isinstance(r, RuntimeError) and "stopped" in str(r) for r in results)
+    assert restarted == (7.0, "v1")
+    np.testing.assert_array_equal(batched[0], [1.0, 2.0])
+
+
+def test_cancelled_caller_is_dropped_from_the_batch():
+    batches = []
+
+    async def scenario():
+        predictor = BatchingPredictor(doubling(batches), max_wait_ms=30)
+        cancelled = asyncio.ensure_future(predictor.predict([1.0]))
+        kept = asyncio.ensure_future(predictor.predict([2.0]))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        pred, _ = await kept
+        await predictor.stop()
+        return pred
+
+    assert asyncio.run(scenario()) == 4.0
+    assert batches == [1]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind prediction log sink against an in-memory SQLite database
+Run with: python -m pytest log_sink_test.py
+"""
+
+import asyncio
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base, AQIPredictionLog, SourceAttributionLog
+from backend.utils.log_sink import LogSink, DROP_OLDEST
+
+
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def count(Session, model):
+    with Session() as session:
+        return session.scalar(select(func.count()).select_from(model))
+
+
+def prediction(aqi):
+    return dict(current_aqi=aqi, aqi_24h=aqi, aqi_48h=aqi, aqi_72h=aqi, model_version="v1.0")
+
+
+def test_batches_by_size_and_flushes_on_stop():
+    Session = session_factory()
+
+    async def scenario():
+        sink = LogSink(Session, batch_size=10, flush_interval_ms=60_000)
+        sink.start()
+        for i in range(25):
+            sink.enqueue(AQIPredictionLog, **prediction(100.0 + i))
+        sink.enqueue(SourceAttributionLog, traffic=40, industry=25, construction=20, stubble_burning=10, other=5)
+        await asyncio.sleep(0.2)
+        written_before_stop = sink.written
+        await sink.stop()
+        return sink, written_before_stop
+
+    sink, written_before_stop = asyncio.run(scenario())
+    assert written_before_stop == 20  # two full batches; the rest waits for the interval
+    assert sink.written == 26 and sink.dropped == 0
+    assert count(Session, AQIPredictionLog) == 25
+    assert count(Session, SourceAttributionLog) == 1
+
+
+def test_full_queue_applies_drop_policy():
+    Session = session_factory()
+
+    async def scenario(policy):
+        sink = LogSink(Session, batch_size=100, flush_interval_ms=60_000, max_queue=5, **policy)
+        sink.start()
+        accepted = [sink.enqueue(AQIPredictionLog, **prediction(float(i))) for i in range(10)]
+        await sink.stop()
+        return sink, accepted
+
+    sink, accepted = asyncio.run(scenario({}))
+    assert accepted == [True] * 5 + [False] * 5
+    assert sink.dropped == 5 and sink.written == 5
+
+    sink, accepted = asyncio.run(scenario({"drop_policy": DROP_OLDEST}))
+    assert all(accepted) and sink.dropped == 5
+    with Session() as session:
+        kept = session.scalars(select(AQIPredictionLog.current_aqi).order_by(AQIPredictionLog.id)).all()
+    assert kept[-5:] == [5.0, 6.0, 7.0, 8.0, 9.0]
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming, resumable, checksummed model artifact fetcher against a local HTTP stub
+Run with: python -m pytest model_artifact_test.py
+"""
+
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.utils.artifacts import ArtifactChecksumError, fetch_artifact
+
+PAYLOAD = os.urandom(300_000)
+PAYLOAD_SHA256 = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+class StubArtifactServer:
+    """Serves `payload` with an ETag and Range/If-Range support; can drop the connection partway through once"""
+
+    def __init__(self, support_range=True, drop_after=None, payload=PAYLOAD, range_from_zero=False):
+        self.support_range = support_range
+        self.range_from_zero = range_from_zero  # answers any range with the whole body as a 206
+        self.drop_after = drop_after
+        self.payload = payload
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                payload = stub.payload
+                etag = f'"{hashlib.sha256(payload).hexdigest()[:16]}"'
+                range_header = self.headers.get("Range")
+                stub.requests.append(range_header)
+                if_range = self.headers.get("If-Range")
+                start = 0
+                if range_header and stub.support_range and if_range in (None, etag):
+                    start = 0 if stub.range_from_zero else int(range_header.split("=")[1].split("-")[0])
+                    if start >= len(payload):
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{len(payload)}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+                else:
+                    self.send_response(200)
+                body = payload[start:]
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if stub.drop_after is not None:
+                    cut, stub.drop_after = stub.drop_after, None
+                    self.wfile.write(body[:cut])
+                    self.wfile.flush()
+                    self.connection.shutdown(2)
+                    return
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/artifact_wrapper.pkl"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_streams_and_verifies_into_cache(tmp_path):
+    with StubArtifactServer() as stub:
+        path = fetch_artifact(stub.url, tmp_path, sha256=PAYLOAD_SHA256, chunk_size=4096)
+        assert path == tmp_path / "artifact_wrapper.pkl"
+        assert path.read_bytes() == PAYLOAD
+        assert not (tmp_path / "artifact_wrapper.pkl.part").exists()
+
+        # Second call is served from the cache without touching the network
+        fetch_artifact(stub.url, tmp_path, sha256=PAYLOAD_SHA256)
+        assert len(stub.requests) == 1
+
+
+def test_resumes_interrupted_download_with_range(tmp_path):
+    with StubArtifactServer(drop_after=100_000) as stub:
+        path = fetch_artifact(stub.url, tmp_path, sha256=PAYLOAD_SHA256, chunk_size=4096)
+        assert path.read_bytes() == PAYLOAD
+        assert stub.requests[0] is None
+        assert stub.requests[1].startswith("bytes=") and stub.requests[1] != "bytes=0-"
+
+
+def etag(payload):
+    return f'"{hashlib.sha256(payload).hexdigest()[:16]}"'
+
+
+def leave_partial(tmp_path, data, validator, size):
+    """What a crashed earlier run leaves behind: the bytes so far and the response they came from"""
+    (tmp_path / "artifact_wrapper.pkl.part").write_bytes(data)
+    (tmp_path / "artifact_wrapper.pkl.part.resume").write_text(json.dumps({"validator": validator, "size": size}))
+
+
+def test_resumes_partial_file_left_by_previous_crash(tmp_path):
+    leave_partial(tmp_path, PAYLOAD[:123_456], etag(PAYLOAD), len(PAYLOAD))
+    with StubArtifactServer() as stub:
+        path = fetch_artifact(stub.url, tmp_path, sha256=PAYLOAD_SHA256)
+        assert path.read_bytes() == PAYLOAD
+        assert stub.requests == ["bytes=123456-"]
+    assert not (tmp_path / "artifact_wrapper.pkl.part.resume").exists()
+
+
+def test_changed_artifact_is_not_spliced_onto_the_old_partial(tmp_path):
+    old = os.urandom(300_000)
+    leave_partial(tmp_path, old[:123_456], etag(old), len(old))
+    with StubArtifactServer() as stub:
+        # No checksum: nothing else would catch a spliced file
+        path = fetch_artifact(stub.url, tmp_path)
+        assert path.read_bytes() == PAYLOAD
+
+
+def test_partial_without_validator_restarts(tmp_path):
+    (tmp_path / "artifact_wrapper.pkl.part").write_bytes(os.urandom(1000))
+    with StubArtifactServer() as stub:
+        assert fetch_artifact(stub.url, tmp_path).read_bytes() == PAYLOAD
+        assert stub.requests == [None]
+
+
+def test_oversized_partial_is_discarded_on_416(tmp_path):
+    # Same ETag, but the partial file is longer than the remote one: it can't be the artifact
+    leave_partial(tmp_path, PAYLOAD + b"trailing garbage", etag(PAYLOAD), None)
+    with StubArtifactServer() as stub:
+        assert fetch_artifact(stub.url, tmp_path).read_bytes() == PAYLOAD
+        assert stub.requests == [f"bytes={len(PAYLOAD) + 16}-", None]
+
+
+def test_complete_partial_is_accepted_on_416(tmp_path):
+    leave_partial(tmp_path, PAYLOAD, etag(PAYLOAD), len(PAYLOAD))
+    with StubArtifactServer() as stub:
+        assert fetch_artifact(stub.url, tmp_path, sha256=PAYLOAD_SHA256).read_bytes() == PAYLOAD
+        assert stub.requests == [f"bytes={len(PAYLOAD)}-"]
+
+
+def test_range_response_from_the_wrong_offset_restarts(tmp_path):
+    leave_partial(tmp_path, PAYLOAD[:50_000], etag(PAYLOAD), len(PAYLOAD))
+    with StubArtifactServer(range_from_zero=True) as stub:
+        assert fetch_artifact(stub.url, tmp_path).read_bytes() == PAYLOAD
+        assert stub.requests == ["bytes=50000-", None]
+
+
+def test_restarts_when_server_ignores_range(tmp_path):
+    leave_partial(tmp_path, PAYLOAD[:50_000], etag(PAYLOAD), len(PAYLOAD))
+    with StubArtifactServer(support_range=False) as stub:
+        path = fetch_artifact(stub.url, tmp_path, sha256=PAYLOAD_SHA256)
+        assert path.read_bytes() == PAYLOAD
+
+
+def test_checksum_mismatch_never_lands_in_cache(tmp_path):
+    with StubArtifactServer() as stub:
+        with pytest.raises(ArtifactChecksumError):
+            fetch_artifact(stub.url, tmp_path, sha256="0" * 64)
+    assert not (tmp_path / "artifact_wrapper.pkl").exists()
+    assert not (tmp_path / "artifact_wrapper.pkl.part").exists()
+
+
+def test_corrupt_cached_file_is_refetched(tmp_path):
+    (tmp_path / "artifact_wrapper.pkl").write_bytes(b"truncated")
+    with StubArtifactServer() as stub:
+        path = fetch_artifact(stub.url, tmp_path, sha256=PAYLOAD_SHA256)
+        assert path.read_bytes() == PAYLOAD
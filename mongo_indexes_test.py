@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for pollution_reports index reconciliation and hot-query plans
+Run with: python -m pytest mongo_indexes_test.py
+The reconcile/explain tests need a local mongod (MONGO_TEST_URL, default mongodb://localhost:27017)
+and are skipped without one.
+"""
+
+import asyncio
+import os
+import uuid
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, IndexModel
+
+from backend.utils.mongo_indexes import (
+    IndexManager, REPORT_BACKFILLS, REPORT_HOT_QUERIES, REPORT_INDEXES, summarize_plan,
+)
+
+MONGO_TEST_URL = os.environ.get("MONGO_TEST_URL", "mongodb://localhost:27017/?serverSelectionTimeoutMS=500")
+
+
+def with_collection(scenario):
+    """Run `scenario(collection)` against a throwaway collection, skipping when no mongod is reachable"""
+    async def run():
+        client = AsyncIOMotorClient(MONGO_TEST_URL)
+        try:
+            await client.admin.command("ping")
+        except Exception:
+            client.close()
+            pytest.skip("no local mongod")
+        db = client[f"index_test_{uuid.uuid4().hex[:8]}"]
+        try:
+            return await scenario(db.pollution_reports)
+        finally:
+            await client.drop_database(db.name)
+            client.close()
+
+    return asyncio.run(run())
+
+
+def test_summarize_plan_flags_collection_scans_and_sorts():
+    explain = {
+        "queryPlanner": {"winningPlan": {
+            "stage": "SORT",
+            "inputStage": {"stage": "COLLSCAN"},
+        }},
+        "executionStats": {"nReturned": 3, "totalKeysExamined": 0, "totalDocsExamined": 1000, "executionTimeMillis": 4},
+    }
+    plan = summarize_plan(explain)
+    assert plan["stages"] == ["SORT", "COLLSCAN"]
+    assert plan["collection_scan"] and plan["in_memory_sort"] and plan["indexes"] == []
+    assert plan["docs_examined"] == 1000
+
+    sbe = {"queryPlanner": {"winningPlan": {"queryPlan": {
+        "stage": "LIMIT",
+        "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "status_created_at"}},
+    }}}}
+    plan = summarize_plan(sbe)
+    assert plan["indexes"] == ["status_created_at"] and not plan["collection_scan"]
+
+
+def test_reconcile_creates_then_keeps_then_rebuilds():
+    async def scenario(collection):
+        await collection.insert_one({"id": "r-1", "status": "pending", "severity": 5, "created_at": "2024-01-01",
+                                     "latitude": 28.6, "longitude": 77.2})
+        await collection.create_index([("legacy", ASCENDING)], name="legacy")
+        manager = IndexManager(collection, REPORT_INDEXES, backfills=REPORT_BACKFILLS)
+        first = await manager.reconcile()
+        second = await manager.reconcile()
+        drifted = IndexManager(collection, [IndexModel([("id", ASCENDING)], name="id_unique")] + REPORT_INDEXES[1:])
+        third = await drifted.reconcile()
+        report = await collection.find_one({"id": "r-1"})
+        return first, second, third, await collection.index_information(), report, manager.backfilled
+
+    first, second, third, info, report, backfilled = with_collection(scenario)
+    assert report["geo"] == {"type": "Point", "coordinates": [77.2, 28.6]} and backfilled == {"geo": 1}
+    assert first == {"id_unique": "created", "created_at_id": "created", "status_created_at": "created",
+                     "severity_created_at": "created", "geo_2dsphere": "created", "legacy": "unmanaged"}
+    assert set(second.values()) == {"unchanged", "unmanaged"}
+    assert third["id_unique"] == "rebuilt" and not info["id_unique"].get("unique")
+
+
+def test_hot_queries_use_indexes():
+    async def scenario(collection):
+        await collection.insert_many([
+            {"id": str(uuid.uuid4()), "status": ["pending", "completed"][i % 2], "severity": i % 5 + 1,
+             "created_at": f"2024-01-{i % 28 + 1:02d}"}
+            for i in range(500)
+        ])
+        manager = IndexManager(collection, REPORT_INDEXES, REPORT_HOT_QUERIES)
+        await manager.reconcile()
+        return await manager.explain(), await manager.build_progress()
+
+    plans, builds = with_collection(scenario)
+    assert builds == []
+    for name, plan in plans.items():
+        assert not plan["collection_scan"], f"{name} scans the collection: {plan}"
+        assert not plan["in_memory_sort"], f"{name} sorts in memory: {plan}"
+        assert plan["indexes"], name
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for request deadlines and the circuit breaker
+Run with: python -m pytest resilience_test.py
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.utils.resilience import (CircuitBreaker, CircuitOpenError, DeadlineExceeded, breaker_stats, deadline,
+                                      remaining_budget)
+
+
+async def ok():
+    return "ok"
+
+
+async def broken():
+    raise ConnectionError("upstream down")
+
+
+async def slow(seconds=1.0):
+    await asyncio.sleep(seconds)
+    return "late"
+
+
+def test_nested_deadline_only_shrinks_the_budget():
+    assert remaining_budget() is None
+    with deadline(0.5):
+        with deadline(5):
+            assert remaining_budget() <= 0.5
+        with deadline(0.1):
+            assert remaining_budget() <= 0.1
+        assert 0.1 < remaining_budget() <= 0.5
+    assert remaining_budget() is None
+
+
+def test_breaker_opens_after_threshold_and_rejects():
+    breaker = CircuitBreaker("test-open", failure_threshold=3, reset_timeout=60)
+
+    async def scenario():
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                await breaker.call(broken)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(ok)
+        return await breaker.call(ok, fallback="cached")
+
+    assert asyncio.run(scenario()) == "cached"
+    stats = breaker.stats()
+    assert stats["state"] == "open" and stats["trips"] == 1
+    assert stats["calls"] == 3 and stats["rejections"] == 2
+    assert breaker_stats()["test-open"] == stats
+
+
+def test_half_open_trial_closes_or_reopens():
+    breaker = CircuitBreaker("test-half-open", failure_threshold=1, reset_timeout=0.01)
+
+    async def scenario():
+        await breaker.call(broken, fallback=None)
+        await asyncio.sleep(0.02)
+        await breaker.call(broken, fallback=None)  # trial fails: straight back to open
+        reopened = breaker.state
+        await asyncio.sleep(0.02)
+        result = await breaker.call(ok)
+        return reopened, result
+
+    reopened, result = asyncio.run(scenario())
+
+    assert reopened == "open"
+    assert result == "ok" and breaker.state == "closed" and breaker.stats()["trips"] == 2
+
+
+def test_call_timeout_counts_as_failure():
+    breaker = CircuitBreaker("test-timeout", failure_threshold=1, call_timeout=0.02)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(breaker.call(slow))
+    assert breaker.state == "open" and breaker.stats()["timeouts"] == 1
+
+
+def test_exhausted_budget_is_not_held_against_the_upstream():
+    breaker = CircuitBreaker("test-budget", failure_threshold=1, call_timeout=5)
+
+    async def scenario():
+        with deadline(0.02):
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceeded):
+                await breaker.call(slow)
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(0.03)
+            skipped = await breaker.call(ok, fallback="fallback")  # no budget left: not even attempted
+        return elapsed, skipped
+
+    elapsed, skipped = asyncio.run(scenario())
+
+    assert elapsed < 1 and skipped == "fallback"
+    stats = breaker.stats()
+    assert stats["state"] == "closed" and stats["failures"] == 0
+    assert stats["budget_exhausted"] == 2 and stats["calls"] == 1
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the SMTP connection pool against a local aiosmtpd SMTP server
+Run with: python -m pytest smtp_pool_test.py
+"""
+
+import asyncio
+import socket
+from email.mime.text import MIMEText
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Message
+
+from backend.utils.resilience import CircuitBreaker
+from backend.utils.smtp_pool import REJECTION_ERRORS, SMTPPool, is_permanent_rejection
+
+
+class Inbox(Message):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.sessions = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    def handle_message(self, message):
+        self.messages.append(message)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def message(i):
+    msg = MIMEText(f"Report r-{i} received", "html")
+    msg["From"], msg["To"], msg["Subject"] = "alerts@delhiair.test", f"citizen{i}@example.com", f"Report r-{i}"
+    return msg
+
+
+def test_sessions_are_reused_and_concurrency_is_capped():
+    inbox = Inbox()
+    controller = Controller(inbox, hostname="127.0.0.1", port=free_port())
+    controller.start()
+
+    async def scenario():
+        pool = SMTPPool("127.0.0.1", controller.port, start_tls=False, size=3, max_messages_per_connection=10)
+        await asyncio.gather(*(pool.send(message(i)) for i in range(30)))
+        stats = pool.stats()
+        await pool.close()
+        return stats
+
+    try:
+        stats = asyncio.run(scenario())
+    finally:
+        controller.stop()
+
+    assert len(inbox.messages) == 30 and stats["sent"] == 30
+    assert stats["connects"] == inbox.sessions <= 6  # never more than 3 open; each recycled at most once
+    assert stats["idle_connections"] <= 3 and stats["errors"] == 0
+
+
+def test_reconnects_after_server_restart():
+    port = free_port()
+    inbox = Inbox()
+    controller = Controller(inbox, hostname="127.0.0.1", port=port)
+    controller.start()
+
+    async def scenario():
+        nonlocal controller
+        pool = SMTPPool("127.0.0.1", port, start_tls=False, size=1)
+        await pool.send(message(1))
+        # Server drops every session; the pooled one is now dead but still looks idle
+        await asyncio.to_thread(controller.stop)
+        controller = Controller(inbox, hostname="127.0.0.1", port=port)
+        await asyncio.to_thread(controller.start)
+        await pool.send(message(2))
+        stats = pool.stats()
+        await pool.close()
+        return stats
+
+    try:
+        stats = asyncio.run(scenario())
+    finally:
+        controller.stop()
+
+    assert [m["Subject"] for m in inbox.messages] == ["Report r-1", "Report r-2"]
+    assert stats["sent"] == 2 and stats["connects"] == 2
+
+
+class RejectingInbox(Inbox):
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bounce"):
+            return "550 5.1.1 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+
+def test_rejected_recipients_keep_the_session_and_the_circuit_closed():
+    inbox = RejectingInbox()
+    controller = Controller(inbox, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    breaker = CircuitBreaker("test-smtp-rejections", failure_threshold=1, ignored_errors=REJECTION_ERRORS)
+
+    def bounce(i):
+        msg = message(i)
+        msg.replace_header("To", f"bounce{i}@example.com")
+        return msg
+
+    async def scenario():
+        pool = SMTPPool("127.0.0.1", controller.port, start_tls=False, size=1, breaker=breaker)
+        errors = []
+        for i in range(3):
+            try:
+                await pool.send(bounce(i))
+            except Exception as e:
+                errors.append(e)
+        await pool.send(message(3))
+        stats = pool.stats()
+        await pool.close()
+        return errors, stats
+
+    try:
+        errors, stats = asyncio.run(scenario())
+    finally:
+        controller.stop()
+
+    assert len(errors) == 3 and all(is_permanent_rejection(e) for e in errors)
+    assert [m["Subject"] for m in inbox.messages] == ["Report r-3"]
+    assert breaker.state == "closed" and breaker.stats()["failures"] == 0
+    assert stats["connects"] == 1 and stats["rejected"] == 3 and stats["errors"] == 0
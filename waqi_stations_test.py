@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-station WAQI fetcher against a local stub of the WAQI API
+Run with: python -m pytest waqi_stations_test.py
+"""
+
+import asyncio
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from backend.utils.waqi_stations import WAQIStationFetcher, aqi_categories
+
+BOUNDS_STATIONS = [
+    {"uid": 1, "lat": 28.63, "lon": 77.22, "aqi": "180", "station": {"name": "ITO"}},
+    {"uid": 2, "lat": 28.70, "lon": 77.10, "aqi": "210", "station": {"name": "Rohini"}},
+    {"uid": 3, "lat": 28.53, "lon": 77.39, "aqi": "95", "station": {"name": "Noida"}},
+    {"uid": 4, "lat": 28.45, "lon": 77.02, "aqi": "-", "station": {"name": "Gurugram"}},
+]
+
+
+def feed(uid, lat, lng, aqi, **iaqi):
+    return {
+        "status": "ok",
+        "data": {
+            "aqi": aqi,
+            "city": {"geo": [lat, lng], "name": f"station-{uid}"},
+            "iaqi": {k: {"v": v} for k, v in iaqi.items()},
+        },
+    }
+
+
+class StubWAQI:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.requests = []
+
+    async def bounds(self, request):
+        self.requests.append(request.path)
+        return web.json_response({"status": "ok", "data": BOUNDS_STATIONS})
+
+    async def station(self, request):
+        uid = int(request.match_info["uid"])
+        self.requests.append(request.path)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.05)
+            if uid == 1:
+                return web.json_response(feed(1, 28.63, 77.22, 182, pm25=120, pm10=210, no2=40, co=1.2))
+            if uid == 2:
+                await asyncio.sleep(1)  # exceeds the per-station timeout
+            if uid == 3:
+                return web.json_response({"status": "error", "data": "Unknown station"}, status=500)
+            if uid == 4:
+                return web.json_response(feed(4, 28.45, 77.02, 140, pm25=60))
+            return web.json_response(feed(uid, 28.6, 77.2, 100 + uid, pm25=50 + uid))
+        finally:
+            self.active -= 1
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get("/map/bounds", self.bounds)
+        app.router.add_get("/feed/@{uid}/", self.station)
+        return app
+
+
+async def run_fetch(**fetcher_kwargs):
+    stub = StubWAQI()
+    runner = web.AppRunner(stub.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    session = aiohttp.ClientSession()
+    try:
+        fetcher = WAQIStationFetcher(
+            lambda: session, "test-token", base_url=f"http://127.0.0.1:{port}", **fetcher_kwargs
+        )
+        table = await fetcher.fetch()
+    finally:
+        await session.close()
+        await runner.cleanup()
+    return stub, table
+
+
+def test_bounds_discovery_tolerates_partial_failures():
+    stub, table = asyncio.run(run_fetch(station_timeout=0.5))
+
+    # 2 timed out and 3 errored: both keep their bounds listing; 4 recovers its AQI from the feed
+    assert sorted(table.uids.tolist()) == [1, 2, 3, 4]
+    assert table.failed == 2
+    by_uid = dict(zip(table.uids.tolist(), range(len(table))))
+    assert table.aqi[by_uid[1]] == 182
+    assert table.aqi[by_uid[2]] == 210
+    assert table.aqi[by_uid[4]] == 140
+    assert table.pollutants["pm25"][by_uid[1]] == 120
+    assert np.isnan(table.pollutants["pm25"][by_uid[3]])
+    assert np.isnan(table.pollutants["so2"]).all()
+
+
+def test_configured_stations_respect_concurrency_limit():
+    stub, table = asyncio.run(run_fetch(station_ids=list(range(10, 30)), concurrency=3))
+
+    assert len(table) == 20
+    assert stub.max_active <= 3
+    assert "/map/bounds" not in stub.requests
+    assert table.lat.dtype == np.float64 and table.aqi.shape == (20,)
+
+
+def test_aqi_categories_vectorized():
+    labels = aqi_categories(np.array([10.0, 75.0, 120.0, 160.0, 250.0, 400.0]))
+    assert labels.tolist() == [
+        "Good", "Moderate", "Unhealthy for Sensitive Groups", "Unhealthy", "Very Unhealthy", "Hazardous"
+    ]